@@ -0,0 +1,90 @@
+"""
+Response compression.
+Compresses large JSON and text responses with the best content coding the
+client accepts: br (only when the brotli package is installed) or gzip.
+Compressed output is deterministic, so a strong ETag stays valid for it:
+the coding is appended to the ETag of the uncompressed body
+("<etag>-gzip"), giving each representation its own validator.
+
+Streamed responses, files sent by the static file handler and bodies below
+COMPRESSION_MIN_SIZE are sent as they are.
+"""
+
+import gzip
+
+from flask import request
+
+from app.backend.calculations.timing import mark
+
+try:
+    import brotli
+except ImportError:  # br is optional; gzip is always available
+    brotli = None
+
+ENCODING_BR = 'br'
+ENCODING_GZIP = 'gzip'
+CONTENT_CODINGS = (ENCODING_BR, ENCODING_GZIP)
+
+COMPRESSIBLE_MIMETYPES = frozenset((
+    'application/json',
+    'application/javascript',
+    'application/x-ndjson',
+    'image/svg+xml',
+))
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Return the ETag of a representation compressed with the given content coding."""
+    return f'{etag}-{encoding}'
+
+
+def negotiate_encoding():
+    """Return the best available content coding accepted by the request, or None."""
+    available = [ENCODING_BR, ENCODING_GZIP] if brotli is not None else [ENCODING_GZIP]
+    return request.accept_encodings.best_match(available)
+
+
+def compress(data: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    """Compress a body with a content coding from CONTENT_CODINGS."""
+    if encoding == ENCODING_BR:
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def _compressible(response, min_size: int) -> bool:
+    if response.status_code != 200 or response.is_streamed or response.direct_passthrough:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    if not (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES):
+        return False
+    return response.calculate_content_length() >= min_size
+
+
+def register_compression(app):
+    """
+    Compress eligible responses of an app according to Accept-Encoding.
+
+    Args:
+        app: Flask application, configured with COMPRESSION_MIN_SIZE,
+            GZIP_LEVEL and BROTLI_QUALITY
+    """
+    @app.after_request
+    def compress_response(response):
+        if not _compressible(response, app.config['COMPRESSION_MIN_SIZE']):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        response.set_data(compress(response.get_data(), encoding,
+                                   app.config['GZIP_LEVEL'], app.config['BROTLI_QUALITY']))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag is not None:
+            response.set_etag(encoded_etag(etag, encoding), weak)
+        mark('compress')
+        return response
@@ -0,0 +1,150 @@
+"""
+Response formats for projection results.
+
+- rows: list of one dictionary per month (the original /calculate format)
+- columns: one JSON array per column, keyed by column name
+- binary: packed little-endian float64 column buffers behind a small header
+- arrow: Apache Arrow IPC stream (only when pyarrow is installed)
+
+Rows and columns can also be streamed as newline-delimited JSON: one row
+object per line, or one {"columns": {...}} chunk per projection year.
+
+Binary layout (all integers little-endian):
+    4 bytes   magic b'REIC'
+    uint16    format version (1)
+    uint16    number of columns
+    uint32    number of rows (months)
+    per column: uint16 name length, then the UTF-8 name
+    zero padding up to a multiple of 8 bytes
+    per column, in header order: number of rows float64 values
+"""
+
+import json
+import struct
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # Arrow output is optional
+    pyarrow = None
+
+FORMAT_ROWS = 'rows'
+FORMAT_COLUMNS = 'columns'
+FORMAT_BINARY = 'binary'
+FORMAT_ARROW = 'arrow'
+RESPONSE_FORMATS = (FORMAT_ROWS, FORMAT_COLUMNS, FORMAT_BINARY, FORMAT_ARROW)
+BINARY_FORMATS = (FORMAT_BINARY, FORMAT_ARROW)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+BINARY_MAGIC = b'REIC'
+BINARY_VERSION = 1
+BINARY_MIMETYPE = 'application/octet-stream'
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+
+def normalize_format(value, default: str = FORMAT_ROWS) -> str:
+    """
+    Normalize a response format option from a request.
+
+    Args:
+        value: One of RESPONSE_FORMATS (any case) or None for the default
+        default: Format used when no format is given (rows unless the
+            endpoint says otherwise)
+
+    Returns:
+        One of RESPONSE_FORMATS
+
+    Raises:
+        ValueError: If the format is unknown, or arrow is requested without pyarrow
+    """
+    if value is None:
+        return default
+    response_format = str(value).strip().lower()
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(RESPONSE_FORMATS)}")
+    if response_format == FORMAT_ARROW and pyarrow is None:
+        raise ValueError('Arrow format is not available on this server; use binary instead')
+    return response_format
+
+
+def pack_columns(columns: dict, names) -> bytes:
+    """
+    Pack single-scenario projection columns into the binary format.
+
+    Args:
+        columns: Output of calculate_projection for scalar inputs
+        names: Column names to include, in order
+
+    Returns:
+        Bytes laid out as described in the module docstring
+    """
+    encoded = [name.encode('utf-8') for name in names]
+    num_rows = len(columns[names[0]]) if names else 0
+    header = [BINARY_MAGIC, struct.pack('<HHI', BINARY_VERSION, len(names), num_rows)]
+    for name in encoded:
+        header.append(struct.pack('<H', len(name)))
+        header.append(name)
+    header = b''.join(header)
+    header += b'\0' * (-len(header) % 8)
+
+    data = np.empty((len(names), num_rows), dtype='<f8')
+    for index, name in enumerate(names):
+        data[index] = np.asarray(columns[name], dtype=np.float64)
+    return header + data.tobytes()
+
+
+def columns_to_arrow(columns: dict, names) -> bytes:
+    """
+    Serialize single-scenario projection columns as an Arrow IPC stream.
+
+    Args:
+        columns: Output of calculate_projection for scalar inputs
+        names: Column names to include, in order
+
+    Returns:
+        Bytes of an Arrow IPC stream with one float64 column per name
+    """
+    table = pyarrow.table({name: np.asarray(columns[name], dtype=np.float64) for name in names})
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _json_line(value) -> str:
+    """Encode one NDJSON line; Decimals become strings as in regular JSON responses."""
+    return json.dumps(value, default=str, separators=(',', ':')) + '\n'
+
+
+def ndjson_rows(rows):
+    """Yield one NDJSON line per result row."""
+    for row in rows:
+        yield _json_line(row)
+
+
+def ndjson_column_chunks(rows, names):
+    """
+    Yield NDJSON column chunks, one line per projection year.
+
+    The first chunk holds month 0 together with year 1; every chunk ends at
+    a year-end month.
+
+    Args:
+        rows: Iterable of result row dictionaries in month order
+        names: Column names to include
+
+    Yields:
+        Lines of the form {"columns": {<column>: [values]}}
+    """
+    chunk = {name: [] for name in names}
+    for row in rows:
+        for name in names:
+            chunk[name].append(row[name])
+        if row['month'] and row['month'] % 12 == 0:
+            yield _json_line({'columns': chunk})
+            chunk = {name: [] for name in names}
+    if chunk[names[0]]:
+        yield _json_line({'columns': chunk})
@@ -0,0 +1,245 @@
+"""
+Request instrumentation and Prometheus metrics.
+
+Every request records the time spent in each stage (see
+calculations/timing.py) and reports it in a Server-Timing response header.
+The same timings, together with request and response sizes, the requested
+num_years and error counts, are aggregated into fixed-bucket histograms and
+counters, served in the Prometheus text format at /metrics.
+
+Streamed responses send their headers before the body is generated, so
+their Server-Timing header only covers the stages before streaming began;
+the recorder is kept active while the body is generated and the request is
+recorded once the stream ends, so the metrics cover the whole response.
+
+Recording costs a few perf_counter() calls per request and one short locked
+update per request. Metrics are kept per process: with several worker
+processes each reports its own values. Timing is always on; the /metrics
+endpoint is only installed when METRICS_TOKEN is set, and requires it as a
+bearer token.
+"""
+
+import bisect
+import hmac
+import threading
+
+from flask import Response, g, request
+
+from app.backend.calculations.timing import resume_recording, start_recording, stop_recording
+
+METRICS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Histogram bucket upper bounds (an implicit +Inf bucket follows)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+NUM_YEARS_BUCKETS = (1, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values (not thread-safe on its own)."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(labels: dict) -> str:
+    """Format Prometheus labels, escaping values."""
+    return ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+
+
+class MetricsRegistry:
+    """Thread-safe collection of the calculator's request metrics."""
+
+    # name: (type, help, buckets or None for counters, label names)
+    METRICS = {
+        'calculator_request_duration_seconds': (
+            'histogram', 'Request latency by endpoint.', LATENCY_BUCKETS, ('endpoint',)),
+        'calculator_stage_duration_seconds': (
+            'histogram', 'Time spent in each request stage by endpoint.', LATENCY_BUCKETS, ('endpoint', 'stage')),
+        'calculator_request_size_bytes': (
+            'histogram', 'Request body size by endpoint.', SIZE_BUCKETS, ('endpoint',)),
+        'calculator_response_size_bytes': (
+            'histogram', 'Response body size by endpoint (streamed responses excluded).', SIZE_BUCKETS,
+            ('endpoint',)),
+        'calculator_num_years': (
+            'histogram', 'Projection horizon requested, in years.', NUM_YEARS_BUCKETS, ('endpoint',)),
+        'calculator_requests_total': (
+            'counter', 'Requests by endpoint and status code.', None, ('endpoint', 'status')),
+        'calculator_errors_total': (
+            'counter', 'Requests that ended in an error (status 400 or above) by endpoint and status code.', None,
+            ('endpoint', 'status')),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {name: {} for name in self.METRICS}
+
+    def _observe(self, name: str, labels: tuple, value: float):
+        series = self._series[name]
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self.METRICS[name][2])
+        histogram.observe(value)
+
+    def _increment(self, name: str, labels: tuple):
+        series = self._series[name]
+        series[labels] = series.get(labels, 0) + 1
+
+    def record_request(self, endpoint: str, status: int, duration: float, stages: dict,
+                       request_size: int = None, response_size: int = None, num_years: int = None):
+        """
+        Record one finished request.
+
+        Args:
+            endpoint: Route rule of the request (e.g. '/api/calculate')
+            status: Response status code
+            duration: Total seconds spent handling the request
+            stages: Seconds spent in each stage (see StageRecorder.stages)
+            request_size: Request body size in bytes, if known
+            response_size: Response body size in bytes, if known
+            num_years: Requested projection horizon, if any
+        """
+        with self._lock:
+            self._observe('calculator_request_duration_seconds', (endpoint,), duration)
+            for stage, seconds in stages.items():
+                self._observe('calculator_stage_duration_seconds', (endpoint, stage), seconds)
+            if request_size is not None:
+                self._observe('calculator_request_size_bytes', (endpoint,), request_size)
+            if response_size is not None:
+                self._observe('calculator_response_size_bytes', (endpoint,), response_size)
+            if num_years is not None:
+                self._observe('calculator_num_years', (endpoint,), num_years)
+            self._increment('calculator_requests_total', (endpoint, str(status)))
+            if status >= 400:
+                self._increment('calculator_errors_total', (endpoint, str(status)))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets, label_names) in self.METRICS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in sorted(self._series[name].items()):
+                    label_text = _labels(dict(zip(label_names, labels)))
+                    if kind == 'counter':
+                        lines.append(f'{name}{{{label_text}}} {value}')
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(buckets + ('+Inf',), value.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{label_text}}} {value.total!r}')
+                    lines.append(f'{name}_count{{{label_text}}} {value.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def server_timing(stages: dict, total: float) -> str:
+    """Format stage timings (seconds) as a Server-Timing header value in milliseconds."""
+    entries = [f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in stages.items()]
+    entries.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(entries)
+
+
+def _requested_num_years(data):
+    """Return the num_years of a JSON request body as an int, or None."""
+    if not isinstance(data, dict) or 'num_years' not in data:
+        return None
+    try:
+        return int(data['num_years'])
+    except (ValueError, TypeError, ArithmeticError):
+        return None
+
+
+def _timed_stream(body, recorder, record):
+    """
+    Generate a streamed response body with its stage recorder active.
+
+    Args:
+        body: The response's iterable of chunks
+        recorder: StageRecorder of the request
+        record: Called with the total duration and the number of bytes sent
+            once the stream ends (or the client disconnects)
+
+    Time spent generating the body that no calculation stage claims is
+    recorded as the 'stream' stage.
+    """
+    token = resume_recording(recorder)
+    size = 0
+    try:
+        for chunk in body:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            size += len(chunk)
+            yield chunk
+    finally:
+        recorder.mark('stream')
+        stop_recording(token)
+        record(recorder.elapsed(), size)
+
+
+def register_metrics(app):
+    """
+    Install request instrumentation, and the /metrics endpoint when METRICS_TOKEN is set, on an app.
+
+    Args:
+        app: Flask application; the registry is stored in app.extensions['metrics']
+    """
+    registry = app.extensions['metrics'] = MetricsRegistry()
+
+    @app.before_request
+    def start_request_timing():
+        g.stage_recorder, g.stage_token = start_recording()
+
+    @app.after_request
+    def record_request_metrics(response):
+        recorder = g.get('stage_recorder')
+        if recorder is None:
+            return response
+        duration = recorder.elapsed()
+        response.headers['Server-Timing'] = server_timing(recorder.stages, duration)
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        data = request.get_json(silent=True) if request.is_json else None
+        status = response.status_code
+        request_size = request.content_length
+        num_years = _requested_num_years(data)
+
+        def record(duration, response_size):
+            registry.record_request(endpoint, status, duration, recorder.stages, request_size=request_size,
+                                    response_size=response_size, num_years=num_years)
+
+        if response.is_streamed:
+            response.response = _timed_stream(response.response, recorder, record)
+        else:
+            record(duration, response.calculate_content_length())
+        return response
+
+    @app.teardown_request
+    def stop_request_timing(exception=None):
+        token = g.pop('stage_token', None)
+        if token is not None:
+            stop_recording(token)
+
+    metrics_token = app.config.get('METRICS_TOKEN')
+    if not metrics_token:
+        return
+
+    @app.route('/metrics')
+    def metrics():
+        """Serve request metrics in the Prometheus text format to requests bearing METRICS_TOKEN."""
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {metrics_token}'.encode()):
+            return Response('Unauthorized\n', status=401, headers={'WWW-Authenticate': 'Bearer'})
+        return Response(registry.render(), content_type=METRICS_MIMETYPE)
@@ -2,53 +2,205 @@
 Flask API routes for real estate investment calculator.
 """
 
-from flask import Blueprint, request, jsonify
-from decimal import Decimal, getcontext
-
-# Set precision to 28 total digits, 14 decimal places
-getcontext().prec = 28
-getcontext().Emin = -999999
-getcontext().Emax = 999999
-from app.backend.calculations.mortgage import (
-    calculate_monthly_payment,
-    calculate_year_breakdown,
-    calculate_month_breakdown
+import hashlib
+
+from flask import Blueprint, Response, current_app, request, jsonify
+
+import numpy as np
+
+from app.backend.calculations.projection import (
+    COLUMNS,
+    ENGINE_VERSION,
+    calculate_projection,
+    calculate_batch_projection,
+    calculate_delta_projection,
+    column_to_list,
+    iter_column_rows,
+    iter_projection_rows,
+    normalize_fields,
+    projection_to_columns,
+    projection_to_rows
+)
+from app.backend.api.compression import CONTENT_CODINGS, encoded_etag
+from app.backend.api.formats import (
+    ARROW_MIMETYPE,
+    BINARY_FORMATS,
+    BINARY_MIMETYPE,
+    FORMAT_ARROW,
+    FORMAT_COLUMNS,
+    NDJSON_MIMETYPE,
+    columns_to_arrow,
+    ndjson_column_chunks,
+    ndjson_rows,
+    normalize_format,
+    pack_columns
+)
+from app.backend.calculations.cache import canonical_hash
+from app.backend.calculations.parameters import (
+    FIELD_BOUNDS,
+    INTEGER_FIELDS,
+    MAX_NUM_YEARS,
+    PERCENT_FIELDS,
+    ScenarioParams,
+    finite_float
 )
-from app.backend.calculations.expenses import (
-    calculate_maintenance,
-    calculate_property_tax,
-    calculate_rental_income,
-    calculate_maintenance_monthly,
-    calculate_property_tax_monthly,
-    calculate_rental_income_monthly
+from app.backend.calculations.precision import PRECISION_EXACT, PRECISION_FAST
+from app.backend.calculations.rollup import RESOLUTION_MONTH, normalize_resolution, rollup_projection
+from app.backend.calculations.timing import mark
+from app.backend.calculations.sweep import BREAK_EVEN_MONTH, SUMMARY_METRICS, calculate_grid_metrics
+from app.backend.calculations.solver import (
+    DEFAULT_MAX_ITERATIONS,
+    DEFAULT_TOLERANCE,
+    SOLVABLE_FIELDS,
+    SOLVABLE_METRICS,
+    UndefinedMetricError,
+    solve_input
 )
-from app.backend.calculations.investment import (
-    calculate_total_expenses,
-    calculate_deductible_expenses,
-    calculate_taxable_income,
-    calculate_taxes_due,
-    calculate_net_profit,
-    calculate_expected_return,
-    calculate_cumulative_investment,
-    calculate_cumulative_investment_new,
-    calculate_cumulative_expected_return,
-    calculate_cumulative_expected_return_monthly
+from app.backend.calculations.portfolio import PORTFOLIO_COLUMNS, calculate_portfolio
+from app.backend.calculations.sensitivity import (
+    DEFAULT_BUMP,
+    SENSITIVITY_FIELDS,
+    SENSITIVITY_METRICS,
+    calculate_case_metrics,
+    rank_sensitivities
 )
-from app.backend.calculations.sale import (
-    calculate_home_value,
-    calculate_sales_fees,
-    calculate_capital_gains_tax_ontario,
-    calculate_sale_income,
-    calculate_sale_net,
-    calculate_net_return,
-    calculate_net_return_new,
-    calculate_return_percent,
-    calculate_return_comparison
+from app.backend.calculations.simulation import (
+    DEFAULT_PERCENTILES,
+    DISTRIBUTIONS,
+    SIMULATED_RATES,
+    SIMULATION_METRICS,
+    run_simulation
 )
 
 api_bp = Blueprint('api', __name__)
 
 
+def _parse_scenario(data: dict, default_precision=None):
+    """
+    Validate and parse one scenario's request parameters.
+    
+    All validation errors are collected so the caller can report them together.
+    
+    Args:
+        data: Raw request parameters (see calculate_investment for the fields)
+        default_precision: Precision used when the data has no "precision" option
+    
+    Returns:
+        Tuple of (params, num_years, precision, errors); params and num_years
+        are None if there were validation errors
+    """
+    scenario, errors = ScenarioParams.parse(data, default_precision)
+    mark('parse')
+    if errors:
+        return None, None, None, errors
+    return scenario.to_dict(), scenario.num_years, scenario.precision, errors
+
+
+def _calculation_error_response(e: Exception):
+    """Build the JSON error response for an exception raised while calculating."""
+    if isinstance(e, ValueError):
+        error_msg = str(e)
+        if 'could not convert' in error_msg.lower() or 'invalid literal' in error_msg.lower():
+            return jsonify({'error': 'Invalid input values. Please ensure all fields contain valid numbers only (no letters or special characters).', 'details': error_msg}), 400
+        return jsonify({'error': f'Invalid value: {error_msg}'}), 400
+    if isinstance(e, ZeroDivisionError):
+        return jsonify({'error': 'Cannot divide by zero. Please check that loan years and other rate fields are not zero.'}), 400
+    return jsonify({'error': f'Calculation error: {str(e)}'}), 500
+
+
+def _partial_key(key: str, names) -> str:
+    """Return the cache key of a projection of only some columns (see _cached_projection)."""
+    return key if names is COLUMNS else f"{key}:{','.join(names)}"
+
+
+def _cached_projection(params: dict, num_years: int, precision: str, key: str = None, names=COLUMNS,
+                       base: dict = None) -> dict:
+    """
+    Return projection columns from the result cache, projecting and storing them on a miss.
+    
+    A cached full projection answers any names. Otherwise a projection of
+    some columns computes only them (and, in fast precision, the columns they
+    depend on) and is cached under its own key. On a miss, a fast projection
+    whose base scenario (normalized params over the same horizon) is cached
+    with the same columns or all of them is recalculated from it,
+    recomputing only the columns the changed inputs affect.
+    """
+    cache = current_app.extensions['projection_cache']
+    if key is None:
+        key = canonical_hash(params, num_years, precision)
+    columns = cache.get(key)
+    projected_names = COLUMNS
+    if columns is None and names is not COLUMNS:
+        projected_names = names
+        key = _partial_key(key, names)
+        columns = cache.get(key)
+    if columns is None and base is not None:
+        base_key = canonical_hash(base, num_years, precision)
+        previous = cache.get(base_key)
+        if previous is None and projected_names is not COLUMNS:
+            previous = cache.get(_partial_key(base_key, names))
+        if previous is not None:
+            mark('cache')
+            changed = [name for name in params if params[name] != base[name]]
+            columns = calculate_delta_projection(params, num_years, previous, changed, projected_names)
+            cache.put(key, columns)
+    mark('cache')
+    if columns is None:
+        columns = calculate_projection(params, num_years, precision, names=projected_names)
+        cache.put(key, columns)
+    return columns if names is COLUMNS else {name: columns[name] for name in names}
+
+
+def _projection_etag(*parts) -> str:
+    """
+    Build a strong ETag for a projection response.
+
+    Args:
+        parts: The input hash (see canonical_hash) and every request option
+            that changes the response body; ENGINE_VERSION is added so
+            results of an earlier engine never match
+
+    Returns:
+        Unquoted ETag value
+    """
+    key = '|'.join(str(part) for part in (ENGINE_VERSION,) + parts)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def _not_modified(etag: str):
+    """Return a 304 response if If-None-Match matches the ETag (in any content coding), otherwise None."""
+    if not request.if_none_match:
+        return None
+    for candidate in (etag,) + tuple(encoded_etag(etag, encoding) for encoding in CONTENT_CODINGS):
+        if request.if_none_match.contains(candidate):
+            response = Response(status=304)
+            response.set_etag(candidate)
+            return response
+    return None
+
+
+def _format_projection(columns: dict, response_format: str, names=COLUMNS) -> dict:
+    """Build the JSON body for a single-scenario projection in rows or columns format."""
+    if response_format == FORMAT_COLUMNS:
+        body = {'columns': projection_to_columns(columns, names)}
+    else:
+        body = {'results': projection_to_rows(columns, names)}
+    mark('serialize')
+    return body
+
+
+def _projection_response(columns: dict, response_format: str, names=COLUMNS):
+    """Build the response for a single-scenario projection in any response format."""
+    if response_format == FORMAT_ARROW:
+        response = Response(columns_to_arrow(columns, names), mimetype=ARROW_MIMETYPE)
+    elif response_format in BINARY_FORMATS:
+        response = Response(pack_columns(columns, names), mimetype=BINARY_MIMETYPE)
+    else:
+        response = jsonify(_format_projection(columns, response_format, names))
+    mark('serialize')
+    return response
+
+
 @api_bp.route('/calculate', methods=['POST'])
 def calculate_investment():
     """
@@ -76,288 +228,1056 @@ def calculate_investment():
         "expected_return_rate": float (as percentage),
         "real_estate_market_increase": float (as percentage),
         "commission_percentage": float (as percentage),
-        "num_years": int
+        "indexation": {  (optional, per series: "rental_income", "property_tax"
+                          or "maintenance")
+            "<series>": {
+                "steps": [{"year": int, "increase": float (as percentage)}, ...],
+                "overrides": [{"year": int, "increase": float (as percentage)}, ...]
+            }
+        },
+        "num_years": int,
+        "precision": str (optional, "fast" or "exact"; defaults to the
+                     CALCULATION_PRECISION setting),
+        "format": str (optional, "rows", "columns", "binary" or "arrow";
+                  defaults to "rows"),
+        "resolution": str (optional, "month", "quarter" or "year"; defaults
+                      to "month"),
+        "stream": bool (optional, stream newline-delimited JSON; also enabled
+                  by "Accept: application/x-ndjson"),
+        "fields": list of column names (optional; defaults to every column)
     }
+    
+    Indexation steps change a series' yearly increase from the given year
+    onward; overrides replace it for that year only (e.g. an override of 0
+    freezes rent for one year). Years are numbered from 1 and the first year
+    can not be changed.
+    
+    With "exact" precision every value is computed as a Decimal and
+    serialized as a decimal string so no precision is lost.
+    
+    With "fields", only the listed columns (plus "month") are returned, and
+    fast precision computes only them and the columns they depend on (see
+    COLUMN_DEPENDENCIES in calculations/projection.py). Months with no rate
+    solving their cash flows have an IRR of null.
+    
+    Quarterly and yearly resolutions return month 0 followed by one entry per
+    period: flow columns (payments, expenses, income, taxes) are summed over
+    the period and all other columns are read at its last month.
+    
+    Returns:
+    - rows: {"results": [{<column>: value, ...}, ...]} with one object per month
+    - columns: {"columns": {<column>: [value per month], ...}}
+    - binary: packed float64 column buffers (see api/formats.py), fast precision only
+    - arrow: Arrow IPC stream, fast precision only, when pyarrow is installed
+    
+    Streaming responses (application/x-ndjson) write one row object per line
+    for the rows format, or one {"columns": {...}} chunk per year for the
+    columns format. Only exact monthly projections are generated month by
+    month as lines are written, so their memory stays constant per request.
+    Fast projections and rollups are computed in full before the first line
+    is written; streaming them spreads out the encoding but does not make
+    the first line arrive sooner.
+    
+    Responses carry a strong ETag derived from the normalized inputs, the
+    response options and the engine version. A request whose If-None-Match
+    holds that ETag gets 304 Not Modified without recalculating.
     """
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided. Please fill in all required fields.'}), 400
+        return _calculate_response(data)
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+def _calculate_response(data: dict, base: dict = None):
+    """
+    Build the /calculate response for one scenario's request data.
+    
+    Args:
+        data: Scenario parameters and response options (see calculate_investment)
+        base: Parameters of a previous scenario whose cached projection may be
+            reused for the columns the differences do not affect (see
+            calculate_investment_delta)
+    """
+    params, num_years, precision, errors = _parse_scenario(
+        data, current_app.config.get('CALCULATION_PRECISION')
+    )
+    delta_base = None
+    if base is not None:
+        base_params, base_years, _, base_errors = _parse_scenario(
+            base, current_app.config.get('CALCULATION_PRECISION')
+        )
+        errors.extend(f'Base: {error}' for error in base_errors)
+        # Only fast projections over the same horizon can reuse the base's columns
+        if not errors and base_years == num_years and precision == PRECISION_FAST:
+            delta_base = base_params
+    try:
+        response_format = normalize_format(data.get('format'))
+        if response_format in BINARY_FORMATS and precision != PRECISION_FAST:
+            errors.append('Binary formats require fast precision')
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        resolution = normalize_resolution(data.get('resolution'))
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        names = normalize_fields(data.get('fields'))
+    except ValueError as e:
+        errors.append(str(e))
+    if errors:
+        return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+    
+    stream = data.get('stream') in (True, 'true', '1') or (
+        request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+    )
+    if stream and response_format in BINARY_FORMATS:
+        return jsonify({'error': 'Validation errors', 'errors': ['Streaming supports the rows and columns formats only']}), 400
+    
+    key = canonical_hash(params, num_years, precision)
+    etag = _projection_etag(key, response_format, resolution, stream, ','.join(names))
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    
+    if stream:
+        if precision == PRECISION_EXACT and resolution == RESOLUTION_MONTH:
+            rows = iter_projection_rows(params, num_years, precision, names)
+        else:
+            columns = _cached_projection(params, num_years, precision, key, names, delta_base)
+            rows = iter_column_rows(rollup_projection(columns, resolution), names)
+        lines = ndjson_column_chunks(rows, names) if response_format == FORMAT_COLUMNS else ndjson_rows(rows)
+        response = Response(lines, mimetype=NDJSON_MIMETYPE)
+    else:
+        # Project every month at once; month 0 is the initial state
+        columns = _cached_projection(params, num_years, precision, key, names, delta_base)
+        columns = rollup_projection(columns, resolution)
+        response = _projection_response(columns, response_format, names)
+    response.set_etag(etag)
+    return response
+
+
+# Response options of /calculate/delta, given beside base and changes
+DELTA_OPTIONS = ('precision', 'format', 'resolution', 'stream', 'fields')
+
+
+@api_bp.route('/calculate/delta', methods=['POST'])
+def calculate_investment_delta():
+    """
+    Recalculate a scenario after some of its inputs changed.
+    
+    Expected request body:
+    {
+        "base": object of the previous scenario's parameters (same fields as
+                /calculate),
+        "changes": object of the parameters that differ from base,
+        "precision", "format", "resolution", "stream", "fields": as in
+                /calculate (optional)
+    }
+    
+    The scenario calculated is base updated with changes. When the base
+    scenario's projection is still in the result cache (e.g. because it was
+    the last one calculated), fast-precision columns that none of the changed
+    inputs affect are reused from it and only the invalidated columns are
+    recomputed (see INPUT_DEPENDENCIES in calculations/projection.py);
+    otherwise the scenario is projected in full. Results are identical
+    either way.
+    
+    Returns the same response (and ETag) as /calculate for the updated scenario.
+    """
+    try:
+        data = request.get_json()
+        base = data.get('base') if isinstance(data, dict) else None
+        changes = data.get('changes', {}) if isinstance(data, dict) else None
+        if not base or not isinstance(base, dict) or not isinstance(changes, dict):
+            return jsonify({'error': 'Please provide "base" scenario parameters and a "changes" object.'}), 400
+        
+        options = {name: data[name] for name in DELTA_OPTIONS if name in data}
+        # Top-level options win over the same keys inside base or changes
+        return _calculate_response({**base, **changes, **options}, {**base, **options})
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+@api_bp.route('/calculate/batch', methods=['POST'])
+def calculate_investment_batch():
+    """
+    Calculate investment metrics for many scenarios in one request.
+    
+    Expected request body:
+    {
+        "scenarios": list or object of scenario parameter sets, each with the
+                     same fields as /calculate,
+        "precision": str (optional default for scenarios without their own),
+        "format": str (optional, "columns" or "rows"; defaults to "columns"),
+        "resolution": str (optional, "month", "quarter" or "year"; defaults
+                      to "month"),
+        "fields": list of column names (optional; defaults to every column,
+                  as in /calculate)
+    }
+    
+    Scenarios already in the result cache are answered from it. The remaining
+    fast-precision scenarios are stacked and projected together in a single
+    vectorized pass; exact-precision scenarios are projected one by one.
+    
+    Unlike /calculate, results default to the columns format: rows build one
+    dictionary per month per scenario and repeat every column name in each,
+    which makes large batches markedly slower to encode and larger to send.
+    
+    Returns:
+    {
+        "results": {
+            <scenario key>: {"columns": {...}} (or {"results": [...]})
+                         or {"error": "Validation errors", "errors": [...]}
+        }
+    }
+    Scenario keys are the object keys, or the list indexes as strings.
+    """
+    try:
+        data = request.get_json()
+        scenarios = data.get('scenarios') if isinstance(data, dict) else None
+        if not scenarios or not isinstance(scenarios, (list, dict)):
+            return jsonify({'error': 'No scenarios provided. Send a non-empty "scenarios" list or object.'}), 400
+        
+        if isinstance(scenarios, list):
+            scenarios = {str(index): scenario for index, scenario in enumerate(scenarios)}
+        default_precision = data.get('precision', current_app.config.get('CALCULATION_PRECISION'))
+        try:
+            response_format = normalize_format(data.get('format'), default=FORMAT_COLUMNS)
+            if response_format in BINARY_FORMATS:
+                raise ValueError('Batch results support the rows and columns formats only')
+            resolution = normalize_resolution(data.get('resolution'))
+            names = normalize_fields(data.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': 'Validation errors', 'errors': [str(e)]}), 400
+        
+        cache = current_app.extensions['projection_cache']
+        response = {}
+        fast_keys = []
+        fast_params = []
+        fast_years = []
+        for key, scenario in scenarios.items():
+            if not isinstance(scenario, dict) or not scenario:
+                response[key] = {'error': 'No data provided. Please fill in all required fields.'}
+                continue
+            params, num_years, precision, errors = _parse_scenario(scenario, default_precision)
+            if errors:
+                response[key] = {'error': 'Validation errors', 'errors': errors}
+            elif precision == PRECISION_FAST:
+                cache_key = canonical_hash(params, num_years, precision)
+                # A cached full projection answers any fields (see _cached_projection)
+                columns = cache.get(cache_key)
+                if columns is None and names is not COLUMNS:
+                    cache_key = _partial_key(cache_key, names)
+                    columns = cache.get(cache_key)
+                if columns is None:
+                    fast_keys.append((key, cache_key))
+                    fast_params.append(params)
+                    fast_years.append(num_years)
+                else:
+                    response[key] = _format_projection(rollup_projection(columns, resolution), response_format, names)
+            else:
+                columns = rollup_projection(_cached_projection(params, num_years, precision, names=names), resolution)
+                response[key] = _format_projection(columns, response_format, names)
+        
+        # Cache misses are projected together in one vectorized pass
+        if fast_keys:
+            projections = calculate_batch_projection(fast_params, fast_years, names)
+            for (key, cache_key), columns in zip(fast_keys, projections):
+                cache.put(cache_key, columns)
+                response[key] = _format_projection(rollup_projection(columns, resolution), response_format, names)
+        
+        return jsonify({'results': {key: response[key] for key in scenarios}})
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+@api_bp.route('/cache/stats', methods=['GET'])
+def projection_cache_stats():
+    """
+    Report projection result cache statistics.
+    
+    Returns:
+    {
+        "hits": int, "misses": int, "hit_rate": float,
+        "entries": int, "size_bytes": int,
+        "evictions": int, "expirations": int,
+        "max_entries": int, "max_bytes": int, "ttl": float or null
+    }
+    """
+    return jsonify(current_app.extensions['projection_cache'].stats())
+
+
+@api_bp.route('/scenarios', methods=['POST'])
+def create_stored_scenario():
+    """
+    Calculate a scenario and keep its result on the server under a handle.
+    
+    Expected request body: scenario parameters (same fields as /calculate).
+    Posting the same inputs again returns the same handle and renews it.
+    
+    Returns (201):
+    {
+        "handle": str,
+        "num_months": int (rows including month 0),
+        "precision": str,
+        "columns": list of available column names,
+        "expires_in": float (seconds) or null
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided. Please fill in all required fields.'}), 400
+        
+        params, num_years, precision, errors = _parse_scenario(
+            data, current_app.config.get('CALCULATION_PRECISION')
+        )
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        store = current_app.extensions['scenario_store']
+        handle = canonical_hash(params, num_years, precision)
+        store.put(handle, _cached_projection(params, num_years, precision))
+        
+        return jsonify({
+            'handle': handle,
+            'num_months': num_years * 12 + 1,
+            'precision': precision,
+            'columns': list(COLUMNS),
+            'expires_in': store.ttl
+        }), 201
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+def _window_columns(columns: dict, names, start: int, stop) -> dict:
+    """Select the named columns for months in [start, stop)."""
+    months = np.asarray(columns['month'])
+    keep = months >= start
+    if stop is not None:
+        keep &= months < stop
+    window = {}
+    for name in names:
+        column = columns[name]
+        if isinstance(column, np.ndarray):
+            window[name] = column[keep]
+        else:
+            window[name] = [value for value, kept in zip(column, keep) if kept]
+    return window
+
+
+@api_bp.route('/scenarios/<handle>', methods=['GET'])
+def read_stored_scenario(handle):
+    """
+    Read columns and a month range of a stored scenario.
+    
+    Query parameters (all optional):
+        columns: comma-separated column names (defaults to every column)
+        start: first month to include (defaults to 0)
+        stop: month to stop before (defaults to the end of the projection)
+        resolution: "month", "quarter" or "year" (months refer to period ends)
+        format: "rows", "columns", "binary" or "arrow" (defaults to "columns")
+    
+    Returns the selected data in the requested format, or 404 if the handle
+    is unknown or has expired. Responses carry a strong ETag and honor
+    If-None-Match with 304 Not Modified.
+    """
+    try:
+        columns = current_app.extensions['scenario_store'].get(handle)
+        if columns is None:
+            return jsonify({'error': 'Scenario not found or expired. Create it again with POST /api/scenarios.'}), 404
         
-        # Extract parameters with error handling
         errors = []
+        names = [name.strip() for name in request.args.get('columns', '').split(',') if name.strip()] or list(COLUMNS)
+        errors.extend(f'Unknown column: {name}' for name in names if name not in COLUMNS)
         
         try:
-            purchase_price = float(data.get('purchase_price', 0))
-            if purchase_price <= 0:
-                errors.append('Purchase Price must be greater than 0')
-        except (ValueError, TypeError):
-            errors.append('Purchase Price must be a valid number')
+            start = int(request.args.get('start', 0))
+            stop = request.args.get('stop')
+            stop = int(stop) if stop is not None else None
+        except ValueError:
+            errors.append('Start and stop must be valid integers')
         
         try:
-            downpayment_percentage = float(data.get('downpayment_percentage', 20)) / 100
-            if downpayment_percentage < 0 or downpayment_percentage > 1:
-                errors.append('Downpayment Percentage must be between 0 and 100')
-        except (ValueError, TypeError):
-            errors.append('Downpayment Percentage must be a valid number')
+            resolution = normalize_resolution(request.args.get('resolution'))
+        except ValueError as e:
+            errors.append(str(e))
         
         try:
-            interest_rate = float(data.get('interest_rate', 0)) / 100
-            if interest_rate < 0:
-                errors.append('Interest Rate cannot be negative')
-        except (ValueError, TypeError):
-            errors.append('Interest Rate must be a valid number')
+            response_format = normalize_format(request.args.get('format', FORMAT_COLUMNS))
+            if response_format in BINARY_FORMATS and not isinstance(columns['month'], np.ndarray):
+                errors.append('Binary formats require fast precision')
+        except ValueError as e:
+            errors.append(str(e))
+        
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        # The handle is the input hash, so it identifies the stored result
+        etag = _projection_etag(handle, ','.join(names), start, stop, resolution, response_format)
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        window = _window_columns(rollup_projection(columns, resolution), names, start, stop)
+        response = _projection_response(window, response_format, names)
+        response.set_etag(etag)
+        return response
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+@api_bp.route('/scenarios/<handle>', methods=['DELETE'])
+def delete_stored_scenario(handle):
+    """Remove a stored scenario; returns 204, or 404 if the handle is unknown."""
+    if not current_app.extensions['scenario_store'].discard(handle):
+        return jsonify({'error': 'Scenario not found or expired.'}), 404
+    return '', 204
+
+
+# Input fields that can be swept, and the largest grid a single request may evaluate
+SWEEP_FIELDS = (
+    'purchase_price', 'downpayment_percentage', 'closing_costs', 'land_transfer_tax',
+    'interest_rate', 'loan_years', 'payment_type', 'maintenance_base', 'maintenance_increase',
+    'property_tax_base', 'property_tax_increase', 'insurance', 'utilities', 'repairs',
+    'rental_income_base', 'rental_increase', 'marginal_tax_rate', 'expected_return_rate',
+    'real_estate_market_increase', 'commission_percentage'
+)
+MAX_SWEEP_CELLS = 250000
+# Upper bound on grid cells * projected months (the cell limit at a 30-year horizon)
+MAX_SWEEP_CELL_MONTHS = MAX_SWEEP_CELLS * (30 * 12 + 1)
+
+
+def _sweep_values(spec) -> list:
+    """
+    Expand a sweep axis specification into its list of raw values.
+    
+    Accepts a list of values, {"start", "stop", "step"} (stop inclusive) or
+    {"start", "stop", "num"} (evenly spaced, like numpy.linspace).
+    """
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, dict) and 'start' in spec and 'stop' in spec:
+        start = float(spec['start'])
+        stop = float(spec['stop'])
+        if not np.isfinite([start, stop]).all():
+            raise ValueError('start and stop must be finite numbers')
+        if 'num' in spec:
+            count = int(spec['num'])
+        else:
+            step = float(spec.get('step', 0))
+            if not 0 < step < np.inf or stop < start:
+                raise ValueError('step must be a finite number greater than 0 and stop must not be less than start')
+            count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        if count > MAX_SWEEP_CELLS:
+            raise ValueError(f'has {count} values; the maximum is {MAX_SWEEP_CELLS}')
+        if 'num' in spec:
+            return np.linspace(start, stop, count).tolist()
+        return (start + step * np.arange(count)).tolist()
+    raise ValueError('must be a list of values or an object with start, stop and step or num')
+
+
+@api_bp.route('/sweep', methods=['POST'])
+def sweep_investment():
+    """
+    Evaluate summary metrics over a Cartesian grid of input values.
+    
+    Expected request body:
+    {
+        "base": scenario parameters (same fields as /calculate),
+        "sweep": {<input field>: list of values or {"start", "stop", "step"|"num"}, ...},
+        "metrics": list of metric names (optional, defaults to net_return,
+                   return_percent, return_comparison and break_even_month),
+        "year": int (optional, year at which metrics are read, at most
+                "num_years" from base; defaults to "num_years")
+    }
+    
+    Sweep values use the same units as /calculate (percentages as percentages).
+    Grid cells times projected months are limited to MAX_SWEEP_CELL_MONTHS.
+    Every metric is a column name from /calculate read at the end of the given
+    year, or "break_even_month" (first month with net_return >= 0, or null).
+    Sweeps always use fast precision.
+    
+    Returns:
+    {
+        "axes": [{"field": str, "values": list}, ...],
+        "year": int,
+        "metrics": {<metric>: nested lists indexed like the axes}
+    }
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('base'), dict) or not data.get('sweep'):
+            return jsonify({'error': 'Please provide "base" scenario parameters and a non-empty "sweep" object.'}), 400
+        
+        base = dict(data['base'], precision=PRECISION_FAST)
+        sweep = data['sweep']
+        metrics = data.get('metrics') or ['net_return', 'return_percent', 'return_comparison', BREAK_EVEN_MONTH]
+        
+        params, num_years, _, errors = _parse_scenario(base)
+        if not isinstance(sweep, dict):
+            errors.append('Sweep must be an object mapping input fields to values')
+            sweep = {}
+        errors.extend(f'Unknown metric: {metric}' for metric in metrics if metric not in SUMMARY_METRICS)
+        
+        raw_axes = {}
+        for field, spec in sweep.items():
+            if field not in SWEEP_FIELDS:
+                errors.append(f'{field} cannot be swept')
+                continue
+            try:
+                raw_values = _sweep_values(spec)
+            except (ValueError, TypeError, KeyError, ArithmeticError) as e:
+                errors.append(f'Sweep for {field} {e}')
+                continue
+            if not raw_values:
+                errors.append(f'Sweep for {field} has no values')
+                continue
+            raw_axes[field] = raw_values
         
         try:
-            loan_years = int(data.get('loan_years', 30))
-            if loan_years <= 0:
-                errors.append('Loan Years must be greater than 0')
-        except (ValueError, TypeError):
-            errors.append('Loan Years must be a valid integer')
-        
-        # Check other numeric fields
-        numeric_fields = {
-            'maintenance_base': 'Maintenance - Monthly Base',
-            'maintenance_increase': 'Maintenance - Yearly Increase',
-            'property_tax_base': 'Property Tax - Annual Base',
-            'property_tax_increase': 'Property Tax - Yearly Increase',
-            'insurance': 'Annual Insurance',
-            'utilities': 'Monthly Utilities',
-            'repairs': 'Annual Repairs',
-            'rental_income_base': 'Monthly Rental',
-            'rental_increase': 'Rental - Yearly Increase',
-            'marginal_tax_rate': 'Marginal Tax Rate',
-            'expected_return_rate': 'Expected Return Rate',
-            'real_estate_market_increase': 'Real Estate Market Increase',
-            'commission_percentage': 'Commission Percentage',
-            'closing_costs': 'Closing Costs',
-            'land_transfer_tax': 'Land Transfer Tax'
+            year = int(data.get('year', num_years or 0))
+            if num_years is not None and not 0 < year <= num_years:
+                errors.append(f'Year must be between 1 and {num_years}')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Year must be a valid integer')
+            year = 0
+        
+        # The grid's size is checked before any of its values is parsed
+        num_cells = int(np.prod([len(values) for values in raw_axes.values()]))
+        if num_cells * (year * 12 + 1) > MAX_SWEEP_CELL_MONTHS:
+            errors.append(f'Sweep grid has {num_cells} cells over {year * 12} months; '
+                          f'the maximum is {MAX_SWEEP_CELL_MONTHS} cell-months')
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        # Validate each axis value once by parsing it in place of the base value
+        axes = {}
+        for field, raw_values in raw_axes.items():
+            parsed = []
+            for value in raw_values:
+                cell_params, _, _, cell_errors = _parse_scenario(dict(base, **{field: value}))
+                if cell_errors:
+                    errors.extend(f'{field} = {value}: {error}' for error in cell_errors)
+                    break
+                parsed.append(cell_params[field])
+            axes[field] = np.array(parsed)
+        
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        grid = calculate_grid_metrics(params, axes, year, metrics)
+        
+        response_metrics = {}
+        for metric, values in grid.items():
+            if metric == BREAK_EVEN_MONTH:
+                values = np.where(values < 0, None, values)
+            response_metrics[metric] = column_to_list(values)
+        
+        return jsonify({
+            'axes': [{'field': field, 'values': values} for field, values in raw_axes.items()],
+            'year': year,
+            'metrics': response_metrics
+        })
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+MAX_SIMULATION_PATHS = 100000
+
+
+@api_bp.route('/simulate', methods=['POST'])
+def simulate_investment():
+    """
+    Run a Monte Carlo simulation around a base scenario.
+    
+    Expected request body:
+    {
+        "base": scenario parameters (same fields as /calculate; the rates
+                below are used as the mean of their paths),
+        "simulation": {
+            "num_paths": int (optional, defaults to 1000),
+            "seed": int (optional, defaults to 0),
+            "distribution": "normal" or "student_t" (optional, defaults to normal),
+            "degrees_of_freedom": float (optional, student_t only, defaults to 5),
+            "volatility": {
+                "real_estate_market_increase": float (annual, as percentage),
+                "rental_increase": float (annual, as percentage),
+                "interest_rate": float (annual, as percentage)
+            },
+            "percentiles": list of floats (optional, defaults to [5, 25, 50, 75, 95])
         }
+    }
+    
+    Results are reproducible for a given seed and number of paths.
+    Simulations always use fast precision.
+    
+    Returns:
+    {
+        "months": list of month numbers,
+        "num_paths": int,
+        "percentiles": list of floats,
+        "bands": {<metric>: {"p5": list, "p25": list, ...}} for net_return,
+                 home_value and sale_net
+    }
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('base'), dict):
+            return jsonify({'error': 'Please provide "base" scenario parameters.'}), 400
+        
+        settings = data.get('simulation') or {}
+        params, num_years, _, errors = _parse_scenario(dict(data['base'], precision=PRECISION_FAST))
+        if not isinstance(settings, dict):
+            errors.append('Simulation must be an object')
+            settings = {}
+        
+        try:
+            num_paths = int(settings.get('num_paths', 1000))
+            if num_paths <= 0 or num_paths > MAX_SIMULATION_PATHS:
+                errors.append(f'Number of paths must be between 1 and {MAX_SIMULATION_PATHS}')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Number of paths must be a valid integer')
+        
+        try:
+            seed = int(settings.get('seed', 0))
+            if seed < 0:
+                errors.append('Seed must be 0 or greater')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Seed must be a valid integer')
+        
+        distribution = settings.get('distribution', 'normal')
+        if distribution not in DISTRIBUTIONS:
+            errors.append(f"Distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+        
+        try:
+            degrees_of_freedom = finite_float(settings.get('degrees_of_freedom', 5))
+            if distribution == 'student_t' and not degrees_of_freedom > 2:
+                errors.append('Degrees of freedom must be greater than 2')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Degrees of freedom must be a valid number')
         
-        for field, label in numeric_fields.items():
+        volatility = {}
+        raw_volatility = settings.get('volatility') or {}
+        if not isinstance(raw_volatility, dict):
+            errors.append('Volatility must be an object')
+            raw_volatility = {}
+        for field, value in raw_volatility.items():
+            if field not in SIMULATED_RATES:
+                errors.append(f'{field} cannot be simulated')
+                continue
             try:
-                value = float(data.get(field, 0))
-                if value < 0 and field not in ['maintenance_increase', 'property_tax_increase', 'rental_increase', 'real_estate_market_increase']:
-                    errors.append(f'{label} cannot be negative')
-            except (ValueError, TypeError):
-                errors.append(f'{label} must be a valid number')
+                volatility[field] = finite_float(value) / 100
+                if volatility[field] < 0:
+                    errors.append(f'Volatility for {field} cannot be negative')
+            except (ValueError, TypeError, ArithmeticError):
+                errors.append(f'Volatility for {field} must be a valid number')
+        
+        percentiles = settings.get('percentiles') or list(DEFAULT_PERCENTILES)
+        try:
+            percentiles = [finite_float(value) for value in percentiles]
+            if any(value < 0 or value > 100 for value in percentiles):
+                errors.append('Percentiles must be between 0 and 100')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Percentiles must be a list of numbers')
         
         if errors:
             return jsonify({'error': 'Validation errors', 'errors': errors}), 400
         
-        # Extract parameters (now safe to do) - convert to Decimal for precision
-        purchase_price = float(Decimal(str(data.get('purchase_price', 0))))
-        downpayment_percentage = float(Decimal(str(data.get('downpayment_percentage', 20))) / Decimal('100'))
-        downpayment = float(Decimal(str(purchase_price)) * Decimal(str(downpayment_percentage)))
-        closing_costs = float(Decimal(str(data.get('closing_costs', 0))))
-        land_transfer_tax = float(Decimal(str(data.get('land_transfer_tax', 0))))
-        # Total initial investment = downpayment + closing costs + land transfer tax
-        total_initial_investment = float(Decimal(str(downpayment)) + Decimal(str(closing_costs)) + Decimal(str(land_transfer_tax)))
-        interest_rate = float(Decimal(str(data.get('interest_rate', 0))) / Decimal('100'))
-        loan_years = int(data.get('loan_years', 30))
-        maintenance_base = float(Decimal(str(data.get('maintenance_base', 0))))
-        maintenance_increase = float(Decimal(str(data.get('maintenance_increase', 0))) / Decimal('100'))
-        property_tax_base = float(Decimal(str(data.get('property_tax_base', 0))))
-        property_tax_increase = float(Decimal(str(data.get('property_tax_increase', 0))) / Decimal('100'))
-        insurance = float(Decimal(str(data.get('insurance', 0))))
-        utilities = float(Decimal(str(data.get('utilities', 0))))
-        repairs = float(Decimal(str(data.get('repairs', 0))))
-        rental_income_base = float(Decimal(str(data.get('rental_income_base', 0))))
-        rental_increase = float(Decimal(str(data.get('rental_increase', 0))) / Decimal('100'))
-        marginal_tax_rate = float(Decimal(str(data.get('marginal_tax_rate', 0))) / Decimal('100'))
-        expected_return_rate = float(Decimal(str(data.get('expected_return_rate', 0))) / Decimal('100'))
-        real_estate_market_increase = float(Decimal(str(data.get('real_estate_market_increase', 0))) / Decimal('100'))
-        commission_percentage = float(Decimal(str(data.get('commission_percentage', 5))) / Decimal('100'))
-        num_years = int(data.get('num_years', 30))
-        
-        # Extract payment type and normalize it
-        payment_type_raw = data.get('payment_type', 'Principal and Interest')
-        if payment_type_raw == 'Interest Only':
-            payment_type = 'interest_only'
-        else:
-            payment_type = 'principal_and_interest'  # Default
+        config = {
+            'volatility': volatility,
+            'distribution': distribution,
+            'degrees_of_freedom': degrees_of_freedom
+        }
+        bands = run_simulation(
+            params, num_years, config, num_paths, seed=seed,
+            percentiles=percentiles, workers=current_app.config.get('SIMULATION_WORKERS')
+        )
         
-        # Calculate loan principal using Decimal
-        loan_principal = float(Decimal(str(purchase_price)) - Decimal(str(downpayment)))
+        labels = [f'p{value:g}' for value in percentiles]
+        return jsonify({
+            'months': list(range(num_years * 12 + 1)),
+            'num_paths': num_paths,
+            'percentiles': percentiles,
+            'bands': {
+                metric: dict(zip(labels, bands[metric].tolist()))
+                for metric in SIMULATION_METRICS
+            }
+        })
+    
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+@api_bp.route('/solve', methods=['POST'])
+def solve_investment():
+    """
+    Goal-seek: find the input value at which a metric reaches a target.
+    
+    Expected request body:
+    {
+        "base": scenario parameters (same fields as /calculate),
+        "field": str (input to solve for, e.g. "rental_income_base"),
+        "metric": str (column name from /calculate, e.g. "return_comparison"),
+        "target": float (value the metric should reach, in the units
+                  /calculate reports it in),
+        "year": int or "month": int (when the metric is read; "year" means
+                the end of that year),
+        "lower": float (optional, lower end of the search range; defaults to
+                 0 or the lowest value the field accepts, whichever is higher),
+        "upper": float (optional, upper end of the search range; when omitted
+                 the range is widened until the target is reached, up to the
+                 highest value the field accepts),
+        "tolerance": float (optional, precision of the solved input),
+        "max_iterations": int (optional)
+    }
+    
+    The field, bounds and tolerance use the same units as /calculate
+    (percentages as percentages). Each iteration projects only up to the
+    target month and only the columns the metric depends on. Solving always
+    uses fast precision. The month must lie within the base scenario's
+    horizon, and the search stays within the values /calculate accepts for
+    the field. A metric that is not finite somewhere in the search range
+    (e.g. a return_percent with nothing invested) gets a 422 response.
+    
+    Returns:
+    {
+        "field": str, "metric": str, "month": int, "target": float,
+        "value": float (solved input),
+        "metric_value": float (metric at the solved input),
+        "iterations": int, "evaluations": int, "converged": bool
+    }
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('base'), dict):
+            return jsonify({'error': 'Please provide "base" scenario parameters.'}), 400
         
-        # Calculate monthly payment
-        monthly_payment = calculate_monthly_payment(loan_principal, interest_rate, loan_years, payment_type)
+        params, num_years, _, errors = _parse_scenario(dict(data['base'], precision=PRECISION_FAST))
+        field = data.get('field')
+        metric = data.get('metric')
+        if field not in SOLVABLE_FIELDS:
+            errors.append(f"Field must be one of: {', '.join(SOLVABLE_FIELDS)}")
+        if metric not in SOLVABLE_METRICS:
+            errors.append(f"Metric must be one of: {', '.join(SOLVABLE_METRICS)}")
+        scale = 100.0 if field in PERCENT_FIELDS else 1.0
         
-        # Monthly amounts (divide annual by 12 for insurance and repairs) using Decimal
-        insurance_monthly = float(Decimal(str(insurance)) / Decimal('12'))
-        utilities_monthly = utilities  # Already monthly
-        repairs_monthly = float(Decimal(str(repairs)) / Decimal('12'))
+        try:
+            month = int(data['month']) if 'month' in data else int(data.get('year', num_years or 0)) * 12
+            if num_years is not None and not 0 < month <= num_years * 12:
+                errors.append(f'Month must be between 1 and {num_years * 12}')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Year and month must be valid integers')
         
-        # Initialize results
-        results = []
-        principal_remaining = loan_principal
-        cumulative_investment_old = total_initial_investment  # Keep old calculation for expected return
-        cumulative_net_profit = 0.0  # Track cumulative net profit for new calculation
-        cumulative_expected_return = 0.0  # Start at 0, will be sum of expected return values
+        options = {}
+        for name, default in (('target', None), ('lower', None), ('upper', None),
+                              ('tolerance', DEFAULT_TOLERANCE * scale)):
+            value = data.get(name, default)
+            if value is None:
+                if name == 'target':
+                    errors.append('Target must be provided')
+                options[name] = None
+                continue
+            try:
+                options[name] = finite_float(value)
+            except (ValueError, TypeError, ArithmeticError):
+                errors.append(f'{name.capitalize()} must be a valid number')
+        if options.get('tolerance') is not None and options['tolerance'] <= 0:
+            errors.append('Tolerance must be greater than 0')
+        if options.get('upper') is not None and options.get('lower') is not None \
+                and options['upper'] <= options['lower']:
+            errors.append('Upper must be greater than lower')
+        if field in FIELD_BOUNDS:
+            low, high = FIELD_BOUNDS[field]
+            errors.extend(f'{name.capitalize()} must be between {low:,} and {high:,}'
+                          for name in ('lower', 'upper')
+                          if options.get(name) is not None and not low <= options[name] <= high)
+        try:
+            max_iterations = int(data.get('max_iterations', DEFAULT_MAX_ITERATIONS))
+            if max_iterations <= 0:
+                errors.append('Max iterations must be greater than 0')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Max iterations must be a valid integer')
         
-        num_months = num_years * 12
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
         
-        # Month 0 - initial state
-        home_value_0 = calculate_home_value(purchase_price, real_estate_market_increase, 0)
-        sales_fees_0 = calculate_sales_fees(home_value_0, commission_percentage)
-        capital_gains_tax_0 = calculate_capital_gains_tax_ontario(
-            home_value_0, purchase_price, sales_fees_0, marginal_tax_rate
+        result = solve_input(
+            params, field, metric, month, options['target'],
+            lower=None if options['lower'] is None else options['lower'] / scale,
+            upper=None if options['upper'] is None else options['upper'] / scale,
+            tolerance=options['tolerance'] / scale,
+            max_iterations=max_iterations
         )
-        sale_income_0 = calculate_sale_income(home_value_0, sales_fees_0, capital_gains_tax_0)
-        sale_net_0 = calculate_sale_net(sale_income_0, loan_principal)
-        # Use new calculation methods for month 0 (cumulative_net_profit is 0)
-        cumulative_investment_0 = calculate_cumulative_investment_new(total_initial_investment, 0.0)
-        net_return_0 = calculate_net_return_new(sale_net_0, total_initial_investment, 0.0)
-        return_percent_0 = calculate_return_percent(net_return_0, cumulative_investment_0)
-        return_comparison_0 = calculate_return_comparison(0.0, net_return_0)  # cumulative_expected_return is 0.0 for month 0
-        
-        result_row = {
-            'month': 0,
-            'year': 0,
-            'principal_remaining': loan_principal,
-            'mortgage_payments': 0.0,
-            'principal_paid': 0.0,
-            'interest_paid': 0.0,
-            'maintenance_fees': 0.0,
-            'property_tax': 0.0,
-            'insurance_paid': 0.0,
-            'utilities': 0.0,
-            'repairs': 0.0,
-            'total_expenses': 0.0,
-            'deductible_expenses': 0.0,
-            'rental_income': 0.0,
-            'taxable_income': 0.0,
-            'taxes_due': 0.0,
-            'rental_gains': 0.0,
-            'cumulative_rental_gains': 0.0,
-            'cumulative_investment': cumulative_investment_0,
-            'expected_return': 0.0,
-            'cumulative_expected_return': 0.0,
-            'home_value': home_value_0,
-            'capital_gains_tax': capital_gains_tax_0,
-            'sales_fees': sales_fees_0,
-            'sale_income': sale_income_0,
-            'sale_net': sale_net_0,
-            'net_return': net_return_0,
-            'return_percent': return_percent_0 * 100,  # Convert to percentage
-            'return_comparison': return_comparison_0
-        }
-        results.append(result_row)
-        
-        for month in range(1, num_months + 1):
-            year = (month - 1) // 12
-            
-            # Calculate mortgage breakdown for this month
-            mortgage_breakdown = calculate_month_breakdown(
-                principal_remaining, interest_rate, monthly_payment, payment_type
-            )
-            
-            principal_paid = mortgage_breakdown['principal_paid']
-            interest_paid = mortgage_breakdown['interest_paid']
-            principal_remaining = mortgage_breakdown['principal_remaining']
-            
-            # Calculate monthly expenses
-            maintenance = calculate_maintenance_monthly(month - 1, maintenance_base, maintenance_increase)
-            property_tax = calculate_property_tax_monthly(month - 1, property_tax_base, property_tax_increase)
-            
-            # Calculate rental income
-            rental_income = calculate_rental_income_monthly(month - 1, rental_income_base, rental_increase)
-            
-            # Calculate totals (all monthly amounts)
-            total_expenses = calculate_total_expenses(
-                monthly_payment, maintenance, property_tax, insurance_monthly, utilities_monthly, repairs_monthly
-            )
-            
-            deductible_expenses = calculate_deductible_expenses(
-                interest_paid, maintenance, property_tax, insurance_monthly, utilities_monthly, repairs_monthly
-            )
-            
-            taxable_income = calculate_taxable_income(rental_income, deductible_expenses)
-            taxes_due = calculate_taxes_due(taxable_income, marginal_tax_rate)
-            net_profit = calculate_net_profit(rental_income, total_expenses, taxes_due)
-            
-            # Track cumulative net profit for new calculation
-            cumulative_net_profit += net_profit
-            
-            # Calculate cumulative values for expected return (using old method)
-            is_first_month = (month == 1)
-            cumulative_investment_old = calculate_cumulative_investment(
-                cumulative_investment_old, net_profit, total_initial_investment, is_first_month
-            )
-            
-            # Expected return is calculated monthly based on (cumulative investment + previous cumulative expected return) × return rate
-            monthly_return_rate = expected_return_rate / 12
-            expected_return = calculate_expected_return(
-                cumulative_investment_old, cumulative_expected_return, monthly_return_rate
-            )
-            
-            # Cumulative expected return is the sum of expected return values up to and including this month
-            cumulative_expected_return = calculate_cumulative_expected_return_monthly(
-                cumulative_expected_return, expected_return
-            )
-            
-            # Calculate sale-related metrics
-            home_value = calculate_home_value(purchase_price, real_estate_market_increase, month)
-            sales_fees = calculate_sales_fees(home_value, commission_percentage)
-            capital_gains_tax = calculate_capital_gains_tax_ontario(
-                home_value, purchase_price, sales_fees, marginal_tax_rate
-            )
-            sale_income = calculate_sale_income(home_value, sales_fees, capital_gains_tax)
-            sale_net = calculate_sale_net(sale_income, principal_remaining)
-            
-            # Use new calculation methods
-            cumulative_investment = calculate_cumulative_investment_new(total_initial_investment, cumulative_net_profit)
-            net_return = calculate_net_return_new(sale_net, total_initial_investment, cumulative_net_profit)
-            return_percent = calculate_return_percent(net_return, cumulative_investment)
-            return_comparison = calculate_return_comparison(cumulative_expected_return, net_return)
-            
-            # Build result row
-            # Note: Values are kept at full Decimal precision (converted to float)
-            # Frontend will format to 2 decimal places for display
-            result_row = {
-                'month': month,
-                'year': year + 1,
-                'principal_remaining': principal_remaining,
-                'mortgage_payments': monthly_payment,
-                'principal_paid': principal_paid,
-                'interest_paid': interest_paid,
-                'maintenance_fees': maintenance,
-                'property_tax': property_tax,
-                'insurance_paid': insurance_monthly,
-                'utilities': utilities_monthly,
-                'repairs': repairs_monthly,
-                'total_expenses': total_expenses,
-                'deductible_expenses': deductible_expenses,
-                'rental_income': rental_income,
-                'taxable_income': taxable_income,
-            'taxes_due': taxes_due,
-            'rental_gains': net_profit,
-            'cumulative_rental_gains': cumulative_net_profit,
-            'cumulative_investment': cumulative_investment,
-                'expected_return': expected_return,
-                'cumulative_expected_return': cumulative_expected_return,
-                'home_value': home_value,
-                'capital_gains_tax': capital_gains_tax,
-                'sales_fees': sales_fees,
-                'sale_income': sale_income,
-                'sale_net': sale_net,
-                'net_return': net_return,
-                'return_percent': return_percent * 100,  # Convert to percentage
-                'return_comparison': return_comparison
+        
+        return jsonify({
+            'field': field,
+            'metric': metric,
+            'month': month,
+            'target': options['target'],
+            'value': result['value'] * scale,
+            'metric_value': result['metric_value'],
+            'iterations': result['iterations'],
+            'evaluations': result['evaluations'],
+            'converged': result['converged']
+        })
+    
+    except UndefinedMetricError as e:
+        return jsonify({'error': str(e)}), 422
+    except Exception as e:
+        return _calculation_error_response(e)
+
+
+def _bumped_inputs(base: dict, params: dict, field: str, bump: float, bounds, errors: list):
+    """
+    Return the (low, high) normalized values of one bumped input.
+    
+    Bumped values are parsed in place of the base value like any request
+    value; a side whose value is not a valid input stays at the base value.
+    """
+    scale = 100.0 if field in PERCENT_FIELDS else 1.0
+    center = params[field] * scale
+    if bounds is None:
+        bounds = (center * (1 - bump), center * (1 + bump))
+        if field in INTEGER_FIELDS:
+            bounds = (min(round(bounds[0]), center - 1), max(round(bounds[1]), center + 1))
+    elif not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+        errors.append(f'Range for {field} must be a list of [low, high]')
+        return None
+    values = []
+    for value in bounds:
+        side_params, _, _, side_errors = _parse_scenario(dict(base, **{field: value}))
+        values.append(params[field] if side_errors else side_params[field])
+    return tuple(values)
+
+
+@api_bp.route('/sensitivity', methods=['POST'])
+def sensitivity_investment():
+    """
+    Tornado analysis: how much metrics move when each input is bumped down and up.
+    
+    Expected request body:
+    {
+        "base": scenario parameters (same fields as /calculate),
+        "fields": list of input names (optional, defaults to every numeric input),
+        "bump": float (optional, relative bump as percentage; defaults to 10,
+                i.e. every input at 90% and 110% of its base value),
+        "ranges": {<input field>: [low, high]} (optional, explicit low and
+                  high values replacing the bump for some inputs),
+        "metrics": list of column names from /calculate (optional, defaults
+                   to ["net_return"]),
+        "year": int (optional, year at which metrics are read, at most
+                "num_years" from base; defaults to "num_years")
+    }
+    
+    Inputs and ranges use the same units as /calculate (percentages as
+    percentages). A bumped value that is not a valid input (e.g. a
+    downpayment above 100%) stays at the base value. The base case and every
+    bumped case are projected together as one batch. Sensitivity analysis
+    always uses fast precision.
+    
+    Returns:
+    {
+        "year": int,
+        "metrics": {
+            <metric>: {
+                "base": float,
+                "sensitivities": [{"field", "low_input", "high_input", "low",
+                                   "high", "swing", "share", "derivative",
+                                   "elasticity"}, ...] sorted by descending swing
             }
-            
-            results.append(result_row)
+        }
+    }
+    where low and high are the metric with the input at low_input and
+    high_input, swing is |high - low|, share is the swing over the sum of
+    all swings, derivative is the change in the metric per unit of the input
+    (per percentage point for percentages) and elasticity is the relative
+    change in the metric per relative change in the input.
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('base'), dict):
+            return jsonify({'error': 'Please provide "base" scenario parameters.'}), 400
+        
+        base = dict(data['base'], precision=PRECISION_FAST)
+        params, num_years, _, errors = _parse_scenario(base)
+        fields = data.get('fields') or list(SENSITIVITY_FIELDS)
+        metrics = data.get('metrics') or ['net_return']
+        ranges = data.get('ranges') or {}
+        if not isinstance(fields, list):
+            errors.append('Fields must be a list of input names')
+            fields = []
+        if not isinstance(metrics, list):
+            errors.append('Metrics must be a list of column names')
+            metrics = []
+        if not isinstance(ranges, dict):
+            errors.append('Ranges must be an object mapping input fields to [low, high]')
+            ranges = {}
+        errors.extend(f'{field} cannot be bumped' for field in fields if field not in SENSITIVITY_FIELDS)
+        errors.extend(f'Unknown metric: {metric}' for metric in metrics if metric not in SENSITIVITY_METRICS)
+        errors.extend(f'Range given for {field}, which is not in fields' for field in ranges if field not in fields)
+        
+        try:
+            bump = finite_float(data.get('bump', DEFAULT_BUMP * 100)) / 100
+            if not 0 < bump < 1:
+                errors.append('Bump must be greater than 0 and less than 100')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Bump must be a valid number')
+        
+        try:
+            year = int(data.get('year', num_years or 0))
+            if num_years is not None and not 0 < year <= num_years:
+                errors.append(f'Year must be between 1 and {num_years}')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Year must be a valid integer')
+        
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        bumps = {}
+        for field in dict.fromkeys(fields):
+            bumped = _bumped_inputs(base, params, field, bump, ranges.get(field), errors)
+            if bumped is not None:
+                bumps[field] = bumped
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
         
-        return jsonify({'results': results})
+        base_values, low, high = calculate_case_metrics(params, bumps, year, metrics)
+        
+        response_metrics = {}
+        for metric in metrics:
+            sensitivities = rank_sensitivities(base_values[metric], bumps, low[metric], high[metric])
+            for entry in sensitivities:
+                if entry['field'] in PERCENT_FIELDS:
+                    entry['low_input'] *= 100
+                    entry['high_input'] *= 100
+                    if entry['derivative'] is not None:
+                        entry['derivative'] /= 100
+            response_metrics[metric] = {'base': base_values[metric], 'sensitivities': sensitivities}
+        
+        return jsonify({
+            'year': year,
+            'metrics': response_metrics
+        })
     
-    except ValueError as e:
-        error_msg = str(e)
-        if 'could not convert' in error_msg.lower() or 'invalid literal' in error_msg.lower():
-            return jsonify({'error': 'Invalid input values. Please ensure all fields contain valid numbers only (no letters or special characters).', 'details': error_msg}), 400
-        return jsonify({'error': f'Invalid value: {error_msg}'}), 400
-    except ZeroDivisionError:
-        return jsonify({'error': 'Cannot divide by zero. Please check that loan years and other rate fields are not zero.'}), 400
     except Exception as e:
-        error_msg = str(e)
-        return jsonify({'error': f'Calculation error: {error_msg}'}), 500
+        return _calculation_error_response(e)
+
 
+MAX_PORTFOLIO_PROPERTIES = 10000
+# Upper bound on properties * portfolio months, the work a portfolio request projects
+# (the property limit at a 30-year horizon)
+MAX_PORTFOLIO_PROPERTY_MONTHS = MAX_PORTFOLIO_PROPERTIES * (30 * 12 + 1)
+
+
+@api_bp.route('/portfolio', methods=['POST'])
+def portfolio_investment():
+    """
+    Combine several properties bought at different months into one portfolio.
+    
+    Expected request body:
+    {
+        "properties": list of property parameter sets, each with the same
+                      fields as /calculate plus "purchase_month": int
+                      (optional, month of the portfolio timeline the property
+                      is bought in; defaults to 0),
+        "num_years": int (optional, portfolio horizon of at most
+                     MAX_NUM_YEARS; defaults to the shortest horizon covering
+                     every property's purchase month plus its own
+                     "num_years"),
+        "format": str (optional, "rows" or "columns"; defaults to "rows")
+    }
+    
+    Every property is projected up to the end of the portfolio horizon and
+    contributes nothing before its purchase month. Portfolios always use
+    fast precision. The number of properties times the portfolio months is
+    limited to MAX_PORTFOLIO_PROPERTY_MONTHS.
+    
+    Returns:
+    {
+        "num_years": int,
+        "results": list of row dictionaries, one per portfolio month, with
+                   month, properties_held, principal_remaining, home_value,
+                   equity, cash_flow, cumulative_cash_flow, net_return,
+                   capital_gain, taxable_capital_gain and first_tier_room
+                   (or "columns": {...} for the columns format)
+    }
+    cash_flow is the total rental gains less each property's initial
+    investment in its purchase month. The capital gains inclusion tiers are
+    applied to the combined capital_gain, and first_tier_room is what is
+    left of the $250k first tier.
+    """
+    try:
+        data = request.get_json()
+        properties = data.get('properties') if isinstance(data, dict) else None
+        if not properties or not isinstance(properties, list):
+            return jsonify({'error': 'No properties provided. Send a non-empty "properties" list.'}), 400
+        
+        errors = []
+        try:
+            response_format = normalize_format(data.get('format'))
+            if response_format in BINARY_FORMATS:
+                errors.append('Portfolio results support the rows and columns formats only')
+        except ValueError as e:
+            errors.append(str(e))
+        if len(properties) > MAX_PORTFOLIO_PROPERTIES:
+            errors.append(f'Portfolio has {len(properties)} properties; the maximum is {MAX_PORTFOLIO_PROPERTIES}')
+            properties = []
+        
+        params_list = []
+        offsets = []
+        horizon = 0
+        for index, prop in enumerate(properties):
+            if not isinstance(prop, dict):
+                errors.append(f'Property {index}: must be an object of scenario parameters')
+                continue
+            params, num_years, _, property_errors = _parse_scenario(dict(prop, precision=PRECISION_FAST))
+            try:
+                offset = int(prop.get('purchase_month', 0))
+                if offset < 0:
+                    property_errors.append('Purchase month cannot be negative')
+            except (ValueError, TypeError, ArithmeticError):
+                property_errors.append('Purchase month must be a valid integer')
+            if property_errors:
+                errors.extend(f'Property {index}: {error}' for error in property_errors)
+                continue
+            params_list.append(params)
+            offsets.append(offset)
+            horizon = max(horizon, -(-(offset + num_years * 12) // 12))
+        
+        try:
+            num_years = int(data.get('num_years', horizon))
+            property_months = len(params_list) * (num_years * 12 + 1)
+            if params_list and not 0 < num_years <= MAX_NUM_YEARS:
+                errors.append(f'Number of Years must be between 1 and {MAX_NUM_YEARS}')
+            elif offsets and max(offsets) > num_years * 12:
+                errors.append('Every purchase month must be within the portfolio horizon')
+            elif property_months > MAX_PORTFOLIO_PROPERTY_MONTHS:
+                errors.append(f'Portfolio projects {len(params_list)} properties over {num_years * 12} months; '
+                              f'the maximum is {MAX_PORTFOLIO_PROPERTY_MONTHS} property-months')
+        except (ValueError, TypeError, ArithmeticError):
+            errors.append('Number of Years must be a valid integer')
+        
+        if errors:
+            return jsonify({'error': 'Validation errors', 'errors': errors}), 400
+        
+        columns = calculate_portfolio(params_list, offsets, num_years,
+                                      workers=current_app.config.get('PORTFOLIO_WORKERS'))
+        
+        if response_format == FORMAT_COLUMNS:
+            body = {'columns': projection_to_columns(columns, PORTFOLIO_COLUMNS)}
+        else:
+            body = {'results': projection_to_rows(columns, PORTFOLIO_COLUMNS)}
+        return jsonify(dict(body, num_years=num_years))
+    
+    except Exception as e:
+        return _calculation_error_response(e)
@@ -5,7 +5,10 @@ Flask application for real estate investment calculator.
 from flask import Flask, request, url_for, jsonify, send_from_directory, redirect
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
+from app.backend.api.compression import register_compression
+from app.backend.api.metrics import register_metrics
 from app.backend.api.routes import api_bp
+from app.backend.calculations.cache import ProjectionCache
 
 
 def create_app():
@@ -29,6 +32,40 @@ def create_app():
     # Cookie isolation: multiple apps share the same domain, so cookie names must be unique per app.
     app.config['SESSION_COOKIE_NAME'] = os.environ.get('SESSION_COOKIE_NAME', 'calculator_session')
     app.config['SESSION_COOKIE_PATH'] = os.environ.get('APPLICATION_ROOT', '') or '/'
+
+    # Default numeric precision for calculations ('fast' float64 or 'exact' Decimal);
+    # requests can override it with their own "precision" option.
+    app.config['CALCULATION_PRECISION'] = os.environ.get('CALCULATION_PRECISION', 'fast')
+    # Worker processes for Monte Carlo simulations (unset = one per CPU, 1 = run in-process)
+    app.config['SIMULATION_WORKERS'] = int(os.environ.get('SIMULATION_WORKERS', 0)) or None
+    # Worker processes for portfolio projections (same convention as SIMULATION_WORKERS)
+    app.config['PORTFOLIO_WORKERS'] = int(os.environ.get('PORTFOLIO_WORKERS', 0)) or None
+    # Projection result cache: LRU bounded by entries and memory, optional TTL in seconds
+    app.config['PROJECTION_CACHE_SIZE'] = int(os.environ.get('PROJECTION_CACHE_SIZE', 256))
+    app.config['PROJECTION_CACHE_MAX_BYTES'] = int(os.environ.get('PROJECTION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    app.config['PROJECTION_CACHE_TTL'] = float(os.environ.get('PROJECTION_CACHE_TTL', 0)) or None
+    app.extensions['projection_cache'] = ProjectionCache(
+        app.config['PROJECTION_CACHE_SIZE'],
+        app.config['PROJECTION_CACHE_MAX_BYTES'],
+        app.config['PROJECTION_CACHE_TTL']
+    )
+    # Scenario store for handle-based reads: same LRU limits, entries expire after the TTL
+    app.config['SCENARIO_STORE_SIZE'] = int(os.environ.get('SCENARIO_STORE_SIZE', 1024))
+    app.config['SCENARIO_STORE_MAX_BYTES'] = int(os.environ.get('SCENARIO_STORE_MAX_BYTES', 128 * 1024 * 1024))
+    app.config['SCENARIO_STORE_TTL'] = float(os.environ.get('SCENARIO_STORE_TTL', 3600))
+    app.extensions['scenario_store'] = ProjectionCache(
+        app.config['SCENARIO_STORE_SIZE'],
+        app.config['SCENARIO_STORE_MAX_BYTES'],
+        app.config['SCENARIO_STORE_TTL']
+    )
+    # Response compression (gzip, or br when the brotli package is installed) for bodies of at least
+    # COMPRESSION_MIN_SIZE bytes; lower levels trade some size for less CPU per response
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    app.config['GZIP_LEVEL'] = int(os.environ.get('GZIP_LEVEL', 1))
+    app.config['BROTLI_QUALITY'] = int(os.environ.get('BROTLI_QUALITY', 4))
+    # Request instrumentation: Server-Timing headers on every response, and Prometheus metrics at
+    # /metrics only when METRICS_TOKEN is set, for requests with an "Authorization: Bearer <token>" header.
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN') or None
     
     # CRITICAL: Configure ProxyFix BEFORE CORS and routes
     # This allows the app to work properly when proxied by AppManager
@@ -45,6 +82,9 @@ def create_app():
     
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
+    register_metrics(app)
+    # Registered after metrics so compression runs first and metrics see the compressed size
+    register_compression(app)
 
     @app.route('/favicon.png')
     def favicon_png():
@@ -0,0 +1,157 @@
+"""
+Projection result cache.
+Memoizes projection columns under a canonical hash of the normalized inputs,
+with LRU eviction bounded by entry count and approximate memory, plus an
+optional time-to-live. Safe to share between request threads.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Approximate size of one Python object held in a list (exact precision columns)
+LIST_ITEM_BYTES = 112
+
+
+def canonical_hash(params: dict, num_years: int, precision: str) -> str:
+    """
+    Hash normalized scenario inputs into a stable cache key.
+
+    Inputs that parse to the same values (e.g. 20 and "20.0" in fast
+    precision) produce the same key. Floats are keyed by their exact value
+    and Decimals by their string form.
+
+    Args:
+        params: Normalized scenario inputs (as returned by request parsing)
+        num_years: Projection horizon in years
+        precision: One of PRECISION_MODES
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = {
+        'params': {
+            name: value.hex() if isinstance(value, float) else str(value)
+            for name, value in params.items()
+        },
+        'num_years': int(num_years),
+        'precision': precision,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def estimate_size(columns: dict) -> int:
+    """Approximate memory held by projection columns, in bytes."""
+    return sum(
+        column.nbytes if isinstance(column, np.ndarray) else len(column) * LIST_ITEM_BYTES
+        for column in columns.values()
+    )
+
+
+class ProjectionCache:
+    """
+    Thread-safe LRU cache of projection columns.
+
+    Cached arrays are made read-only, since the same columns are handed to
+    every request that hits the entry.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, ttl: float = None):
+        """
+        Args:
+            max_entries: Largest number of cached projections (0 disables the cache)
+            max_bytes: Largest approximate memory held by cached columns
+            ttl: Seconds an entry stays valid, or None for no expiry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str):
+        """Return cached columns for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, columns: dict):
+        """Store columns under a key, evicting least recently used entries as needed."""
+        size = estimate_size(columns)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        columns = dict(columns)
+        for name, column in columns.items():
+            if isinstance(column, np.ndarray):
+                # Copy views (e.g. one scenario of a batch) so they do not pin the whole batch
+                if column.base is not None:
+                    column = columns[name] = column.copy()
+                column.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (columns, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key: str) -> bool:
+        """Remove an entry if present; return whether it was."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        """Remove every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries, size_bytes,
+            evictions, expirations and the configured limits
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+            }
+
+    def _remove(self, key: str):
+        columns, size, _ = self._entries.pop(key)
+        self._bytes -= size
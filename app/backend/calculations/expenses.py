@@ -1,14 +1,10 @@
 """
 Expense calculation utilities.
 Handles maintenance, property tax, insurance, utilities, and repairs.
-"""
-
-from decimal import Decimal, getcontext
 
-# Set precision to 28 total digits, 14 decimal places
-getcontext().prec = 28
-getcontext().Emin = -999999
-getcontext().Emax = 999999
+Functions compute in the numeric type they are given: float arguments give
+float results and Decimal arguments give Decimal results.
+"""
 
 
 def calculate_maintenance(year: int, base_maintenance: float, yearly_increase: float) -> float:
@@ -23,12 +19,9 @@ def calculate_maintenance(year: int, base_maintenance: float, yearly_increase: f
     Returns:
         Maintenance amount for the year
     """
-    base = Decimal(str(base_maintenance))
-    increase = Decimal(str(yearly_increase))
     if year == 0:
-        return float(base)
-    factor = (Decimal('1') + increase) ** year
-    return float(base * factor)
+        return base_maintenance
+    return base_maintenance * (1 + yearly_increase) ** year
 
 
 def calculate_property_tax(year: int, base_tax: float, yearly_increase: float) -> float:
@@ -43,12 +36,9 @@ def calculate_property_tax(year: int, base_tax: float, yearly_increase: float) -
     Returns:
         Property tax amount for the year
     """
-    base = Decimal(str(base_tax))
-    increase = Decimal(str(yearly_increase))
     if year == 0:
-        return float(base)
-    factor = (Decimal('1') + increase) ** year
-    return float(base * factor)
+        return base_tax
+    return base_tax * (1 + yearly_increase) ** year
 
 
 def calculate_rental_income(year: int, base_rental: float, yearly_increase: float) -> float:
@@ -63,14 +53,11 @@ def calculate_rental_income(year: int, base_rental: float, yearly_increase: floa
     Returns:
         Annual rental income for the year
     """
-    base = Decimal(str(base_rental))
-    increase = Decimal(str(yearly_increase))
     if year == 0:
-        monthly_rent = base
+        monthly_rent = base_rental
     else:
-        factor = (Decimal('1') + increase) ** year
-        monthly_rent = base * factor
-    return float(monthly_rent * Decimal('12'))
+        monthly_rent = base_rental * (1 + yearly_increase) ** year
+    return monthly_rent * 12
 
 
 def calculate_maintenance_monthly(month: int, base_maintenance: float, yearly_increase: float) -> float:
@@ -90,15 +77,12 @@ def calculate_maintenance_monthly(month: int, base_maintenance: float, yearly_in
     # Year 2 (months 12-23): first increase
     # Year 3 (months 24-35): second increase, etc.
     year = month // 12
-    base = Decimal(str(base_maintenance))
-    increase = Decimal(str(yearly_increase))
     # Apply increases only starting from year 2 (year index 1)
     # Year 0 = first year (no increase), Year 1+ = apply (year) increases
     if year == 0:
-        return float(base)
+        return base_maintenance
     else:
-        factor = (Decimal('1') + increase) ** year
-        return float(base * factor)
+        return base_maintenance * (1 + yearly_increase) ** year
 
 
 def calculate_property_tax_monthly(month: int, base_tax: float, yearly_increase: float) -> float:
@@ -118,14 +102,11 @@ def calculate_property_tax_monthly(month: int, base_tax: float, yearly_increase:
     # Year 2 (months 12-23): first increase
     # Year 3 (months 24-35): second increase, etc.
     year = month // 12
-    base = Decimal(str(base_tax))
-    increase = Decimal(str(yearly_increase))
     if year == 0:
-        annual_tax = base
+        annual_tax = base_tax
     else:
-        factor = (Decimal('1') + increase) ** year
-        annual_tax = base * factor
-    return float(annual_tax / Decimal('12'))
+        annual_tax = base_tax * (1 + yearly_increase) ** year
+    return annual_tax / 12
 
 
 def calculate_rental_income_monthly(month: int, base_rental: float, yearly_increase: float) -> float:
@@ -145,10 +126,7 @@ def calculate_rental_income_monthly(month: int, base_rental: float, yearly_incre
     # Year 2 (months 12-23): first increase
     # Year 3 (months 24-35): second increase, etc.
     year = month // 12
-    base = Decimal(str(base_rental))
-    increase = Decimal(str(yearly_increase))
     if year == 0:
-        return float(base)
+        return base_rental
     else:
-        factor = (Decimal('1') + increase) ** year
-        return float(base * factor)
\ No newline at end of file
+        return base_rental * (1 + yearly_increase) ** year
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Indexation curves.
+Builds the yearly growth factors of an indexed amount (maintenance, property
+tax, rent) once per scenario, so any month's value is one lookup instead of
+a fresh power.
+
+An indexation schedule starts from the scenario's yearly increase and can
+change it with:
+- steps: from a given year onward the increase becomes a new value
+  (e.g. rent control lowering increases to 2% from year 5)
+- overrides: the increase for one specific year only (e.g. a rent freeze
+  in year 3 is an override of 0, a property tax reassessment is a one-off
+  larger increase)
+
+Years are numbered from 1 as displayed. Increases apply at the start of a
+year, so the first year can not be changed. Floats are computed with NumPy
+arrays (scalar or per-scenario increases); Decimals stay Decimal in lists.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+
+# Indexed series and the scenario input holding each one's yearly increase
+INDEXED_SERIES = {
+    'maintenance': 'maintenance_increase',
+    'property_tax': 'property_tax_increase',
+    'rental_income': 'rental_increase',
+}
+
+
+def calculate_yearly_increases(yearly_increase, num_years: int, steps=(), overrides=(), increase_path=None):
+    """
+    Build the increase applied at the start of each year.
+
+    Args:
+        yearly_increase: Default yearly increase (float, per-scenario array or Decimal)
+        num_years: Number of years covered
+        steps: Pairs of (first year, increase) changing the increase from that year on
+        overrides: Pairs of (year, increase) replacing the increase for that year only
+        increase_path: Optional per-year increases (year axis last) replacing the
+            default increase and steps; overrides still apply
+
+    Returns:
+        Increases indexed by 0-based year (index 0, the first year, is always 0):
+        a list for Decimal inputs, otherwise an array with the year axis last
+    """
+    if isinstance(yearly_increase, Decimal):
+        zero = Decimal(0)
+        increases = [zero] + [yearly_increase] * max(num_years - 1, 0)
+        for year, increase in sorted(steps):
+            for index in range(max(year - 1, 1), num_years):
+                increases[index] = increase
+        for year, increase in overrides:
+            if 1 < year <= num_years:
+                increases[year - 1] = increase
+        return increases
+
+    if increase_path is not None:
+        increases = np.array(np.asarray(increase_path, dtype=np.float64)[..., :num_years])
+    else:
+        yearly_increase = np.asarray(yearly_increase, dtype=np.float64)
+        increases = np.empty(yearly_increase.shape + (num_years,))
+        increases[...] = yearly_increase[..., None]
+        for year, increase in sorted(steps):
+            increases[..., max(year - 1, 1):] = increase
+    for year, increase in overrides:
+        if 1 < year <= num_years:
+            increases[..., year - 1] = increase
+    if num_years:
+        increases[..., 0] = 0.0
+    return increases
+
+
+def calculate_yearly_factors(increases):
+    """
+    Compound yearly increases into growth factors relative to the first year.
+
+    Args:
+        increases: Output of calculate_yearly_increases
+
+    Returns:
+        Factors indexed by 0-based year, in the same form as the increases
+    """
+    if isinstance(increases, list):
+        factors = []
+        factor = Decimal(1)
+        for index, increase in enumerate(increases):
+            if index:
+                factor = factor * (1 + increase)
+            factors.append(factor)
+        return factors
+    return np.cumprod(1.0 + increases, axis=-1)
+
+
+class IndexationCurve:
+    """
+    Growth factors of an indexed amount over a projection horizon.
+
+    Built once per scenario; factor() and apply() then look values up by
+    month without recomputing any powers.
+    """
+
+    __slots__ = ('factors',)
+
+    def __init__(self, yearly_increase, num_years: int, steps=(), overrides=(), increase_path=None):
+        """
+        Args:
+            See calculate_yearly_increases
+        """
+        self.factors = calculate_yearly_factors(
+            calculate_yearly_increases(yearly_increase, num_years, steps, overrides, increase_path)
+        )
+
+    def factor(self, month: int):
+        """Return the growth factor for a 0-indexed month (month 0-11 is the first year)."""
+        return self.factors[month // 12]
+
+    def apply(self, base, year_index: np.ndarray) -> np.ndarray:
+        """
+        Index a base amount over many months at once (float curves only).
+
+        Args:
+            base: Base amount (scalar or per-scenario column-broadcastable array)
+            year_index: 0-based year of each month
+
+        Returns:
+            Array of indexed amounts with the month axis last
+        """
+        return base * self.factors[..., year_index]
+
+
+def indexation_curve(params: dict, series: str, num_years: int, increase_path=None) -> IndexationCurve:
+    """
+    Build the indexation curve of one series from scenario inputs.
+
+    Args:
+        params: Normalized scenario inputs; the optional 'indexation' entry maps
+            series names to {'steps': ..., 'overrides': ...}, or is a list of
+            such mappings (one per scenario) for stacked batch inputs
+        series: A name in INDEXED_SERIES
+        num_years: Number of years covered
+        increase_path: Optional per-year increases (see calculate_yearly_increases)
+
+    Returns:
+        IndexationCurve for the series
+    """
+    yearly_increase = params[INDEXED_SERIES[series]]
+    indexation = params.get('indexation')
+    if isinstance(indexation, (list, tuple)):
+        # Stacked scenarios with their own schedules: build each row, then stack the factors
+        curve = IndexationCurve.__new__(IndexationCurve)
+        rows = []
+        for index, spec in enumerate(indexation):
+            schedule = (spec or {}).get(series, {})
+            path = None if increase_path is None else np.asarray(increase_path)[index]
+            rows.append(IndexationCurve(
+                np.broadcast_to(yearly_increase, (len(indexation),))[index], num_years,
+                schedule.get('steps', ()), schedule.get('overrides', ()), path
+            ).factors)
+        curve.factors = np.stack(rows)
+        return curve
+    schedule = (indexation or {}).get(series, {})
+    return IndexationCurve(yearly_increase, num_years, schedule.get('steps', ()),
+                           schedule.get('overrides', ()), increase_path)
@@ -1,14 +1,12 @@
 """
 Investment calculation utilities.
 Handles net profit, cumulative investment, and expected return calculations.
-"""
 
-from decimal import Decimal, getcontext
+Functions compute in the numeric type they are given: float arguments give
+float results and Decimal arguments give Decimal results.
+"""
 
-# Set precision to 28 total digits, 14 decimal places
-getcontext().prec = 28
-getcontext().Emin = -999999
-getcontext().Emax = 999999
+from app.backend.calculations.precision import zero_like
 
 
 def calculate_total_expenses(mortgage_payment: float, maintenance: float, 
@@ -28,10 +26,7 @@ def calculate_total_expenses(mortgage_payment: float, maintenance: float,
     Returns:
         Total expenses
     """
-    total = (Decimal(str(mortgage_payment)) + Decimal(str(maintenance)) + 
-             Decimal(str(property_tax)) + Decimal(str(insurance)) + 
-             Decimal(str(utilities)) + Decimal(str(repairs)))
-    return float(total)
+    return mortgage_payment + maintenance + property_tax + insurance + utilities + repairs
 
 
 def calculate_deductible_expenses(interest_paid: float, maintenance: float,
@@ -51,10 +46,7 @@ def calculate_deductible_expenses(interest_paid: float, maintenance: float,
     Returns:
         Total deductible expenses
     """
-    total = (Decimal(str(interest_paid)) + Decimal(str(maintenance)) + 
-             Decimal(str(property_tax)) + Decimal(str(insurance)) + 
-             Decimal(str(utilities)) + Decimal(str(repairs)))
-    return float(total)
+    return interest_paid + maintenance + property_tax + insurance + utilities + repairs
 
 
 def calculate_taxable_income(rental_income: float, deductible_expenses: float) -> float:
@@ -68,7 +60,7 @@ def calculate_taxable_income(rental_income: float, deductible_expenses: float) -
     Returns:
         Taxable income (can be negative)
     """
-    return float(Decimal(str(rental_income)) - Decimal(str(deductible_expenses)))
+    return rental_income - deductible_expenses
 
 
 def calculate_taxes_due(taxable_income: float, marginal_tax_rate: float) -> float:
@@ -82,10 +74,9 @@ def calculate_taxes_due(taxable_income: float, marginal_tax_rate: float) -> floa
     Returns:
         Taxes due (0 if taxable income is negative)
     """
-    ti = Decimal(str(taxable_income))
-    if ti <= 0:
-        return 0.0
-    return float(ti * Decimal(str(marginal_tax_rate)))
+    if taxable_income <= 0:
+        return zero_like(taxable_income)
+    return taxable_income * marginal_tax_rate
 
 
 def calculate_net_profit(rental_income: float, total_expenses: float, taxes_due: float) -> float:
@@ -100,7 +91,7 @@ def calculate_net_profit(rental_income: float, total_expenses: float, taxes_due:
     Returns:
         Net profit
     """
-    return float(Decimal(str(rental_income)) - Decimal(str(total_expenses)) - Decimal(str(taxes_due)))
+    return rental_income - total_expenses - taxes_due
 
 
 def calculate_expected_return(cumulative_investment: float, previous_cumulative_expected_return: float, 
@@ -116,10 +107,7 @@ def calculate_expected_return(cumulative_investment: float, previous_cumulative_
     Returns:
         Expected return = (cumulative investment + previous cumulative expected return) × return rate
     """
-    ci = Decimal(str(cumulative_investment))
-    pcer = Decimal(str(previous_cumulative_expected_return))
-    rate = Decimal(str(expected_return_rate))
-    return float((ci + pcer) * rate)
+    return (cumulative_investment + previous_cumulative_expected_return) * expected_return_rate
 
 
 def calculate_cumulative_investment(previous_cumulative: float, net_profit: float, 
@@ -139,7 +127,7 @@ def calculate_cumulative_investment(previous_cumulative: float, net_profit: floa
     Returns:
         Cumulative investment
     """
-    return float(Decimal(str(previous_cumulative)) - Decimal(str(net_profit)))
+    return previous_cumulative - net_profit
 
 
 def calculate_cumulative_investment_new(downpayment: float, cumulative_net_profit: float) -> float:
@@ -155,15 +143,12 @@ def calculate_cumulative_investment_new(downpayment: float, cumulative_net_profi
     Returns:
         Cumulative investment (downpayment + losses if any)
     """
-    dp = Decimal(str(downpayment))
-    cnp = Decimal(str(cumulative_net_profit))
-    
     # If cumulative net profit is negative, add the absolute value to investment
     # If positive, investment stays at downpayment
-    if cnp < 0:
-        return float(dp - cnp)  # Subtracting negative = adding absolute value
+    if cumulative_net_profit < 0:
+        return downpayment - cumulative_net_profit  # Subtracting negative = adding absolute value
     else:
-        return float(dp)
+        return downpayment
 
 
 def calculate_cumulative_expected_return(previous_cumulative: float, net_profit: float,
@@ -184,20 +169,15 @@ def calculate_cumulative_expected_return(previous_cumulative: float, net_profit:
     Returns:
         Cumulative expected return (compounded value)
     """
-    dp = Decimal(str(downpayment))
-    np = Decimal(str(net_profit))
-    rate = Decimal(str(expected_return_rate))
-    
     if is_first_year:
         # First year: start with downpayment - net profit, then compound
-        initial_investment = dp - np
-        return float(initial_investment * (Decimal('1') + rate))
+        initial_investment = downpayment - net_profit
+        return initial_investment * (1 + expected_return_rate)
     
     # For subsequent years:
     # Take previous year's compounded value, subtract this year's net profit, then compound
-    pc = Decimal(str(previous_cumulative))
-    total_before_compound = pc - np
-    return float(total_before_compound * (Decimal('1') + rate))
+    total_before_compound = previous_cumulative - net_profit
+    return total_before_compound * (1 + expected_return_rate)
 
 
 def calculate_cumulative_expected_return_monthly(previous_cumulative: float, expected_return: float) -> float:
@@ -212,7 +192,5 @@ def calculate_cumulative_expected_return_monthly(previous_cumulative: float, exp
     Returns:
         Cumulative expected return (sum of all expected return values up to this month)
     """
-    pc = Decimal(str(previous_cumulative))
-    er = Decimal(str(expected_return))
-    return float(pc + er)
+    return previous_cumulative + expected_return
 
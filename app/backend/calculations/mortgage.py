@@ -1,14 +1,15 @@
 """
 Mortgage calculation utilities.
 Handles mortgage payment calculations, principal, and interest computations.
+
+Scalar functions compute in the numeric type they are given: float arguments
+give float results and Decimal arguments give Decimal results. The schedule
+functions work on float64 NumPy arrays.
 """
 
-from decimal import Decimal, getcontext
+import numpy as np
 
-# Set precision to 28 total digits, 14 decimal places
-getcontext().prec = 28
-getcontext().Emin = -999999
-getcontext().Emax = 999999
+from app.backend.calculations.precision import zero_like
 
 
 def calculate_monthly_payment(principal: float, annual_rate: float, years: int, payment_type: str = 'principal_and_interest') -> float:
@@ -24,40 +25,33 @@ def calculate_monthly_payment(principal: float, annual_rate: float, years: int,
     Returns:
         Monthly payment amount
     """
-    p = Decimal(str(principal))
-    r = Decimal(str(annual_rate))
-    y = Decimal(str(years))
-    
-    if p <= 0 or y <= 0:
-        return 0.0
+    if principal <= 0 or years <= 0:
+        return zero_like(principal)
     
     # For interest-only payments, payment is just the monthly interest
     if payment_type == 'interest_only':
-        if r == 0:
-            return 0.0
-        monthly_rate = r / Decimal('12')
-        return float(p * monthly_rate)
+        if annual_rate == 0:
+            return zero_like(principal)
+        monthly_rate = annual_rate / 12
+        return principal * monthly_rate
     
     # Standard amortization formula for principal and interest
-    if r == 0:
-        return float(p / (y * Decimal('12')))
+    if annual_rate == 0:
+        return principal / (years * 12)
     
-    monthly_rate = r / Decimal('12')
-    num_payments = y * Decimal('12')
+    monthly_rate = annual_rate / 12
+    num_payments = years * 12
     
-    one_plus_rate = Decimal('1') + monthly_rate
-    numerator = p * monthly_rate * (one_plus_rate ** num_payments)
-    denominator = (one_plus_rate ** num_payments) - Decimal('1')
+    one_plus_rate = 1 + monthly_rate
+    numerator = principal * monthly_rate * (one_plus_rate ** num_payments)
+    denominator = (one_plus_rate ** num_payments) - 1
     
-    payment = numerator / denominator
-    
-    return float(payment)
+    return numerator / denominator
 
 
 def calculate_annual_payment(principal: float, annual_rate: float, years: int, payment_type: str = 'principal_and_interest') -> float:
     """Calculate annual mortgage payment."""
-    monthly = Decimal(str(calculate_monthly_payment(principal, annual_rate, years, payment_type)))
-    return float(monthly * Decimal('12'))
+    return calculate_monthly_payment(principal, annual_rate, years, payment_type) * 12
 
 
 def calculate_year_breakdown(principal_remaining: float, annual_rate: float, 
@@ -76,21 +70,18 @@ def calculate_year_breakdown(principal_remaining: float, annual_rate: float,
     Returns:
         Dictionary with 'principal_paid', 'interest_paid', 'principal_remaining'
     """
-    p = Decimal(str(principal_remaining))
-    r = Decimal(str(annual_rate))
-    mp = Decimal(str(monthly_payment))
-    
-    if p <= 0:
+    zero = zero_like(principal_remaining)
+    if principal_remaining <= 0:
         return {
-            'principal_paid': 0.0,
-            'interest_paid': 0.0,
-            'principal_remaining': 0.0
+            'principal_paid': zero,
+            'interest_paid': zero,
+            'principal_remaining': zero
         }
     
-    monthly_rate = r / Decimal('12')
-    principal_paid = Decimal('0')
-    interest_paid = Decimal('0')
-    current_principal = p
+    monthly_rate = annual_rate / 12
+    principal_paid = zero
+    interest_paid = zero
+    current_principal = principal_remaining
     
     # Calculate for 12 months
     for month in range(12):
@@ -101,19 +92,19 @@ def calculate_year_breakdown(principal_remaining: float, annual_rate: float,
         
         if payment_type == 'interest_only':
             # For interest-only, payment is only interest, no principal reduction
-            principal_for_month = Decimal('0')
+            principal_for_month = zero
         else:
             # Standard amortization: principal = payment - interest
-            principal_for_month = min(mp - interest_for_month, current_principal)
+            principal_for_month = min(monthly_payment - interest_for_month, current_principal)
         
         principal_paid += principal_for_month
         interest_paid += interest_for_month
         current_principal -= principal_for_month
     
     return {
-        'principal_paid': float(principal_paid),
-        'interest_paid': float(interest_paid),
-        'principal_remaining': float(max(Decimal('0'), current_principal))
+        'principal_paid': principal_paid,
+        'interest_paid': interest_paid,
+        'principal_remaining': max(zero, current_principal)
     }
 
 
@@ -131,31 +122,199 @@ def calculate_month_breakdown(principal_remaining: float, annual_rate: float,
     Returns:
         Dictionary with 'principal_paid', 'interest_paid', 'principal_remaining'
     """
-    p = Decimal(str(principal_remaining))
-    r = Decimal(str(annual_rate))
-    mp = Decimal(str(monthly_payment))
-    
-    if p <= 0:
+    zero = zero_like(principal_remaining)
+    if principal_remaining <= 0:
         return {
-            'principal_paid': 0.0,
-            'interest_paid': 0.0,
-            'principal_remaining': 0.0
+            'principal_paid': zero,
+            'interest_paid': zero,
+            'principal_remaining': zero
         }
     
-    monthly_rate = r / Decimal('12')
-    interest_for_month = p * monthly_rate
+    monthly_rate = annual_rate / 12
+    interest_for_month = principal_remaining * monthly_rate
     
     if payment_type == 'interest_only':
         # For interest-only, payment is only interest, no principal reduction
-        principal_for_month = Decimal('0')
+        principal_for_month = zero
     else:
         # Standard amortization: principal = payment - interest
-        principal_for_month = min(mp - interest_for_month, p)
+        principal_for_month = min(monthly_payment - interest_for_month, principal_remaining)
+    
+    new_principal = max(zero, principal_remaining - principal_for_month)
+    
+    return {
+        'principal_paid': principal_for_month,
+        'interest_paid': interest_for_month,
+        'principal_remaining': new_principal
+    }
+
+
+def _scheduled_balance(principal, monthly_rate, monthly_payment, months, interest_only):
+    """
+    Closed-form balance after the given number of payments.
+    All arguments broadcast against each other.
+    """
+    has_rate = monthly_rate != 0
+    safe_rate = np.where(has_rate, monthly_rate, 1.0)
+    log_growth = np.log1p(monthly_rate)
+    growth = np.exp(months * log_growth)
+    # Future value of one unit paid each month: sum of (1 + i)^j for j < k
+    annuity = np.where(has_rate, np.expm1(months * log_growth) / safe_rate, months)
+    amortizing = np.maximum(principal * growth - monthly_payment * annuity, 0.0)
+    balance = np.where(interest_only, principal, amortizing)
+    return np.where(principal > 0, balance, 0.0)
+
+
+def calculate_monthly_payments(principal, annual_rate, years, payment_type='principal_and_interest') -> np.ndarray:
+    """
+    Vectorized calculate_monthly_payment for scalars or arrays of loans.
+    
+    Args:
+        principal: Loan principal amount(s)
+        annual_rate: Annual interest rate(s) (as decimal)
+        years: Loan term(s) in years
+        payment_type: 'principal_and_interest' or 'interest_only' (scalar or array)
+    
+    Returns:
+        Array of monthly payment amounts
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64) / 12
+    num_payments = np.asarray(years, dtype=np.float64) * 12
+    interest_only = np.asarray(payment_type) == 'interest_only'
+    
+    has_rate = monthly_rate != 0
+    has_term = num_payments > 0
+    safe_rate = np.where(has_rate, monthly_rate, 1.0)
+    growth = np.exp(num_payments * np.log1p(monthly_rate))
+    amortizing = np.where(
+        has_rate,
+        principal * safe_rate * growth / np.where(has_rate & has_term, growth - 1.0, 1.0),
+        principal / np.where(has_term, num_payments, 1.0)
+    )
+    payment = np.where(interest_only, principal * monthly_rate, amortizing)
+    return np.where((principal > 0) & has_term, payment, 0.0)
+
+
+def calculate_amortization_schedule(principal, annual_rate, years, num_months: int,
+                                    payment_type='principal_and_interest') -> dict:
+    """
+    Calculate the full amortization schedule of a loan in one call.
+    
+    Replaces stepping calculate_month_breakdown once per month. Inputs may be
+    scalars or 1-D arrays (one loan per element); the month axis is always last.
+    Once the loan is paid off the balance stays at 0 and no further principal
+    or interest is paid.
+    
+    Args:
+        principal: Loan principal amount(s)
+        annual_rate: Annual interest rate(s) (as decimal)
+        years: Loan term(s) in years
+        num_months: Number of months to schedule
+        payment_type: 'principal_and_interest' or 'interest_only' (scalar or array)
+    
+    Returns:
+        Dictionary with 'monthly_payment' (one per loan) and 'principal_remaining',
+        'principal_paid', 'interest_paid' arrays indexed by month 0..num_months
+        (month 0 is the initial state, so its principal and interest are 0)
+    """
+    monthly_payment = calculate_monthly_payments(principal, annual_rate, years, payment_type)
+    principal = np.asarray(principal, dtype=np.float64)[..., None]
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64)[..., None] / 12
+    interest_only = np.asarray(payment_type)[..., None] == 'interest_only'
+    months = np.arange(num_months + 1, dtype=np.float64)
     
-    new_principal = max(Decimal('0'), p - principal_for_month)
+    balance = _scheduled_balance(principal, monthly_rate, monthly_payment[..., None], months, interest_only)
+    principal_paid = np.zeros_like(balance)
+    interest_paid = np.zeros_like(balance)
+    principal_paid[..., 1:] = balance[..., :-1] - balance[..., 1:]
+    interest_paid[..., 1:] = balance[..., :-1] * monthly_rate
     
     return {
-        'principal_paid': float(principal_for_month),
-        'interest_paid': float(interest_for_month),
-        'principal_remaining': float(new_principal)
+        'monthly_payment': monthly_payment,
+        'principal_remaining': balance,
+        'principal_paid': principal_paid,
+        'interest_paid': interest_paid
     }
+
+
+def calculate_variable_rate_schedule(principal, annual_rates, years,
+                                     payment_type='principal_and_interest') -> dict:
+    """
+    Calculate the amortization schedule of a loan whose rate changes every month.
+    
+    Each month the payment is recomputed so the remaining balance is repaid over
+    the remaining term at that month's rate (interest-only loans pay that month's
+    interest). Like the fixed-rate schedule, the last payment keeps being charged
+    after the term ends. Steps through the months once, vectorized over loans.
+    
+    Args:
+        principal: Loan principal amount(s)
+        annual_rates: Annual interest rate in effect during each month 1..N
+            (as decimal), with the month axis last
+        years: Loan term(s) in years
+        payment_type: 'principal_and_interest' or 'interest_only' (scalar or array)
+    
+    Returns:
+        Dictionary with 'monthly_payment', 'principal_remaining',
+        'principal_paid' and 'interest_paid' arrays indexed by month 0..N
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    monthly_rates = np.asarray(annual_rates, dtype=np.float64) / 12
+    term_months = np.asarray(years, dtype=np.float64) * 12
+    interest_only = np.asarray(payment_type) == 'interest_only'
+    num_months = monthly_rates.shape[-1]
+    shape = np.broadcast_shapes(principal.shape, monthly_rates.shape[:-1],
+                                term_months.shape, interest_only.shape) + (num_months + 1,)
+    
+    balance = np.zeros(shape)
+    payments = np.zeros(shape)
+    interest_paid = np.zeros(shape)
+    balance[..., 0] = np.maximum(principal, 0.0)
+    payment = np.zeros(shape[:-1])
+    
+    for month in range(1, num_months + 1):
+        previous = balance[..., month - 1]
+        monthly_rate = monthly_rates[..., month - 1]
+        remaining_months = term_months - (month - 1)
+        interest = previous * monthly_rate
+        recomputed = calculate_monthly_payments(previous, monthly_rate * 12, remaining_months / 12)
+        payment = np.where(interest_only, interest, np.where(remaining_months > 0, recomputed, payment))
+        principal_part = np.where(interest_only, 0.0, np.minimum(payment - interest, previous))
+        balance[..., month] = np.maximum(previous - principal_part, 0.0)
+        payments[..., month] = payment
+        interest_paid[..., month] = interest
+    
+    principal_paid = np.zeros(shape)
+    principal_paid[..., 1:] = balance[..., :-1] - balance[..., 1:]
+    
+    return {
+        'monthly_payment': payments,
+        'principal_remaining': balance,
+        'principal_paid': principal_paid,
+        'interest_paid': interest_paid
+    }
+
+
+def calculate_balance_after(principal: float, annual_rate: float, years: int, month: int,
+                            payment_type: str = 'principal_and_interest') -> float:
+    """
+    Calculate the remaining principal after a given number of monthly payments.
+    Uses the closed-form annuity balance, so the cost does not depend on month.
+    
+    Args:
+        principal: Loan principal amount
+        annual_rate: Annual interest rate (as decimal)
+        years: Loan term in years
+        month: Number of payments made (0 returns the original principal)
+        payment_type: 'principal_and_interest' or 'interest_only'
+    
+    Returns:
+        Principal remaining after the given month
+    """
+    monthly_payment = calculate_monthly_payments(principal, annual_rate, years, payment_type)
+    balance = _scheduled_balance(
+        np.float64(principal), np.float64(annual_rate) / 12, monthly_payment,
+        np.float64(max(month, 0)), payment_type == 'interest_only'
+    )
+    return float(balance)
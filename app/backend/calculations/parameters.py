@@ -0,0 +1,283 @@
+"""
+Scenario parameter model.
+Parses and validates raw scenario inputs (request JSON, batch entries, sweep
+cells or command-line values) in a single pass into a typed, slotted
+parameter object, collecting every validation error along the way.
+
+The field table is compiled once at import into a flat tuple of converter
+and check functions, so parsing a scenario is one loop over the fields.
+"""
+
+import math
+from collections import namedtuple
+from decimal import Decimal
+
+from app.backend.calculations.indexation import INDEXED_SERIES
+from app.backend.calculations.precision import PRECISION_EXACT, decimal_context, normalize_precision
+
+PAYMENT_TYPE_LABELS = {
+    'Principal and Interest': 'principal_and_interest',
+    'Interest Only': 'interest_only',
+}
+
+# name, label, default, kind ('number', 'percent' or 'integer'), accepted range, range check and its message
+_Field = namedtuple('_Field', 'name label default kind low high invalid range_error')
+
+# Largest amount, yearly rate or increase (as a percentage) and loan term accepted.
+# Past these, the float and Decimal engines stop agreeing (float overflow, or
+# rates compounding out of range), so both precision modes reject them alike.
+MAX_AMOUNT = 10 ** 12
+MAX_RATE = 100
+MAX_LOAN_YEARS = 100
+MAX_NUM_YEARS = 100
+
+
+def _between(low, high):
+    return lambda value: value < low or value > high
+
+
+def _amount(name: str, label: str, default=0) -> _Field:
+    return _Field(name, label, default, 'number', 0, MAX_AMOUNT, _between(0, MAX_AMOUNT),
+                  f'{label} must be between 0 and {MAX_AMOUNT:,}')
+
+
+def _rate(name: str, label: str, default=0) -> _Field:
+    return _Field(name, label, default, 'percent', 0, MAX_RATE, _between(0, MAX_RATE),
+                  f'{label} must be between 0 and {MAX_RATE}')
+
+
+def _increase(name: str, label: str) -> _Field:
+    return _Field(name, label, 0, 'percent', -MAX_RATE, MAX_RATE, _between(-MAX_RATE, MAX_RATE),
+                  f'{label} must be between {-MAX_RATE} and {MAX_RATE}')
+
+
+_FIELD_TABLE = (
+    _Field('purchase_price', 'Purchase Price', 0, 'number', 0, MAX_AMOUNT,
+           lambda value: value <= 0 or value > MAX_AMOUNT,
+           f'Purchase Price must be greater than 0 and at most {MAX_AMOUNT:,}'),
+    _Field('downpayment_percentage', 'Downpayment Percentage', 20, 'percent', 0, 100,
+           _between(0, 100), 'Downpayment Percentage must be between 0 and 100'),
+    _rate('interest_rate', 'Interest Rate'),
+    _Field('loan_years', 'Loan Years', 30, 'integer', 1, MAX_LOAN_YEARS,
+           _between(1, MAX_LOAN_YEARS), f'Loan Years must be between 1 and {MAX_LOAN_YEARS}'),
+    _amount('maintenance_base', 'Maintenance - Monthly Base'),
+    _increase('maintenance_increase', 'Maintenance - Yearly Increase'),
+    _amount('property_tax_base', 'Property Tax - Annual Base'),
+    _increase('property_tax_increase', 'Property Tax - Yearly Increase'),
+    _amount('insurance', 'Annual Insurance'),
+    _amount('utilities', 'Monthly Utilities'),
+    _amount('repairs', 'Annual Repairs'),
+    _amount('rental_income_base', 'Monthly Rental'),
+    _increase('rental_increase', 'Rental - Yearly Increase'),
+    _rate('marginal_tax_rate', 'Marginal Tax Rate'),
+    _rate('expected_return_rate', 'Expected Return Rate'),
+    _increase('real_estate_market_increase', 'Real Estate Market Increase'),
+    _rate('commission_percentage', 'Commission Percentage', 5),
+    _amount('closing_costs', 'Closing Costs'),
+    _amount('land_transfer_tax', 'Land Transfer Tax'),
+)
+
+# The projection horizon is checked like the fields above but is not a calculation input
+_NUM_YEARS_FIELD = _Field('num_years', 'Number of Years', 30, 'integer', 0, MAX_NUM_YEARS,
+                          _between(0, MAX_NUM_YEARS),
+                          f'Number of Years must be between 0 and {MAX_NUM_YEARS}')
+
+NUMERIC_FIELDS = tuple(field.name for field in _FIELD_TABLE)
+PARAM_FIELDS = NUMERIC_FIELDS + ('payment_type', 'indexation')
+PERCENT_FIELDS = frozenset(field.name for field in _FIELD_TABLE if field.kind == 'percent')
+INTEGER_FIELDS = frozenset(field.name for field in _FIELD_TABLE if field.kind == 'integer')
+# (low, high) accepted for each numeric input, in request units (percentages as percentages)
+FIELD_BOUNDS = {field.name: (field.low, field.high) for field in _FIELD_TABLE}
+
+
+def _decimal(value) -> Decimal:
+    number = Decimal(str(value))
+    if not number.is_finite():
+        raise ValueError(f'{value!r} is not a finite number')
+    return number
+
+
+def finite_float(value) -> float:
+    """Convert a request value to float, raising ValueError for NaN and infinities."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f'{value!r} is not a finite number')
+    return number
+
+
+def _parse_indexation(raw, exact: bool, errors: list):
+    """
+    Parse optional indexation schedules.
+
+    Raw form: {<series>: {"steps": [{"year": int, "increase": pct}, ...],
+    "overrides": [{"year": int, "increase": pct}, ...] or {<year>: pct}}}
+    with series from INDEXED_SERIES and increases as percentages.
+
+    Returns:
+        None, or {<series>: {'steps': ((year, increase), ...),
+        'overrides': ((year, increase), ...)}} with increases as decimals,
+        in INDEXED_SERIES order
+    """
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        errors.append('Indexation must be an object mapping series to schedules')
+        return None
+    convert = _decimal if exact else finite_float
+    hundred = Decimal(100) if exact else 100.0
+    for series in raw:
+        if series not in INDEXED_SERIES:
+            errors.append(f"Indexation series must be one of: {', '.join(INDEXED_SERIES)}")
+    indexation = {}
+    for series in INDEXED_SERIES:
+        schedule = raw.get(series)
+        if schedule is None:
+            continue
+        if not isinstance(schedule, dict):
+            errors.append(f'Indexation for {series} must be an object with steps and overrides')
+            continue
+        parsed = {}
+        for kind in ('steps', 'overrides'):
+            entries = schedule.get(kind) or []
+            if isinstance(entries, dict):
+                entries = [{'year': year, 'increase': increase} for year, increase in entries.items()]
+            pairs = []
+            for entry in entries:
+                try:
+                    year = int(entry['year'])
+                    increase = convert(entry['increase']) / hundred
+                except (KeyError, TypeError, ValueError, ArithmeticError):
+                    errors.append(f'Indexation {kind} for {series} need an integer year and a numeric increase')
+                    continue
+                if year < 2:
+                    errors.append(f'Indexation {kind} for {series} must start in year 2 or later')
+                    continue
+                if not -MAX_RATE <= increase * 100 <= MAX_RATE:
+                    errors.append(f'Indexation {kind} for {series} must have increases between '
+                                  f'{-MAX_RATE} and {MAX_RATE}')
+                    continue
+                pairs.append((year, increase))
+            parsed[kind] = tuple(sorted(pairs))
+        indexation[series] = parsed
+    return indexation or None
+
+
+def _compile(field: _Field, exact: bool) -> tuple:
+    """Build (name, default, convert, scale, invalid, range_error, invalid_error) for one field."""
+    if field.kind == 'integer':
+        return field.name, field.default, int, None, field.invalid, field.range_error, \
+            f'{field.label} must be a valid integer'
+    convert = _decimal if exact else finite_float
+    scale = None
+    if field.kind == 'percent':
+        scale = Decimal(100) if exact else 100.0
+    return field.name, field.default, convert, scale, field.invalid, field.range_error, \
+        f'{field.label} must be a valid number'
+
+
+_COMPILED = {
+    False: tuple(_compile(field, exact=False) for field in _FIELD_TABLE),
+    True: tuple(_compile(field, exact=True) for field in _FIELD_TABLE),
+}
+
+
+class ScenarioParams:
+    """
+    Parsed scenario inputs in the numeric type of their precision mode.
+
+    Rates and percentages are stored as decimals (20% -> 0.2), amounts as
+    entered, loan_years and num_years as ints, payment_type as
+    'principal_and_interest' or 'interest_only' and indexation as None or
+    the normalized schedules described in _parse_indexation.
+    """
+
+    __slots__ = PARAM_FIELDS + ('num_years', 'precision')
+
+    purchase_price: float
+    downpayment_percentage: float
+    interest_rate: float
+    loan_years: int
+    maintenance_base: float
+    maintenance_increase: float
+    property_tax_base: float
+    property_tax_increase: float
+    insurance: float
+    utilities: float
+    repairs: float
+    rental_income_base: float
+    rental_increase: float
+    marginal_tax_rate: float
+    expected_return_rate: float
+    real_estate_market_increase: float
+    commission_percentage: float
+    closing_costs: float
+    land_transfer_tax: float
+    payment_type: str
+    indexation: dict
+    num_years: int
+    precision: str
+
+    def to_dict(self) -> dict:
+        """Return the calculation inputs as the params dictionary used by the projection engine."""
+        return {name: getattr(self, name) for name in PARAM_FIELDS}
+
+    @classmethod
+    def parse(cls, data: dict, default_precision=None):
+        """
+        Parse and validate raw scenario inputs in a single pass.
+
+        Args:
+            data: Raw inputs keyed by field name (numbers or numeric strings,
+                percentages as percentages)
+            default_precision: Precision used when data has no "precision" option
+
+        Returns:
+            Tuple of (params, errors); params is None if there were validation
+            errors, and errors lists every problem found
+        """
+        errors = []
+        try:
+            precision = normalize_precision(data.get('precision', default_precision))
+            precision_error = None
+        except ValueError as e:
+            precision = None
+            precision_error = str(e)
+
+        # Percentages are divided in the exact Decimal context (floats are unaffected)
+        with decimal_context():
+            params = cls.__new__(cls)
+            for name, default, convert, scale, invalid, range_error, invalid_error in _COMPILED[precision == PRECISION_EXACT]:
+                try:
+                    # Non-finite values (nan, inf) are rejected by the converters
+                    value = convert(data.get(name, default))
+                    # Range checks apply to the value as entered (percentages as percentages)
+                    if invalid is not None and invalid(value):
+                        errors.append(range_error)
+                        continue
+                except (ValueError, TypeError, ArithmeticError):
+                    errors.append(invalid_error)
+                    continue
+                setattr(params, name, value / scale if scale is not None else value)
+
+            try:
+                params.num_years = int(data.get('num_years', _NUM_YEARS_FIELD.default))
+                if _NUM_YEARS_FIELD.invalid(params.num_years):
+                    errors.append(_NUM_YEARS_FIELD.range_error)
+            except (ValueError, TypeError, ArithmeticError):
+                errors.append('Number of Years must be a valid integer')
+
+            payment_type = data.get('payment_type', 'Principal and Interest')
+            if isinstance(payment_type, str) and payment_type in PAYMENT_TYPE_LABELS:
+                params.payment_type = PAYMENT_TYPE_LABELS[payment_type]
+            else:
+                errors.append(f"Payment Type must be one of: {', '.join(PAYMENT_TYPE_LABELS)}")
+
+            params.indexation = _parse_indexation(data.get('indexation'), precision == PRECISION_EXACT, errors)
+
+        if precision_error:
+            errors.append(precision_error)
+        if errors:
+            return None, errors
+
+        params.precision = precision
+        return params, errors
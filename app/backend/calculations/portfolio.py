@@ -0,0 +1,159 @@
+"""
+Portfolio aggregation utilities.
+Projects several properties bought at different months and combines them
+into portfolio columns on a shared monthly timeline.
+
+Properties are split into one chunk per worker (smaller when a chunk would
+exceed the memory bound, and never below a minimum size that keeps small
+portfolios inline); each chunk is projected as one vectorized batch of
+scenarios, spread over a process pool when there is more than one chunk. Every property's columns are shifted to its purchase month with one
+gather and summed over the chunk's properties, and chunk totals are added
+together as they stream back.
+
+Before its purchase month a property contributes nothing. From its purchase
+month on it contributes its projection, month 0 of which is the purchase.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.backend.calculations.projection import calculate_projection, stack_params
+from app.backend.calculations.sale import CAPITAL_GAINS_INCLUSION_TIERS, calculate_taxable_capital_gain
+
+# Portfolio columns, in the order they appear in each result row
+PORTFOLIO_COLUMNS = (
+    'month',
+    'properties_held',
+    'principal_remaining',
+    'home_value',
+    'equity',
+    'cash_flow',
+    'cumulative_cash_flow',
+    'net_return',
+    'capital_gain',
+    'taxable_capital_gain',
+    'first_tier_room',
+)
+
+# Property columns read to build the portfolio columns
+PROPERTY_COLUMNS = ('principal_remaining', 'home_value', 'sales_fees', 'rental_gains', 'net_return')
+
+# Columns summed over the properties held (the rest are derived from the sums)
+SUMMED_COLUMNS = ('properties_held', 'principal_remaining', 'home_value', 'cash_flow', 'net_return', 'capital_gain')
+
+# Upper bound on properties * months projected at once in a single chunk
+CHUNK_ELEMENTS = 1 << 16
+
+# Fewest properties worth sending to a worker; smaller portfolios run in one chunk
+MIN_CHUNK_PROPERTIES = 32
+
+_executors = {}
+
+
+def _project_chunk(task: tuple) -> dict:
+    """Project one chunk of properties and sum them on the portfolio timeline (runs in a worker process)."""
+    params_list, offsets, num_months = task
+    stacked = stack_params(params_list)
+    columns = calculate_projection(stacked, num_months // 12, names=PROPERTY_COLUMNS)
+
+    # Property month shown at each portfolio month, and whether the property is held by then
+    offsets = np.asarray(offsets)
+    property_month = np.arange(num_months + 1) - offsets[:, None]
+    held = property_month >= 0
+    property_month = np.maximum(property_month, 0)
+
+    def aligned(values):
+        return np.where(held, np.take_along_axis(values, property_month, axis=-1), 0.0).sum(axis=0)
+
+    purchase_price = stacked['purchase_price'][:, None]
+    initial_investment = (stacked['purchase_price'] * stacked['downpayment_percentage']
+                          + stacked['closing_costs'] + stacked['land_transfer_tax'])
+    return {
+        'properties_held': held.sum(axis=0),
+        'principal_remaining': aligned(columns['principal_remaining']),
+        'home_value': aligned(columns['home_value']),
+        # Rental gains, less each initial investment in its purchase month
+        'cash_flow': aligned(columns['rental_gains'])
+                     - np.bincount(offsets, weights=initial_investment, minlength=num_months + 1),
+        'net_return': aligned(columns['net_return']),
+        'capital_gain': aligned(columns['home_value'] - purchase_price - columns['sales_fees']),
+    }
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool with the given number of workers, creating it on first use."""
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+
+def calculate_portfolio(params_list: list, offsets: list, num_years: int, workers: int = None,
+                        inclusion_tiers=CAPITAL_GAINS_INCLUSION_TIERS) -> dict:
+    """
+    Project properties bought at different months and combine them into portfolio columns.
+
+    Args:
+        params_list: Normalized float inputs for each property (see calculate_projection)
+        offsets: Purchase month of each property on the portfolio timeline
+            (0 to num_years * 12)
+        num_years: Portfolio horizon in years
+        workers: Worker processes (defaults to the CPU count; 1 runs inline)
+        inclusion_tiers: Capital gains inclusion rate tiers applied to the
+            combined gain
+
+    Returns:
+        Dictionary mapping each name in PORTFOLIO_COLUMNS to an array for
+        portfolio months 0..num_years*12:
+        properties_held: number of properties bought so far
+        principal_remaining: total mortgage principal outstanding
+        home_value: total home value
+        equity: home_value - principal_remaining
+        cash_flow: total rental gains, less each property's initial
+            investment (downpayment, closing costs and land transfer tax) in
+            its purchase month
+        cumulative_cash_flow: running total of cash_flow
+        net_return: combined net return of selling every property held
+        capital_gain: combined capital gain of selling every property held
+            (losses offset gains)
+        taxable_capital_gain: taxable part of the combined gain, with the
+            inclusion tiers applied to the combined gain rather than to each
+            property's own gain
+        first_tier_room: part of the first inclusion tier (the $250k tier)
+            not yet used by the combined gain
+    """
+    num_months = int(num_years) * 12
+    workers = max(1, workers or os.cpu_count() or 1)
+    per_worker = max(MIN_CHUNK_PROPERTIES, -(-len(params_list) // workers))
+    chunk_size = max(1, min(per_worker, CHUNK_ELEMENTS // (num_months + 1)))
+    tasks = [
+        (params_list[start:start + chunk_size], offsets[start:start + chunk_size], num_months)
+        for start in range(0, len(params_list), chunk_size)
+    ]
+
+    if workers == 1 or len(tasks) <= 1:
+        chunk_totals = map(_project_chunk, tasks)
+    else:
+        chunk_totals = _get_executor(workers).map(_project_chunk, tasks)
+
+    totals = {name: np.zeros(num_months + 1) for name in SUMMED_COLUMNS}
+    for chunk in chunk_totals:
+        for name, values in chunk.items():
+            totals[name] += values
+
+    first_tier = inclusion_tiers[0][0] or 0
+    capital_gain = totals['capital_gain']
+    return {
+        'month': np.arange(num_months + 1),
+        'properties_held': totals['properties_held'].astype(np.int64),
+        'principal_remaining': totals['principal_remaining'],
+        'home_value': totals['home_value'],
+        'equity': totals['home_value'] - totals['principal_remaining'],
+        'cash_flow': totals['cash_flow'],
+        'cumulative_cash_flow': np.cumsum(totals['cash_flow']),
+        'net_return': totals['net_return'],
+        'capital_gain': capital_gain,
+        'taxable_capital_gain': calculate_taxable_capital_gain(capital_gain, inclusion_tiers),
+        'first_tier_room': np.maximum(first_tier - np.maximum(capital_gain, 0.0), 0.0),
+    }
@@ -0,0 +1,87 @@
+"""
+Numeric precision modes for the calculation engine.
+
+- fast: inputs are parsed straight to float and every column is computed
+  with NumPy float64 arrays. No Decimal arithmetic is involved.
+- exact: inputs are parsed to Decimal and every value stays a Decimal from
+  parsing to serialization, with no float round-trips in between.
+
+Decimal arithmetic follows the current thread's (or asyncio task's) Decimal
+context, so settings made at import time only reach the importing thread.
+Exact calculations instead enter decimal_context() themselves, which gives
+the same results in any thread, task or worker process.
+"""
+
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_EVEN, localcontext
+
+PRECISION_FAST = 'fast'
+PRECISION_EXACT = 'exact'
+PRECISION_MODES = (PRECISION_FAST, PRECISION_EXACT)
+DEFAULT_PRECISION = PRECISION_FAST
+
+# Decimal settings for exact precision: 28 significant digits and a wide exponent range
+DECIMAL_PRECISION = 28
+DECIMAL_EMIN = -999999
+DECIMAL_EMAX = 999999
+
+# Template for decimal_context(); localcontext() works on a copy, so it is never modified
+_DECIMAL_CONTEXT = Context(
+    prec=DECIMAL_PRECISION,
+    rounding=ROUND_HALF_EVEN,
+    Emin=DECIMAL_EMIN,
+    Emax=DECIMAL_EMAX,
+    traps=[InvalidOperation, DivisionByZero, Overflow],
+)
+
+
+def normalize_precision(value) -> str:
+    """
+    Normalize a precision option from a request or setting.
+
+    Args:
+        value: 'fast', 'exact' (any case) or None for the default
+
+    Returns:
+        One of PRECISION_MODES
+
+    Raises:
+        ValueError: If the value is not a known precision mode
+    """
+    if value is None:
+        return DEFAULT_PRECISION
+    precision = str(value).strip().lower()
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"Precision must be one of: {', '.join(PRECISION_MODES)}")
+    return precision
+
+
+def decimal_context():
+    """
+    Return a context manager applying the exact-precision Decimal settings.
+
+    The settings apply to the current thread or task until the block exits.
+    Generators must not yield inside the block, or the settings would leak
+    into the consumer between items.
+    """
+    return localcontext(_DECIMAL_CONTEXT)
+
+
+def parse_number(value, precision: str):
+    """
+    Parse a raw input value into the numeric type used by a precision mode.
+
+    Args:
+        value: Raw value (number or numeric string)
+        precision: One of PRECISION_MODES
+
+    Returns:
+        Decimal for exact precision, float for fast precision
+    """
+    if precision == PRECISION_EXACT:
+        return Decimal(str(value))
+    return float(value)
+
+
+def zero_like(value):
+    """Return zero in the same numeric type as value (float, Decimal, ...)."""
+    return type(value)(0)
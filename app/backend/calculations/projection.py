@@ -0,0 +1,834 @@
+"""
+Projection engine.
+Computes every monthly column of an investment projection as whole-horizon
+NumPy arrays instead of stepping through the months one at a time.
+
+Recurrences from the per-month loop are replaced with closed forms:
+- mortgage balance uses the closed-form amortization schedule
+- yearly indexation uses one growth factor per year (see indexation.py),
+  looked up for each of its 12 months
+- running totals use cumulative sums
+- the compounding expected return uses a discounted cumulative sum
+- the IRR of selling at each month is solved with Newton's method from the
+  previous month's rate (see returns.py)
+
+Tolerance: fast (float64) and exact (Decimal) precision agree to within 1e-8
+relative, or 1e-8 absolute below 1, for every column (tests/test_projection.py).
+The difference comes from float64 rounding in the closed forms and is far
+below the cent precision shown in the frontend. Capital gains are taxed with
+tiered inclusion rates (see sale.CAPITAL_GAINS_INCLUSION_TIERS), so once a
+sale's gain exceeds the first tier the sale columns intentionally differ from
+the earlier flat 50% inclusion.
+
+After an edit, calculate_delta_projection reuses the previous projection's
+columns that the changed inputs do not affect (see INPUT_DEPENDENCIES) and
+reruns only the stages holding invalidated columns.
+
+Inputs may be scalars or 1-D arrays of equal length (one value per scenario).
+Columns have shape (num_months + 1,) for scalar inputs and
+(num_scenarios, num_months + 1) for array inputs. A projection whose values
+overflow float64 raises ValueError instead of returning infinities or NaN.
+
+The exact precision mode instead steps through the months with the Decimal
+calculation helpers, keeping every value a Decimal. Exact columns are lists
+and only scalar inputs are supported. Exact arithmetic always runs in the
+Decimal context from precision.decimal_context(), whichever thread runs it.
+"""
+
+import numpy as np
+
+from app.backend.calculations.mortgage import (
+    calculate_amortization_schedule,
+    calculate_variable_rate_schedule,
+    calculate_monthly_payment,
+    calculate_month_breakdown
+)
+from app.backend.calculations.indexation import indexation_curve
+from app.backend.calculations.investment import (
+    calculate_total_expenses,
+    calculate_deductible_expenses,
+    calculate_taxable_income,
+    calculate_taxes_due,
+    calculate_net_profit,
+    calculate_expected_return,
+    calculate_cumulative_investment,
+    calculate_cumulative_investment_new,
+    calculate_cumulative_expected_return_monthly
+)
+from app.backend.calculations.sale import (
+    calculate_home_value_curve,
+    calculate_sale_metrics,
+    calculate_net_return_new,
+    calculate_return_percent,
+    calculate_return_comparison
+)
+from app.backend.calculations.returns import calculate_irr_curve, calculate_npv_curve, exact_irr
+from app.backend.calculations.precision import PRECISION_EXACT, PRECISION_FAST, decimal_context, zero_like
+from app.backend.calculations.timing import mark
+
+# Version of the engine's results; bump it whenever a change alters any output value,
+# so validators (ETags) issued for earlier results stop matching
+ENGINE_VERSION = '3'
+
+# Output columns, in the order they appear in each result row
+COLUMNS = (
+    'month',
+    'year',
+    'principal_remaining',
+    'mortgage_payments',
+    'principal_paid',
+    'interest_paid',
+    'maintenance_fees',
+    'property_tax',
+    'insurance_paid',
+    'utilities',
+    'repairs',
+    'total_expenses',
+    'deductible_expenses',
+    'rental_income',
+    'taxable_income',
+    'taxes_due',
+    'rental_gains',
+    'cumulative_rental_gains',
+    'cumulative_investment',
+    'expected_return',
+    'cumulative_expected_return',
+    'home_value',
+    'capital_gains_tax',
+    'sales_fees',
+    'sale_income',
+    'sale_net',
+    'net_return',
+    'return_percent',
+    'return_comparison',
+    'irr',
+    'npv',
+)
+
+# Columns returned when a request names no fields
+DEFAULT_FIELDS = COLUMNS
+
+# Columns each column is computed from (direct dependencies only)
+COLUMN_DEPENDENCIES = {
+    'month': (),
+    'year': (),
+    'principal_remaining': (),
+    'mortgage_payments': (),
+    'principal_paid': (),
+    'interest_paid': (),
+    'maintenance_fees': (),
+    'property_tax': (),
+    'insurance_paid': (),
+    'utilities': (),
+    'repairs': (),
+    'total_expenses': ('mortgage_payments', 'maintenance_fees', 'property_tax', 'insurance_paid',
+                       'utilities', 'repairs'),
+    'deductible_expenses': ('interest_paid', 'maintenance_fees', 'property_tax', 'insurance_paid',
+                            'utilities', 'repairs'),
+    'rental_income': (),
+    'taxable_income': ('rental_income', 'deductible_expenses'),
+    'taxes_due': ('taxable_income',),
+    'rental_gains': ('rental_income', 'total_expenses', 'taxes_due'),
+    'cumulative_rental_gains': ('rental_gains',),
+    'cumulative_investment': ('cumulative_rental_gains',),
+    'expected_return': ('cumulative_rental_gains',),
+    'cumulative_expected_return': ('expected_return',),
+    'home_value': (),
+    'capital_gains_tax': ('home_value', 'sales_fees'),
+    'sales_fees': ('home_value',),
+    'sale_income': ('home_value', 'sales_fees', 'capital_gains_tax'),
+    'sale_net': ('sale_income', 'principal_remaining'),
+    'net_return': ('sale_net', 'cumulative_rental_gains'),
+    'return_percent': ('net_return', 'cumulative_investment'),
+    'return_comparison': ('net_return', 'cumulative_expected_return'),
+    'irr': ('rental_gains', 'sale_net'),
+    'npv': ('rental_gains', 'sale_net'),
+}
+
+# Columns computed together by each stage of the fast engine
+LOAN_COLUMNS = frozenset(('principal_remaining', 'mortgage_payments', 'principal_paid', 'interest_paid'))
+CASH_FLOW_COLUMNS = frozenset((
+    'maintenance_fees', 'property_tax', 'insurance_paid', 'utilities', 'repairs', 'total_expenses',
+    'deductible_expenses', 'rental_income', 'taxable_income', 'taxes_due', 'rental_gains',
+    'cumulative_rental_gains', 'cumulative_investment',
+))
+EXPECTED_RETURN_COLUMNS = frozenset(('expected_return', 'cumulative_expected_return'))
+SALE_COLUMNS = frozenset(('home_value', 'capital_gains_tax', 'sales_fees', 'sale_income', 'sale_net'))
+RETURN_COLUMNS = frozenset(('net_return', 'return_percent', 'return_comparison'))
+
+# Columns that read each input directly (other columns are affected through COLUMN_DEPENDENCIES)
+_INITIAL_INVESTMENT_COLUMNS = ('cumulative_investment', 'expected_return', 'net_return', 'irr', 'npv')
+INPUT_DEPENDENCIES = {
+    'purchase_price': tuple(LOAN_COLUMNS) + _INITIAL_INVESTMENT_COLUMNS + ('home_value', 'capital_gains_tax'),
+    'downpayment_percentage': tuple(LOAN_COLUMNS) + _INITIAL_INVESTMENT_COLUMNS,
+    'closing_costs': _INITIAL_INVESTMENT_COLUMNS,
+    'land_transfer_tax': _INITIAL_INVESTMENT_COLUMNS,
+    'interest_rate': tuple(LOAN_COLUMNS),
+    'loan_years': tuple(LOAN_COLUMNS),
+    'payment_type': tuple(LOAN_COLUMNS),
+    'maintenance_base': ('maintenance_fees',),
+    'maintenance_increase': ('maintenance_fees',),
+    'property_tax_base': ('property_tax',),
+    'property_tax_increase': ('property_tax',),
+    'insurance': ('insurance_paid',),
+    'utilities': ('utilities',),
+    'repairs': ('repairs',),
+    'rental_income_base': ('rental_income',),
+    'rental_increase': ('rental_income',),
+    'indexation': ('maintenance_fees', 'property_tax', 'rental_income'),
+    'marginal_tax_rate': ('taxes_due', 'capital_gains_tax'),
+    'expected_return_rate': ('expected_return', 'npv'),
+    'real_estate_market_increase': ('home_value',),
+    'commission_percentage': ('sales_fees',),
+}
+
+# Columns computed directly from each column (the reverse of COLUMN_DEPENDENCIES)
+COLUMN_DEPENDENTS = {
+    name: tuple(other for other in COLUMNS if name in COLUMN_DEPENDENCIES[other])
+    for name in COLUMNS
+}
+
+
+def _as_param(value) -> np.ndarray:
+    """Convert a scalar or per-scenario array into a column-broadcastable array."""
+    return np.asarray(value, dtype=np.float64)[..., None]
+
+
+def _with_month_zero(values, full_shape: tuple, initial=0.0) -> np.ndarray:
+    """Prepend the month 0 value to values covering months 1..N, broadcasting to full_shape."""
+    column = np.empty(full_shape, dtype=np.result_type(values, initial))
+    column[..., 0] = initial
+    column[..., 1:] = values
+    return column
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray, where: np.ndarray) -> np.ndarray:
+    """Divide element-wise, returning 0 wherever the mask is False."""
+    numerator, denominator, where = np.broadcast_arrays(numerator, denominator, where)
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=where)
+
+
+def _compounded_expected_return(cumulative_investment, monthly_rate, months):
+    """
+    Solve cer[m] = cer[m-1] * (1 + r) + r * cumulative_investment[m] with cer[0] = 0.
+
+    Returns:
+        Tuple of (expected_return, cumulative_expected_return) for months 1..N
+    """
+    growth = np.exp(months * np.log1p(monthly_rate))
+    cumulative = growth * np.cumsum(monthly_rate * cumulative_investment / growth, axis=-1)
+    previous = np.zeros_like(cumulative)
+    previous[..., 1:] = cumulative[..., :-1]
+    expected_return = (cumulative_investment + previous) * monthly_rate
+    return expected_return, cumulative
+
+
+def required_columns(names) -> frozenset:
+    """
+    Return the columns needed to compute some columns: the columns themselves
+    and every column they depend on, directly or not (see COLUMN_DEPENDENCIES).
+    """
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(COLUMN_DEPENDENCIES[name])
+    return frozenset(needed)
+
+
+def affected_columns(inputs) -> frozenset:
+    """
+    Return the columns whose values change when some inputs change: the
+    columns that read them (see INPUT_DEPENDENCIES) and every column computed
+    from those, directly or not. Unknown inputs affect every column.
+    """
+    if any(name not in INPUT_DEPENDENCIES for name in inputs):
+        return frozenset(COLUMNS)
+    affected = set()
+    pending = [column for name in inputs for column in INPUT_DEPENDENCIES[name]]
+    while pending:
+        name = pending.pop()
+        if name not in affected:
+            affected.add(name)
+            pending.extend(COLUMN_DEPENDENTS[name])
+    return frozenset(affected)
+
+
+def normalize_fields(value) -> tuple:
+    """
+    Normalize a "fields" option into the columns to compute and return.
+
+    Args:
+        value: List of column names, a comma-separated string, or None (or
+            empty) for DEFAULT_FIELDS
+
+    Returns:
+        DEFAULT_FIELDS when no column is named, COLUMNS when every column is
+        wanted, otherwise the requested columns plus 'month', in COLUMNS order
+
+    Raises:
+        ValueError: If a name is not one of COLUMNS
+    """
+    if value is None:
+        return DEFAULT_FIELDS
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)):
+        raise ValueError('Fields must be a list of column names')
+    requested = {str(name).strip() for name in value} - {''}
+    unknown = sorted(requested - set(COLUMNS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not requested:
+        return DEFAULT_FIELDS
+    if requested >= set(COLUMNS):
+        return COLUMNS
+    requested.add('month')
+    return tuple(name for name in COLUMNS if name in requested)
+
+
+def calculate_projection(params: dict, num_years: int, precision: str = PRECISION_FAST,
+                         rate_paths: dict = None, names=COLUMNS) -> dict:
+    """
+    Calculate all projection columns for months 0..num_years*12.
+
+    Args:
+        params: Normalized scenario inputs with rates as decimals, parsed
+            for the precision mode (floats for fast, Decimals for exact):
+            purchase_price, downpayment_percentage, closing_costs,
+            land_transfer_tax, interest_rate, loan_years, payment_type
+            ('principal_and_interest' or 'interest_only'), maintenance_base,
+            maintenance_increase, property_tax_base, property_tax_increase,
+            insurance (annual), utilities (monthly), repairs (annual),
+            rental_income_base, rental_increase, marginal_tax_rate,
+            expected_return_rate, real_estate_market_increase,
+            commission_percentage
+        num_years: Number of years to project
+        precision: PRECISION_FAST or PRECISION_EXACT
+        rate_paths: Optional monthly paths replacing constant rates (fast
+            precision only), each with the month or year axis last:
+            'interest_rate': annual rate during each month 1..N (the payment
+                is re-amortized every month),
+            'real_estate_market_increase': annual appreciation during each
+                month 1..N,
+            'rental_increase': increase for each projected year (the first
+                year's value is unused; increases start in year 2)
+        names: Columns to return (defaults to COLUMNS); fast precision only
+            computes the ones they depend on, and exact precision skips the
+            IRR unless it is named
+
+    Returns:
+        Dictionary mapping each name in names to a NumPy array (fast) or a
+        list of Decimals (exact)
+    """
+    if precision == PRECISION_EXACT:
+        columns = _calculate_projection_exact(params, num_years, names)
+        return columns if names is COLUMNS else {name: columns[name] for name in COLUMNS if name in names}
+    return _calculate_projection_fast(params, num_years, rate_paths or {}, names)
+
+
+def calculate_partial_projection(params: dict, num_months: int, names) -> dict:
+    """
+    Project only some fast-precision columns up to a given month.
+
+    Only the columns in names and the ones they depend on are computed, for
+    months 0..num_months, which makes this the cheap way to evaluate a single
+    metric many times (e.g. inside a root finder).
+
+    Args:
+        params: Normalized float scenario inputs (see calculate_projection)
+        num_months: Last month to project
+        names: Columns to return
+
+    Returns:
+        Dictionary mapping each name in names to an array covering months 0..num_months
+    """
+    return _calculate_projection_fast(params, None, {}, names, num_months=int(num_months))
+
+
+def calculate_delta_projection(params: dict, num_years: int, previous: dict, changed, names=COLUMNS) -> dict:
+    """
+    Recalculate a fast-precision projection after some inputs changed.
+
+    Columns of the previous projection that none of the changed inputs
+    affect (see affected_columns) are reused as they are; only the stages
+    holding invalidated columns run again. The result is identical to a
+    full projection of params.
+
+    Args:
+        params: Normalized float scenario inputs after the change (scalars)
+        num_years: Number of years to project (the same as the previous projection)
+        previous: Columns of the previous projection (output of calculate_projection)
+        changed: Names of the inputs whose values differ from the previous scenario
+        names: Columns to return (defaults to COLUMNS)
+
+    Returns:
+        Dictionary mapping each name in names to a NumPy array
+    """
+    stale = affected_columns(changed)
+    known = {name: column for name, column in previous.items() if name not in stale}
+    return _calculate_projection_fast(params, num_years, {}, names, known=known)
+
+
+def stack_params(params_list: list) -> dict:
+    """
+    Stack the inputs of many fast-precision scenarios along a leading scenario axis.
+
+    Args:
+        params_list: Normalized float inputs for each scenario (see calculate_projection)
+
+    Returns:
+        Params dictionary with one array per input (one value per scenario)
+    """
+    stacked = {name: np.array([params[name] for params in params_list]) for name in params_list[0]
+               if name != 'indexation'}
+    # Indexation schedules are kept per scenario (see indexation.indexation_curve)
+    schedules = [params.get('indexation') for params in params_list]
+    stacked['indexation'] = schedules if any(schedules) else None
+    return stacked
+
+
+def calculate_batch_projection(params_list: list, num_years_list: list, names=COLUMNS) -> list:
+    """
+    Project many fast-precision scenarios in one vectorized pass.
+
+    Scenario inputs are stacked along a leading scenario axis and projected
+    over the longest horizon; each scenario's columns are then cut back to
+    its own num_years.
+
+    Args:
+        params_list: Normalized float inputs for each scenario (see calculate_projection)
+        num_years_list: Number of years to project for each scenario
+        names: Columns to return (see calculate_projection)
+
+    Returns:
+        List of column dictionaries, one per scenario, in input order
+    """
+    if not params_list:
+        return []
+    columns = _calculate_projection_fast(stack_params(params_list), max(num_years_list), names=names)
+    return [
+        {name: values[index, :int(num_years) * 12 + 1] for name, values in columns.items()}
+        for index, num_years in enumerate(num_years_list)
+    ]
+
+
+def _calculate_projection_fast(params: dict, num_years: int, rate_paths: dict = None,
+                               names=COLUMNS, num_months: int = None, known: dict = None) -> dict:
+    """
+    Compute the projection with whole-horizon float64 arrays.
+
+    Only the stages needed for names (see required_columns) are computed, and
+    num_months can cut the horizon short of num_years * 12. Columns in known
+    are taken as already computed for these inputs: stages whose needed
+    columns are all known are skipped.
+    """
+    if num_months is None:
+        num_months = int(num_years) * 12
+    num_years = -(-num_months // 12)
+    needed = required_columns(names)
+    all_months = np.arange(num_months + 1, dtype=np.float64)
+    months = all_months[1:]
+    year_index = np.arange(num_months) // 12
+
+    purchase_price = _as_param(params['purchase_price'])
+    downpayment = purchase_price * _as_param(params['downpayment_percentage'])
+    total_initial_investment = (downpayment + _as_param(params['closing_costs'])
+                                + _as_param(params['land_transfer_tax']))
+    loan_principal = purchase_price - downpayment
+    marginal_tax_rate = _as_param(params['marginal_tax_rate'])
+    rate_paths = rate_paths or {}
+    scenario_shape = np.broadcast_shapes(*(np.shape(value) for name, value in params.items() if name != 'indexation'),
+                                         *(np.shape(path)[:-1] for path in rate_paths.values()))
+    full_shape = scenario_shape + all_months.shape
+    columns = dict(known or {})
+    stale = needed - columns.keys()
+
+    # Mortgage (the cash flow stage also uses the payments and interest)
+    if stale & LOAN_COLUMNS or (stale & CASH_FLOW_COLUMNS and not LOAN_COLUMNS <= columns.keys()):
+        if 'interest_rate' in rate_paths:
+            loan = calculate_variable_rate_schedule(
+                loan_principal[..., 0], np.asarray(rate_paths['interest_rate'])[..., :num_months],
+                params['loan_years'], params['payment_type']
+            )
+            monthly_payment = loan['monthly_payment'][..., 1:]
+        else:
+            loan = calculate_amortization_schedule(
+                loan_principal[..., 0], params['interest_rate'], params['loan_years'],
+                num_months, params['payment_type']
+            )
+            monthly_payment = loan['monthly_payment'][..., None]
+        interest_paid = loan['interest_paid'][..., 1:]
+        columns.update({
+            'principal_remaining': loan['principal_remaining'],
+            'principal_paid': loan['principal_paid'],
+            'interest_paid': loan['interest_paid'],
+            'mortgage_payments': _with_month_zero(monthly_payment, full_shape),
+        })
+        mark('amortization')
+    elif stale & CASH_FLOW_COLUMNS:
+        monthly_payment = columns['mortgage_payments'][..., 1:]
+        interest_paid = columns['interest_paid'][..., 1:]
+
+    # Expenses and rental income
+    if stale & CASH_FLOW_COLUMNS:
+        maintenance = indexation_curve(params, 'maintenance', num_years).apply(
+            _as_param(params['maintenance_base']), year_index
+        )
+        property_tax = indexation_curve(params, 'property_tax', num_years).apply(
+            _as_param(params['property_tax_base']), year_index
+        ) / 12
+        rental_income = indexation_curve(params, 'rental_income', num_years, rate_paths.get('rental_increase')).apply(
+            _as_param(params['rental_income_base']), year_index
+        )
+        insurance = _as_param(params['insurance']) / 12
+        utilities = _as_param(params['utilities'])
+        repairs = _as_param(params['repairs']) / 12
+
+        running_costs = maintenance + property_tax + insurance + utilities + repairs
+        total_expenses = monthly_payment + running_costs
+        deductible_expenses = interest_paid + running_costs
+        taxable_income = rental_income - deductible_expenses
+        taxes_due = np.where(taxable_income > 0, taxable_income * marginal_tax_rate, 0.0)
+        rental_gains = rental_income - total_expenses - taxes_due
+        cumulative_rental_gains = np.cumsum(rental_gains, axis=-1)
+
+        flows = {
+            'maintenance_fees': maintenance,
+            'property_tax': property_tax,
+            'insurance_paid': insurance,
+            'utilities': utilities,
+            'repairs': repairs,
+            'total_expenses': total_expenses,
+            'deductible_expenses': deductible_expenses,
+            'rental_income': rental_income,
+            'taxable_income': taxable_income,
+            'taxes_due': taxes_due,
+            'rental_gains': rental_gains,
+            'cumulative_rental_gains': cumulative_rental_gains,
+        }
+        for name, values in flows.items():
+            columns[name] = _with_month_zero(values, full_shape)
+        columns['cumulative_investment'] = total_initial_investment - np.minimum(columns['cumulative_rental_gains'], 0.0)
+        mark('cash_flow')
+
+    # Expected return on the cash that would otherwise have been invested
+    if stale & EXPECTED_RETURN_COLUMNS:
+        expected_return, cumulative_expected_return = _compounded_expected_return(
+            total_initial_investment - columns['cumulative_rental_gains'][..., 1:],
+            _as_param(params['expected_return_rate']) / 12,
+            months,
+        )
+        columns['expected_return'] = _with_month_zero(expected_return, full_shape)
+        columns['cumulative_expected_return'] = _with_month_zero(cumulative_expected_return, full_shape)
+        mark('expected_return')
+
+    # Sale metrics if the property were sold at the end of each month
+    if stale & SALE_COLUMNS:
+        if 'home_value' in columns:
+            home_value = columns['home_value']
+        elif 'real_estate_market_increase' in rate_paths:
+            market_rates = np.asarray(rate_paths['real_estate_market_increase'])[..., :num_months] / 12
+            home_value = _with_month_zero(np.cumprod(1.0 + market_rates, axis=-1), full_shape, 1.0) * purchase_price
+        else:
+            home_value = calculate_home_value_curve(
+                purchase_price, _as_param(params['real_estate_market_increase']), num_months
+            )
+        # The loan stage only ran if sale_net (or another column) needed it
+        principal_remaining = columns['principal_remaining'] if 'sale_net' in needed else 0.0
+        columns.update(calculate_sale_metrics(
+            home_value, purchase_price, _as_param(params['commission_percentage']),
+            marginal_tax_rate, principal_remaining
+        ))
+        mark('sale')
+
+    # Returns
+    if stale & RETURN_COLUMNS:
+        net_return = (columns['sale_net'] - total_initial_investment
+                      + np.maximum(columns['cumulative_rental_gains'], 0.0))
+        columns['net_return'] = net_return
+        if 'return_percent' in needed:
+            cumulative_investment = columns['cumulative_investment']
+            columns['return_percent'] = _safe_divide(net_return, cumulative_investment,
+                                                     cumulative_investment > 0) * 100
+        if 'return_comparison' in needed:
+            cumulative_expected_return = columns['cumulative_expected_return']
+            columns['return_comparison'] = _safe_divide(net_return, cumulative_expected_return,
+                                                        cumulative_expected_return != 0)
+        mark('returns')
+
+    # Time-weighted returns of selling at each month
+    if 'irr' in stale:
+        columns['irr'] = calculate_irr_curve(total_initial_investment, columns['rental_gains'], columns['sale_net'])
+        mark('irr')
+    if 'npv' in stale:
+        columns['npv'] = calculate_npv_curve(total_initial_investment, columns['rental_gains'], columns['sale_net'],
+                                             _as_param(params['expected_return_rate']))
+        mark('npv')
+
+    columns['month'] = np.arange(num_months + 1)
+    columns['year'] = _with_month_zero(year_index + 1, full_shape, 0)
+
+    # Columns that depend on only some of the inputs may not span every scenario yet
+    result = {
+        name: columns[name] if columns[name].shape == full_shape else np.broadcast_to(columns[name], full_shape)
+        for name in COLUMNS if name in names
+    }
+    _check_finite(result)
+    return result
+
+
+def _check_finite(columns: dict):
+    """
+    Raise ValueError if a column holds an infinity or an unexpected NaN.
+
+    Bounded inputs (see parameters.py) stay far from float64 overflow, but
+    other callers (e.g. simulated rate paths) are not bounded the same way,
+    and an overflowed value must be reported rather than sent out as a
+    non-standard JSON Infinity or NaN. Only irr uses NaN, for months without
+    a rate.
+    """
+    checked = [column for name, column in columns.items() if name != 'irr']
+    # One sum over every value is finite exactly when they all are (short of a sum near 1e308)
+    with np.errstate(over='ignore', invalid='ignore'):
+        if not checked or np.isfinite(np.add.reduce(checked, axis=None)):
+            return
+    name = next(name for name, column in columns.items() if name != 'irr' and not np.isfinite(column).all())
+    raise ValueError(f'{name} overflows for these inputs; use smaller amounts, rates or horizon')
+
+
+def _calculate_projection_exact(params: dict, num_years: int, names=COLUMNS) -> dict:
+    """Compute the projection month by month, keeping every value a Decimal."""
+    columns = {name: [] for name in COLUMNS}
+    for row in _iter_projection_exact(params, num_years, names):
+        for name in COLUMNS:
+            columns[name].append(row[name])
+    mark('projection')
+    return columns
+
+
+def _iter_projection_exact(params: dict, num_years: int, names=COLUMNS):
+    """Yield one row dictionary per month, keeping every value a Decimal (irr is None unless in names)."""
+    # Each month is computed inside the exact Decimal context, which is left
+    # before the row is handed to the consumer
+    rows = _iter_projection_exact_rows(params, num_years, 'irr' in names)
+    while True:
+        with decimal_context():
+            row = next(rows, None)
+        if row is None:
+            return
+        yield row
+
+
+def _iter_projection_exact_rows(params: dict, num_years: int, with_irr: bool = True):
+    """Yield the rows of _iter_projection_exact; must be advanced inside decimal_context()."""
+    purchase_price = params['purchase_price']
+    downpayment = purchase_price * params['downpayment_percentage']
+    total_initial_investment = downpayment + params['closing_costs'] + params['land_transfer_tax']
+    loan_principal = purchase_price - downpayment
+    interest_rate = params['interest_rate']
+    payment_type = params['payment_type']
+    marginal_tax_rate = params['marginal_tax_rate']
+    market_growth = 1 + params['real_estate_market_increase'] / 12
+    commission = params['commission_percentage']
+    monthly_return_rate = params['expected_return_rate'] / 12
+    insurance_monthly = params['insurance'] / 12
+    utilities_monthly = params['utilities']
+    repairs_monthly = params['repairs'] / 12
+    zero = zero_like(purchase_price)
+
+    monthly_payment = calculate_monthly_payment(loan_principal, interest_rate, params['loan_years'], payment_type)
+    # Yearly growth factors are built once; each month looks its factor up
+    maintenance_curve = indexation_curve(params, 'maintenance', num_years)
+    property_tax_curve = indexation_curve(params, 'property_tax', num_years)
+    rental_curve = indexation_curve(params, 'rental_income', num_years)
+
+    principal_remaining = loan_principal
+    home_value = purchase_price
+    cumulative_investment_old = total_initial_investment
+    cumulative_net_profit = zero
+    cumulative_expected_return = zero
+    # Cash flows of selling at the current month, for its IRR
+    irr_flows = [-float(total_initial_investment)]
+    irr_discount = None
+    # NPV discounts at the expected return rate, compounded monthly
+    monthly_discount = 1 / (1 + monthly_return_rate)
+    discount = 1 + zero
+    discounted_rental_gains = zero
+
+    for month in range(int(num_years) * 12 + 1):
+        if month == 0:
+            principal_paid = interest_paid = zero
+            payment = maintenance = property_tax = zero
+            insurance = utilities = repairs = zero
+            rental_income = total_expenses = deductible_expenses = zero
+            taxable_income = taxes_due = net_profit = expected_return = zero
+        else:
+            breakdown = calculate_month_breakdown(principal_remaining, interest_rate, monthly_payment, payment_type)
+            principal_paid = breakdown['principal_paid']
+            interest_paid = breakdown['interest_paid']
+            principal_remaining = breakdown['principal_remaining']
+
+            payment = monthly_payment
+            insurance, utilities, repairs = insurance_monthly, utilities_monthly, repairs_monthly
+            maintenance = params['maintenance_base'] * maintenance_curve.factor(month - 1)
+            property_tax = params['property_tax_base'] * property_tax_curve.factor(month - 1) / 12
+            rental_income = params['rental_income_base'] * rental_curve.factor(month - 1)
+
+            total_expenses = calculate_total_expenses(payment, maintenance, property_tax,
+                                                      insurance, utilities, repairs)
+            deductible_expenses = calculate_deductible_expenses(interest_paid, maintenance, property_tax,
+                                                                insurance, utilities, repairs)
+            taxable_income = calculate_taxable_income(rental_income, deductible_expenses)
+            taxes_due = calculate_taxes_due(taxable_income, marginal_tax_rate)
+            net_profit = calculate_net_profit(rental_income, total_expenses, taxes_due)
+            cumulative_net_profit += net_profit
+
+            cumulative_investment_old = calculate_cumulative_investment(
+                cumulative_investment_old, net_profit, total_initial_investment, month == 1
+            )
+            expected_return = calculate_expected_return(
+                cumulative_investment_old, cumulative_expected_return, monthly_return_rate
+            )
+            cumulative_expected_return = calculate_cumulative_expected_return_monthly(
+                cumulative_expected_return, expected_return
+            )
+
+            # Compounded one month at a time instead of a fresh power per month
+            home_value = home_value * market_growth
+            discount = discount * monthly_discount
+            discounted_rental_gains += net_profit * discount
+
+        sale = calculate_sale_metrics(home_value, purchase_price, commission, marginal_tax_rate, principal_remaining)
+        sale_net = sale['sale_net']
+        cumulative_investment = calculate_cumulative_investment_new(total_initial_investment, cumulative_net_profit)
+        net_return = calculate_net_return_new(sale_net, total_initial_investment, cumulative_net_profit)
+        return_percent = calculate_return_percent(net_return, cumulative_investment)
+        return_comparison = calculate_return_comparison(cumulative_expected_return, net_return)
+        irr = None
+        if month and with_irr:
+            irr_flows.append(float(net_profit))
+            irr, irr_discount = exact_irr(irr_flows, sale_net, irr_discount)
+        npv = discounted_rental_gains - total_initial_investment + sale_net * discount
+
+        yield {
+            'month': month,
+            'year': (month - 1) // 12 + 1 if month else 0,
+            'principal_remaining': principal_remaining,
+            'mortgage_payments': payment,
+            'principal_paid': principal_paid,
+            'interest_paid': interest_paid,
+            'maintenance_fees': maintenance,
+            'property_tax': property_tax,
+            'insurance_paid': insurance,
+            'utilities': utilities,
+            'repairs': repairs,
+            'total_expenses': total_expenses,
+            'deductible_expenses': deductible_expenses,
+            'rental_income': rental_income,
+            'taxable_income': taxable_income,
+            'taxes_due': taxes_due,
+            'rental_gains': net_profit,
+            'cumulative_rental_gains': cumulative_net_profit,
+            'cumulative_investment': cumulative_investment,
+            'expected_return': expected_return,
+            'cumulative_expected_return': cumulative_expected_return,
+            'home_value': home_value,
+            'capital_gains_tax': sale['capital_gains_tax'],
+            'sales_fees': sale['sales_fees'],
+            'sale_income': sale['sale_income'],
+            'sale_net': sale_net,
+            'net_return': net_return,
+            'return_percent': return_percent * 100,  # Convert to percentage
+            'return_comparison': return_comparison,
+            'irr': irr,
+            'npv': npv
+        }
+
+
+def column_to_list(column) -> list:
+    """
+    Convert a column into JSON-ready Python values.
+
+    NaN marks a value that does not exist (e.g. the IRR of a month no rate
+    solves) and becomes None, so responses carry null instead of invalid JSON.
+    """
+    if not isinstance(column, np.ndarray):
+        return list(column)
+    if column.dtype.kind == 'f' and np.isnan(column).any():
+        column = np.where(np.isnan(column), None, column)
+    return column.tolist()
+
+
+def projection_to_rows(columns: dict, names=COLUMNS) -> list:
+    """
+    Convert a single-scenario projection into a list of result row dictionaries.
+
+    Args:
+        columns: Output of calculate_projection for scalar inputs
+        names: Columns to include, in row order (defaults to COLUMNS)
+
+    Returns:
+        List of dictionaries, one per month, keyed by column name
+    """
+    values = [column_to_list(columns[name]) for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def iter_projection_rows(params: dict, num_years: int, precision: str = PRECISION_FAST, names=COLUMNS):
+    """
+    Yield result row dictionaries as the projection advances.
+
+    Exact precision steps through the months and yields each row as soon as
+    it is computed, holding only the running state. Fast precision computes
+    the compact float64 columns in one vectorized pass and yields rows from
+    them (see iter_column_rows).
+
+    Args:
+        params: Normalized scalar scenario inputs (see calculate_projection)
+        num_years: Number of years to project
+        precision: PRECISION_FAST or PRECISION_EXACT
+        names: Columns to include (defaults to COLUMNS)
+
+    Yields:
+        One dictionary per month, keyed by column name
+    """
+    if precision == PRECISION_EXACT:
+        rows = _iter_projection_exact(params, num_years, names)
+        yield from rows if names is COLUMNS else ({name: row[name] for name in names} for row in rows)
+    else:
+        yield from iter_column_rows(_calculate_projection_fast(params, num_years, {}, names), names)
+
+
+def iter_column_rows(columns: dict, names=COLUMNS, block: int = 12):
+    """
+    Yield row dictionaries from single-scenario columns, converting a block of months at a time.
+
+    Args:
+        columns: Output of calculate_projection for scalar inputs
+        names: Columns to include, in row order (defaults to COLUMNS)
+        block: Months converted to Python values at once
+
+    Yields:
+        One dictionary per month, keyed by column name
+    """
+    num_rows = len(columns[names[0]])
+    for start in range(0, num_rows, block):
+        window = {name: columns[name][start:start + block] for name in names}
+        yield from projection_to_rows(window, names)
+
+
+def projection_to_columns(columns: dict, names=COLUMNS) -> dict:
+    """
+    Convert a single-scenario projection into JSON-ready column lists.
+
+    Args:
+        columns: Output of calculate_projection for scalar inputs
+        names: Columns to include (defaults to COLUMNS)
+
+    Returns:
+        Dictionary mapping each name to a list with one value per month
+    """
+    return {name: column_to_list(columns[name]) for name in names}
@@ -0,0 +1,211 @@
+"""
+Time-weighted return utilities.
+Computes the internal rate of return (IRR) and net present value (NPV) of
+selling the property at the end of each month, from the cash flows of the
+projection: the initial investment going out at month 0, each month's
+rental gains, and the sale net coming in at the month of the sale.
+
+Solving the IRR of month k is a root-finding problem in the monthly
+discount factor v = 1 / (1 + monthly IRR):
+
+    -initial_investment + sum(rental_gains[t] * v^t for t = 1..k) + sale_net[k] * v^k = 0
+
+The months are solved in order with Newton's method, each starting from the
+previous month's solution, which is close because one more month of cash
+flows barely moves the rate. Where Newton fails (e.g. the first months,
+whose rates are far from 0% and from each other), the month is solved
+inside a bracket with Newton safeguarded by bisection.
+
+Rates are reported as annual percentages. Months with no rate solving their
+cash flows (month 0, no money invested, or the sale does not bring enough
+back) report NaN. The IRR is a root rather than a sum of amounts, so it is
+always solved in float64; exact precision converts the result to Decimal.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+
+IRR_MAX_ITERATIONS = 20
+# Months solved together, each starting from the rate of the last month solved before them
+IRR_BLOCK_MONTHS = 12
+# Newton stops once a step moves the discount factor by less than this (relative);
+# convergence is quadratic, so the error left is orders of magnitude smaller
+IRR_TOLERANCE = 1e-10
+# Largest number of steps of the bracketed fallback (bisection alone reaches float resolution)
+IRR_BRACKET_ITERATIONS = 64
+
+
+def _annualize(discount_factor):
+    """Convert a monthly discount factor into an annual rate as a percentage."""
+    return ((1 / discount_factor) ** 12 - 1) * 100
+
+
+def _bracketed_discount(coefficients: np.ndarray) -> np.ndarray:
+    """
+    Solve the monthly discount factor on each row's NPV polynomial within a bracket.
+
+    Each polynomial is negative at v = 0 (money went in) and positive for
+    large v (the sale month brings money back), so it has a root. Its sign at
+    v = 1 tells whether the root lies below 1, where it is searched in v, or
+    above, where it is searched in u = 1 / v on the polynomial times u^month;
+    both searches stay in [0, 1], where powers can not overflow. Newton steps
+    are taken while they stay inside the bracket, bisection steps otherwise.
+
+    Args:
+        coefficients: Cash flows of months 0..k, one row per polynomial, with
+            the sale net added to the last month
+
+    Returns:
+        Array of monthly discount factors, one per row
+    """
+    t = np.arange(coefficients.shape[-1])
+    below = coefficients.sum(axis=-1) > 0
+    exponents = np.where(below[:, None], t, t[-1] - t)
+
+    lower = np.zeros(len(coefficients))
+    upper = np.ones(len(coefficients))
+    root = np.full(len(coefficients), 0.5)
+    last_step = np.ones(len(coefficients))
+    for _ in range(IRR_BRACKET_ITERATIONS):
+        terms = coefficients * root[:, None] ** exponents
+        value = terms.sum(axis=-1)
+        # In v the polynomial rises through the root, in u it falls
+        left = (value > 0) == below
+        upper = np.where(left, root, upper)
+        lower = np.where(left, lower, root)
+        newton = root - value * root / (terms * exponents).sum(axis=-1)
+        # Bisect where Newton leaves the bracket or does not at least halve its previous step
+        bisect = ~((newton >= lower) & (newton <= upper) & (np.abs(newton - root) <= last_step / 2))
+        previous = root
+        root = np.where(bisect, (lower + upper) / 2, newton)
+        last_step = np.abs(root - previous)
+        if np.all((last_step <= IRR_TOLERANCE * root) | (value == 0)):
+            break
+    return np.where(below, root, 1 / root)
+
+
+def solve_discount(polynomials: np.ndarray, guess: np.ndarray) -> np.ndarray:
+    """
+    Solve the monthly discount factor of selling at the last month of each row.
+
+    Args:
+        polynomials: Array of shape (rows, 2, k + 1): for each scenario, the
+            cash flows c of months 0..k (c[0] is minus the initial investment,
+            c[k] includes the sale net) and c * t, the coefficients of v times
+            the derivative; every row must have a root, i.e. a negative first
+            and a positive last cash flow
+        guess: Starting discount factor of each row
+
+    Returns:
+        Array of monthly discount factors, one per row
+    """
+    t = np.arange(polynomials.shape[-1], dtype=np.float64)
+    discount = np.array(guess, dtype=np.float64)
+    with np.errstate(all='ignore'):
+        for _ in range(IRR_MAX_ITERATIONS):
+            # Polynomial and v times its derivative at once; the Newton step relative to v is their ratio
+            sums = polynomials @ (discount[:, None] ** t)[..., None]
+            relative_step = sums[:, 0, 0] / sums[:, 1, 0]
+            discount = discount * (1 - relative_step)
+            if np.abs(relative_step).max() <= IRR_TOLERANCE:
+                break
+        failed = ~((np.abs(relative_step) <= IRR_TOLERANCE) & (discount > 0))
+        if failed.any():
+            discount[failed] = _bracketed_discount(polynomials[failed, 0])
+    return discount
+
+
+def exact_irr(flows: list, sale_net, previous=None) -> tuple:
+    """
+    Calculate the IRR of selling at the last month of a month-by-month projection.
+
+    Args:
+        flows: Float copies of the cash flows of months 0..k (flows[0] is
+            minus the initial investment)
+        sale_net: Sale net at month k (Decimal)
+        previous: Monthly discount factor solved for an earlier month, or None
+
+    Returns:
+        Tuple of (annual IRR as a percentage Decimal, or None if no rate
+        solves the month's cash flows, and the discount factor to start the
+        next month from)
+    """
+    sale_net = float(sale_net)
+    if not (flows[0] < 0 and flows[-1] + sale_net > 0):
+        return None, previous
+    coefficients = np.array(flows, dtype=np.float64)
+    coefficients[-1] += sale_net
+    polynomials = np.stack((coefficients, coefficients * np.arange(len(flows))))[None]
+    discount = solve_discount(polynomials, [1.0 if previous is None else previous])[0]
+    return Decimal(repr(float(_annualize(discount)))), discount
+
+
+def calculate_npv_curve(initial_investment, rental_gains, sale_net, annual_rate) -> np.ndarray:
+    """
+    Calculate the NPV of selling at the end of every month (floats only).
+
+    Args:
+        initial_investment: Cash invested at month 0 (scalar or per-scenario
+            column-broadcastable array)
+        rental_gains: Monthly rental gains for months 0..N (month axis last)
+        sale_net: Sale net for months 0..N
+        annual_rate: Annual discount rate (as decimal), compounded monthly
+
+    Returns:
+        Array of NPVs for months 0..N
+    """
+    months = np.arange(np.shape(rental_gains)[-1], dtype=np.float64)
+    discount = np.exp(-months * np.log1p(annual_rate / 12))
+    return np.cumsum(rental_gains * discount, axis=-1) - initial_investment + sale_net * discount
+
+
+def calculate_irr_curve(initial_investment, rental_gains, sale_net) -> np.ndarray:
+    """
+    Calculate the IRR of selling at the end of every month (floats only).
+
+    Args:
+        initial_investment: Cash invested at month 0 (scalar or per-scenario
+            column-broadcastable array)
+        rental_gains: Monthly rental gains for months 0..N (month axis last)
+        sale_net: Sale net for months 0..N
+
+    Returns:
+        Array of annual IRRs as percentages for months 0..N (NaN at month 0
+        and wherever no rate solves the month's cash flows)
+    """
+    shape = np.broadcast_shapes(np.shape(initial_investment), np.shape(rental_gains), np.shape(sale_net))
+    num_months = shape[-1] - 1
+    # One row per scenario
+    flows = np.array(np.broadcast_to(rental_gains, shape), dtype=np.float64).reshape(-1, num_months + 1)
+    flows[:, 0] = -np.broadcast_to(initial_investment, shape).reshape(-1, num_months + 1)[:, 0]
+    sale_net = np.broadcast_to(sale_net, shape).reshape(-1, num_months + 1)
+
+    # A month has a positive root when money went in and the sale month brings money back
+    solvable = (flows[:, :1] < 0) & (flows + sale_net > 0)
+    months = np.arange(num_months + 1)
+    discount = np.full(flows.shape, np.nan)
+    # Rate of the last solved month, and its change from the month before
+    previous = np.ones(len(flows))
+    trend = np.ones(len(flows))
+    all_rows = np.arange(len(flows))
+    for first in range(1, num_months + 1, IRR_BLOCK_MONTHS):
+        block = months[first:first + IRR_BLOCK_MONTHS]
+        # Cash flows of selling at each month of the block, zero past that month
+        coefficients = np.where(months[:block[-1] + 1] <= block[:, None], flows[:, None, :block[-1] + 1], 0.0)
+        coefficients[:, np.arange(len(block)), block] += sale_net[:, block]
+        polynomials = np.stack((coefficients, coefficients * months[:block[-1] + 1]), axis=2)
+        # Each month starts from the last solved rate, moved on by its trend
+        guess = previous[:, None] * trend[:, None] ** np.arange(1, len(block) + 1)
+        rows, offsets = np.nonzero(solvable[:, block])
+        if not len(rows):
+            continue
+        solved = solve_discount(polynomials[rows, offsets], guess[rows, offsets])
+        discount[rows, block[offsets]] = solved
+        # The last solved month of each scenario, and the month before it, set the next block's start
+        last = np.where(np.isnan(discount[:, block]), 0, block).max(axis=-1)
+        latest, before = discount[all_rows, last], discount[all_rows, last - 1]
+        previous = np.where(last > 0, latest, previous)
+        trend = np.where(last > 1, latest / before, 1.0)
+        trend = np.where(np.isnan(trend), 1.0, trend)
+    return _annualize(discount).reshape(shape)
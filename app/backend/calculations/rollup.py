@@ -0,0 +1,96 @@
+"""
+Resolution rollups.
+Aggregates monthly projection columns into quarterly or yearly periods:
+flow columns (amounts paid or earned during a month) are summed over the
+period, and stock columns (balances, values and running totals) take their
+value at the last month of the period.
+
+Month 0 (the initial state) is kept as its own first row, so a yearly
+rollup of an N-year projection has N + 1 rows.
+"""
+
+import numpy as np
+
+from app.backend.calculations.precision import decimal_context
+from app.backend.calculations.timing import mark
+
+RESOLUTION_MONTH = 'month'
+RESOLUTION_QUARTER = 'quarter'
+RESOLUTION_YEAR = 'year'
+RESOLUTIONS = (RESOLUTION_MONTH, RESOLUTION_QUARTER, RESOLUTION_YEAR)
+MONTHS_PER_PERIOD = {RESOLUTION_MONTH: 1, RESOLUTION_QUARTER: 3, RESOLUTION_YEAR: 12}
+
+# Columns summed over each period; every other column is read at the period end
+FLOW_COLUMNS = frozenset((
+    'mortgage_payments',
+    'principal_paid',
+    'interest_paid',
+    'maintenance_fees',
+    'property_tax',
+    'insurance_paid',
+    'utilities',
+    'repairs',
+    'total_expenses',
+    'deductible_expenses',
+    'rental_income',
+    'taxable_income',
+    'taxes_due',
+    'rental_gains',
+    'expected_return',
+))
+
+
+def normalize_resolution(value) -> str:
+    """
+    Normalize a resolution option from a request.
+
+    Args:
+        value: 'month', 'quarter', 'year' (any case) or None for monthly
+
+    Returns:
+        One of RESOLUTIONS
+
+    Raises:
+        ValueError: If the value is not a known resolution
+    """
+    if value is None:
+        return RESOLUTION_MONTH
+    resolution = str(value).strip().lower()
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Resolution must be one of: {', '.join(RESOLUTIONS)}")
+    return resolution
+
+
+def rollup_projection(columns: dict, resolution: str) -> dict:
+    """
+    Aggregate projection columns to a coarser resolution.
+
+    Args:
+        columns: Output of calculate_projection (arrays with the month axis
+            last, or lists for exact precision)
+        resolution: One of RESOLUTIONS
+
+    Returns:
+        Columns in the same form as the input with one entry for month 0
+        followed by one entry per period. 'month' and 'year' give the last
+        month of each period and its year.
+    """
+    period = MONTHS_PER_PERIOD[resolution]
+    if period == 1:
+        return columns
+
+    rolled = {}
+    for name, column in columns.items():
+        is_list = not isinstance(column, np.ndarray)
+        # Exact columns hold Decimals; object arrays keep them Decimal through the sums
+        values = np.asarray(column, dtype=object) if is_list else column
+        months = values[..., 1:]
+        if name in FLOW_COLUMNS:
+            with decimal_context():
+                periods = months.reshape(months.shape[:-1] + (-1, period)).sum(axis=-1)
+        else:
+            periods = months[..., period - 1::period]
+        result = np.concatenate([values[..., :1], periods], axis=-1)
+        rolled[name] = result.tolist() if is_list else result
+    mark('rollup')
+    return rolled
@@ -1,14 +1,72 @@
 """
 Sale-related calculation utilities.
 Handles home value, capital gains tax, sales fees, and sale metrics.
+
+Functions compute in the numeric type they are given: float arguments give
+float results and Decimal arguments give Decimal results. The sale metrics
+kernel (calculate_sale_metrics) also accepts NumPy arrays and computes the
+whole sale-side column block for every month in one pass.
 """
 
-from decimal import Decimal, getcontext
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+
+from app.backend.calculations.precision import zero_like
+
+# Capital gains inclusion rate tiers for individuals in Ontario (as of June 2024):
+# (upper bound of the tier or None for no bound, share of the gain in the tier that is taxable)
+CAPITAL_GAINS_INCLUSION_TIERS = (
+    (250000, Fraction(1, 2)),
+    (None, Fraction(2, 3)),
+)
+
 
-# Set precision to 28 total digits, 14 decimal places
-getcontext().prec = 28
-getcontext().Emin = -999999
-getcontext().Emax = 999999
+def _typed_tiers(inclusion_tiers, like) -> list:
+    """Convert inclusion tiers to (lower, upper, rate) in the numeric type of like."""
+    if isinstance(like, Decimal):
+        def convert(value):
+            if isinstance(value, Fraction):
+                return Decimal(value.numerator) / Decimal(value.denominator)
+            return Decimal(str(value))
+    else:
+        convert = float
+    tiers = []
+    lower = convert(0)
+    for upper, rate in inclusion_tiers:
+        upper = None if upper is None else convert(upper)
+        tiers.append((lower, upper, convert(rate)))
+        lower = upper
+    return tiers
+
+
+def calculate_taxable_capital_gain(capital_gain, inclusion_tiers=CAPITAL_GAINS_INCLUSION_TIERS):
+    """
+    Calculate the taxable part of a capital gain with tiered inclusion rates.
+
+    Args:
+        capital_gain: Capital gain (scalar or array of gains)
+        inclusion_tiers: Pairs of (upper bound or None, inclusion rate), in
+            increasing order of bound
+
+    Returns:
+        Taxable capital gain (zero for losses)
+    """
+    if isinstance(capital_gain, np.ndarray):
+        taxable = np.zeros_like(capital_gain)
+        for lower, upper, rate in _typed_tiers(inclusion_tiers, 0.0):
+            in_tier = capital_gain if upper is None else np.minimum(capital_gain, upper)
+            taxable += np.maximum(in_tier - lower, 0.0) * rate
+        return taxable
+
+    taxable = zero_like(capital_gain)
+    for lower, upper, rate in _typed_tiers(inclusion_tiers, capital_gain):
+        in_tier = capital_gain if upper is None else min(capital_gain, upper)
+        if in_tier <= lower:
+            break
+        taxable += (in_tier - lower) * rate
+    return taxable
 
 
 def calculate_home_value(purchase_price: float, real_estate_market_increase: float, months: int) -> float:
@@ -26,16 +84,11 @@ def calculate_home_value(purchase_price: float, real_estate_market_increase: flo
     if months <= 0:
         return purchase_price
     
-    price = Decimal(str(purchase_price))
-    rate = Decimal(str(real_estate_market_increase))
-    m = Decimal(str(months))
-    
     # Convert annual rate to monthly rate
-    monthly_rate = rate / Decimal('12')
+    monthly_rate = real_estate_market_increase / 12
     
     # Compound monthly
-    factor = (Decimal('1') + monthly_rate) ** m
-    return float(price * factor)
+    return purchase_price * (1 + monthly_rate) ** months
 
 
 def calculate_sales_fees(home_value: float, commission_percentage: float) -> float:
@@ -49,14 +102,15 @@ def calculate_sales_fees(home_value: float, commission_percentage: float) -> flo
     Returns:
         Sales fees (commission amount)
     """
-    return float(Decimal(str(home_value)) * Decimal(str(commission_percentage)))
+    return home_value * commission_percentage
 
 
 def calculate_capital_gains_tax_ontario(
     sale_price: float,
     purchase_price: float,
     selling_costs: float,
-    marginal_tax_rate: float
+    marginal_tax_rate: float,
+    inclusion_tiers=CAPITAL_GAINS_INCLUSION_TIERS
 ) -> float:
     """
     Calculate capital gains tax in Ontario, Canada.
@@ -69,36 +123,26 @@ def calculate_capital_gains_tax_ontario(
     
     For corporations/trusts: 66.67% inclusion rate applies to all gains.
     
-    This function uses a simplified 50% inclusion rate for all gains.
-    For more accurate calculations with the new rules, consider tracking annual gains.
+    The tiers are configurable (see CAPITAL_GAINS_INCLUSION_TIERS).
     
     Args:
         sale_price: Sale price of the property
         purchase_price: Original purchase price
         selling_costs: Total selling costs (fees)
         marginal_tax_rate: Marginal tax rate (as decimal, e.g., 0.30 for 30%)
+        inclusion_tiers: Inclusion rate tiers (see calculate_taxable_capital_gain)
     
     Returns:
         Capital gains tax amount
     """
     # Calculate capital gain
-    sp = Decimal(str(sale_price))
-    pp = Decimal(str(purchase_price))
-    sc = Decimal(str(selling_costs))
-    capital_gain = sp - pp - sc
+    capital_gain = sale_price - purchase_price - selling_costs
     
     if capital_gain <= 0:
-        return 0.0
+        return zero_like(capital_gain)
     
-    # Simplified: 50% of capital gain is taxable (applies to first $250k for individuals)
-    # Note: For gains over $250k, the inclusion rate is 66.67%, but this calculator
-    # uses 50% for simplicity. For accurate calculations, track annual gains separately.
-    taxable_capital_gain = capital_gain * Decimal('0.5')
-    
-    # Apply marginal tax rate
-    tax_owed = taxable_capital_gain * Decimal(str(marginal_tax_rate))
-    
-    return float(tax_owed)
+    # Apply marginal tax rate to the taxable part of the gain
+    return calculate_taxable_capital_gain(capital_gain, inclusion_tiers) * marginal_tax_rate
 
 
 def calculate_sale_income(home_value: float, sales_fees: float, capital_gains_tax: float) -> float:
@@ -114,7 +158,7 @@ def calculate_sale_income(home_value: float, sales_fees: float, capital_gains_ta
     Returns:
         Sale income
     """
-    return float(Decimal(str(home_value)) - Decimal(str(sales_fees)) - Decimal(str(capital_gains_tax)))
+    return home_value - sales_fees - capital_gains_tax
 
 
 def calculate_sale_net(sale_income: float, principal_owing: float) -> float:
@@ -128,7 +172,63 @@ def calculate_sale_net(sale_income: float, principal_owing: float) -> float:
     Returns:
         Sale net
     """
-    return float(Decimal(str(sale_income)) - Decimal(str(principal_owing)))
+    return sale_income - principal_owing
+
+
+def calculate_home_value_curve(purchase_price, real_estate_market_increase, num_months: int) -> np.ndarray:
+    """
+    Calculate the home value at every month of a horizon at once (floats only).
+
+    Args:
+        purchase_price: Original purchase price (scalar or per-scenario column-broadcastable array)
+        real_estate_market_increase: Annual market increase rate (as decimal)
+        num_months: Number of months covered
+
+    Returns:
+        Array of home values for months 0..num_months, with the month axis last
+    """
+    months = np.arange(num_months + 1, dtype=np.float64)
+    return purchase_price * np.exp(months * np.log1p(real_estate_market_increase / 12))
+
+
+def calculate_sale_metrics(
+    home_value,
+    purchase_price,
+    commission_percentage,
+    marginal_tax_rate,
+    principal_owing,
+    inclusion_tiers=CAPITAL_GAINS_INCLUSION_TIERS
+) -> dict:
+    """
+    Calculate the sale-side column block in one pass.
+
+    Works element-wise on arrays (every month of a horizon at once) as well
+    as on single float or Decimal values.
+
+    Args:
+        home_value: Home value(s), e.g. from calculate_home_value_curve
+        purchase_price: Original purchase price
+        commission_percentage: Commission percentage (as decimal)
+        marginal_tax_rate: Marginal tax rate (as decimal)
+        principal_owing: Principal remaining on mortgage
+        inclusion_tiers: Capital gains inclusion rate tiers
+
+    Returns:
+        Dictionary with home_value, sales_fees, capital_gains_tax,
+        sale_income and sale_net
+    """
+    sales_fees = home_value * commission_percentage
+    capital_gains_tax = calculate_taxable_capital_gain(
+        home_value - purchase_price - sales_fees, inclusion_tiers
+    ) * marginal_tax_rate
+    sale_income = home_value - sales_fees - capital_gains_tax
+    return {
+        'home_value': home_value,
+        'sales_fees': sales_fees,
+        'capital_gains_tax': capital_gains_tax,
+        'sale_income': sale_income,
+        'sale_net': sale_income - principal_owing,
+    }
 
 
 def calculate_net_return(sale_net: float, cumulative_investment: float) -> float:
@@ -142,7 +242,7 @@ def calculate_net_return(sale_net: float, cumulative_investment: float) -> float
     Returns:
         Net return
     """
-    return float(Decimal(str(sale_net)) - Decimal(str(cumulative_investment)))
+    return sale_net - cumulative_investment
 
 
 def calculate_net_return_new(sale_net: float, downpayment: float, cumulative_net_profit: float) -> float:
@@ -159,16 +259,12 @@ def calculate_net_return_new(sale_net: float, downpayment: float, cumulative_net
     Returns:
         Net return (profit from sale + profits already received)
     """
-    sn = Decimal(str(sale_net))
-    dp = Decimal(str(downpayment))
-    cnp = Decimal(str(cumulative_net_profit))
-    
     # Profit from sale = sale_net - downpayment
     # Add any profits already received (if cumulative net profit is positive)
-    profit_from_sale = sn - dp
-    profits_received = max(Decimal('0'), cnp)
-    
-    return float(profit_from_sale + profits_received)
+    profit_from_sale = sale_net - downpayment
+    if cumulative_net_profit > 0:
+        return profit_from_sale + cumulative_net_profit
+    return profit_from_sale
 
 
 def calculate_return_percent(net_return: float, cumulative_investment: float) -> float:
@@ -182,11 +278,10 @@ def calculate_return_percent(net_return: float, cumulative_investment: float) ->
     Returns:
         Return percentage (as decimal, multiply by 100 for percentage)
     """
-    ci = Decimal(str(cumulative_investment))
-    if ci <= 0:
-        return 0.0
+    if cumulative_investment <= 0:
+        return zero_like(net_return)
     
-    return float(Decimal(str(net_return)) / ci)
+    return net_return / cumulative_investment
 
 
 def calculate_return_comparison(cumulative_expected_return: float, net_return: float) -> float:
@@ -201,9 +296,8 @@ def calculate_return_comparison(cumulative_expected_return: float, net_return: f
     Returns:
         Return comparison ratio (net_return / cumulative_expected_return)
     """
-    cer = Decimal(str(cumulative_expected_return))
-    if cer == 0:
-        return 0.0
+    if cumulative_expected_return == 0:
+        return zero_like(net_return)
     
-    return float(Decimal(str(net_return)) / cer)
+    return net_return / cumulative_expected_return
 
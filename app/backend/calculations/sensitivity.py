@@ -0,0 +1,111 @@
+"""
+Sensitivity (tornado) analysis.
+Measures how much summary metrics move when each scenario input is moved
+down and up around a base case. The base case and every bumped case are
+stacked as one batch of scenarios and projected in a single vectorized run
+instead of one projection per case.
+
+For each input the low and high outcomes give the tornado bar, their
+central difference gives the partial derivative of the metric with respect
+to the input, and inputs are ranked by the width of their bar (the swing).
+"""
+
+import numpy as np
+
+from app.backend.calculations.parameters import NUMERIC_FIELDS
+from app.backend.calculations.projection import COLUMNS, calculate_projection
+from app.backend.calculations.sweep import summarize_projection
+
+# Inputs that can be bumped and metrics whose sensitivity can be measured
+SENSITIVITY_FIELDS = NUMERIC_FIELDS
+SENSITIVITY_METRICS = tuple(name for name in COLUMNS if name not in ('month', 'year'))
+
+# Default relative bump applied to each input (10% -> base * 0.9 and base * 1.1)
+DEFAULT_BUMP = 0.1
+
+
+def calculate_case_metrics(params: dict, bumps: dict, num_years: int, metrics) -> tuple:
+    """
+    Evaluate metrics for the base case and every bumped case in one batch.
+
+    Args:
+        params: Normalized float base scenario inputs
+        bumps: Ordered mapping of input name to its (low, high) normalized values
+        num_years: Year at which metrics are read (also the projection horizon)
+        metrics: Names from SENSITIVITY_METRICS
+
+    Returns:
+        Tuple of (base, low, high): base maps each metric to its base value,
+        low and high map each metric to an array with one value per bumped
+        input, in bumps order
+    """
+    num_fields = len(bumps)
+    num_cases = 1 + 2 * num_fields
+    stacked = dict(params)
+    # Case 0 is the base; cases 2i+1 and 2i+2 bump only the i-th input
+    for index, (name, (low, high)) in enumerate(bumps.items()):
+        values = np.full(num_cases, params[name])
+        values[2 * index + 1] = low
+        values[2 * index + 2] = high
+        stacked[name] = values
+
+    if num_fields:
+        columns = calculate_projection(stacked, num_years, names=metrics)
+    else:
+        columns = {name: column[None] for name, column in
+                   calculate_projection(params, num_years, names=metrics).items()}
+    summary = summarize_projection(columns, metrics, int(num_years) * 12)
+    # An undefined base value (NaN, e.g. an IRR without a root) is reported as None
+    base = {metric: float(values[0]) if not np.isnan(values[0]) else None for metric, values in summary.items()}
+    low = {metric: values[1::2] for metric, values in summary.items()}
+    high = {metric: values[2::2] for metric, values in summary.items()}
+    return base, low, high
+
+
+def rank_sensitivities(base_value: float, bumps: dict, low, high) -> list:
+    """
+    Rank inputs by how far they move one metric.
+
+    Args:
+        base_value: Metric value in the base case (None if undefined)
+        bumps: Ordered mapping of input name to its (low, high) normalized values
+        low: Metric values with each input at its low value (bumps order)
+        high: Metric values with each input at its high value (bumps order)
+
+    Returns:
+        List of dictionaries sorted by descending swing, each with field,
+        low_input, high_input, low, high (None if undefined), swing
+        (|high - low|, 0 if either is undefined), share (swing over the sum
+        of all swings), derivative (change in the metric per unit of the
+        input, None if the input was not moved or an outcome is undefined) and elasticity
+        (relative change in the metric per relative change in the input,
+        None where undefined)
+    """
+    swings = np.abs(np.asarray(high, dtype=np.float64) - np.asarray(low, dtype=np.float64))
+    # Inputs whose low or high outcome is undefined (NaN) get no bar
+    defined = ~np.isnan(swings)
+    swings = np.where(defined, swings, 0.0)
+    total_swing = float(swings.sum())
+    ranked = []
+    for index, (name, (low_input, high_input)) in enumerate(bumps.items()):
+        low_value = float(low[index]) if not np.isnan(low[index]) else None
+        high_value = float(high[index]) if not np.isnan(high[index]) else None
+        step = high_input - low_input
+        derivative = (high_value - low_value) / step if step and defined[index] else None
+        center = (high_input + low_input) / 2
+        elasticity = None
+        if derivative is not None and base_value:
+            elasticity = derivative * center / base_value
+        ranked.append({
+            'field': name,
+            'low_input': low_input,
+            'high_input': high_input,
+            'low': low_value,
+            'high': high_value,
+            'swing': float(swings[index]),
+            'share': float(swings[index]) / total_swing if total_swing else 0.0,
+            'derivative': derivative,
+            'elasticity': elasticity,
+        })
+    ranked.sort(key=lambda entry: entry['swing'], reverse=True)
+    return ranked
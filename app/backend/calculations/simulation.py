@@ -0,0 +1,226 @@
+"""
+Monte Carlo simulation utilities.
+Draws stochastic monthly paths for home appreciation, rent growth and the
+mortgage rate, runs them through the projection engine in vectorized chunks
+spread over a process pool, and streams the results into bounded-size
+quantile summaries so no individual path is kept in memory.
+
+Path model (z are independent unit-variance draws):
+- appreciation: the annual rate for each month is mean + volatility * sqrt(12) * z,
+  i.e. a monthly random walk of the home value with annual volatility
+- rent growth: one draw per year, mean + volatility * z
+- mortgage rate: a monthly random walk starting at the input rate,
+  mean + volatility * sum(z) / sqrt(12), floored at 0
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.backend.calculations.projection import calculate_projection
+
+SIMULATED_RATES = ('real_estate_market_increase', 'rental_increase', 'interest_rate')
+SIMULATION_METRICS = ('net_return', 'home_value', 'sale_net')
+DISTRIBUTIONS = ('normal', 'student_t')
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Upper bound on paths * months projected at once in a single chunk
+CHUNK_ELEMENTS = 1 << 18
+
+_executors = {}
+
+
+class QuantileSketch:
+    """
+    Mergeable, bounded-size summary of per-month distributions.
+
+    Holds at most `capacity` weighted points per month. Adding or merging
+    more points sorts each month and compresses it back to `capacity`
+    evenly spaced quantiles, so memory does not grow with the number of paths.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.values = None
+        self.weights = None
+
+    def add(self, samples: np.ndarray):
+        """Add a block of paths with shape (num_paths, num_months)."""
+        num_paths = samples.shape[0]
+        values = np.sort(samples.T, axis=-1)
+        if num_paths > self.capacity:
+            # One sort per month is much cheaper than np.quantile's multi-kth partition
+            positions = ((np.arange(self.capacity) + 0.5) * num_paths / self.capacity).astype(np.intp)
+            values = values[:, positions]
+            weights = np.full(values.shape, num_paths / self.capacity)
+        else:
+            weights = np.ones(values.shape)
+        self._combine(values, weights)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch over the same months into this one."""
+        if other.values is not None:
+            self._combine(other.values, other.weights)
+
+    def quantiles(self, probabilities) -> np.ndarray:
+        """
+        Estimate quantiles for every month.
+
+        Args:
+            probabilities: Sequence of probabilities in [0, 1]
+
+        Returns:
+            Array with shape (len(probabilities), num_months)
+        """
+        return self._weighted_quantiles(np.asarray(probabilities, dtype=np.float64)).T
+
+    def _combine(self, values: np.ndarray, weights: np.ndarray):
+        if self.values is not None:
+            values = np.concatenate([self.values, values], axis=-1)
+            weights = np.concatenate([self.weights, weights], axis=-1)
+        order = np.argsort(values, axis=-1, kind='stable')
+        self.values = np.take_along_axis(values, order, axis=-1)
+        self.weights = np.take_along_axis(weights, order, axis=-1)
+        if self.values.shape[-1] > self.capacity:
+            total = self.weights.sum(axis=-1, keepdims=True)
+            probabilities = (np.arange(self.capacity) + 0.5) / self.capacity
+            self.values = self._weighted_quantiles(probabilities)
+            self.weights = np.broadcast_to(total / self.capacity, self.values.shape).copy()
+
+    def _weighted_quantiles(self, probabilities: np.ndarray) -> np.ndarray:
+        """Return (num_months, len(probabilities)) quantiles of the weighted points."""
+        num_months, num_points = self.values.shape
+        cumulative = np.cumsum(self.weights, axis=-1)
+        total = cumulative[:, -1:]
+        # Offset every month into its own interval so one searchsorted covers all rows
+        offsets = np.arange(num_months)[:, None] * 2.0
+        flat_cumulative = (cumulative / total + offsets).ravel()
+        targets = (np.clip(probabilities, 0.0, 1.0)[None, :] + offsets).ravel()
+        positions = np.searchsorted(flat_cumulative, targets, side='left')
+        rows = np.repeat(np.arange(num_months), probabilities.size)
+        columns = np.clip(positions - rows * num_points, 0, num_points - 1)
+        return self.values[rows, columns].reshape(num_months, probabilities.size)
+
+
+def _draw(rng: np.random.Generator, distribution: str, degrees_of_freedom: float, shape: tuple) -> np.ndarray:
+    """Draw unit-variance shocks from the configured distribution."""
+    if distribution == 'student_t':
+        return rng.standard_t(degrees_of_freedom, shape) * np.sqrt((degrees_of_freedom - 2) / degrees_of_freedom)
+    return rng.standard_normal(shape)
+
+
+def generate_rate_paths(rng: np.random.Generator, params: dict, config: dict,
+                        num_paths: int, num_years: int) -> dict:
+    """
+    Draw stochastic rate paths for the projection engine.
+
+    Args:
+        rng: Random generator for this block of paths
+        params: Normalized float scenario inputs (means of the paths)
+        config: Simulation settings with 'volatility' (annual, as decimals, per
+            name in SIMULATED_RATES), 'distribution' and 'degrees_of_freedom'
+        num_paths: Number of paths to draw
+        num_years: Projection horizon in years
+
+    Returns:
+        rate_paths dictionary for calculate_projection; rates with zero
+        volatility are left out so they stay constant
+    """
+    num_months = num_years * 12
+    volatility = config['volatility']
+    distribution = config['distribution']
+    degrees_of_freedom = config['degrees_of_freedom']
+    paths = {}
+
+    sigma = volatility.get('real_estate_market_increase', 0.0)
+    if sigma:
+        shocks = _draw(rng, distribution, degrees_of_freedom, (num_paths, num_months))
+        paths['real_estate_market_increase'] = params['real_estate_market_increase'] + sigma * np.sqrt(12) * shocks
+
+    sigma = volatility.get('rental_increase', 0.0)
+    if sigma:
+        shocks = _draw(rng, distribution, degrees_of_freedom, (num_paths, num_years))
+        paths['rental_increase'] = params['rental_increase'] + sigma * shocks
+
+    sigma = volatility.get('interest_rate', 0.0)
+    if sigma:
+        shocks = _draw(rng, distribution, degrees_of_freedom, (num_paths, num_months))
+        walk = np.cumsum(shocks, axis=-1) - shocks[:, :1]  # first month uses the input rate
+        paths['interest_rate'] = np.maximum(params['interest_rate'] + sigma * walk / np.sqrt(12), 0.0)
+
+    return paths
+
+
+def _simulate_chunk(task: tuple) -> dict:
+    """Project one block of paths and summarize it (runs in a worker process)."""
+    params, num_years, config, num_paths, seed, metrics, capacity = task
+    rng = np.random.default_rng(seed)
+    rate_paths = generate_rate_paths(rng, params, config, num_paths, num_years)
+    if not rate_paths:
+        rate_paths = {'real_estate_market_increase': np.full((num_paths, num_years * 12),
+                                                             params['real_estate_market_increase'])}
+    columns = calculate_projection(params, num_years, rate_paths=rate_paths, names=metrics)
+    sketches = {}
+    for metric in metrics:
+        sketches[metric] = QuantileSketch(capacity)
+        sketches[metric].add(np.asarray(columns[metric]))
+    return sketches
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool with the given number of workers, creating it on first use."""
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+
+def run_simulation(params: dict, num_years: int, config: dict, num_paths: int, seed: int = 0,
+                   metrics=SIMULATION_METRICS, percentiles=DEFAULT_PERCENTILES,
+                   workers: int = None, capacity: int = 256) -> dict:
+    """
+    Run a Monte Carlo simulation and return percentile bands over time.
+
+    Paths are split into chunks with independent random streams derived from
+    the seed, so results depend only on the seed and number of paths, not on
+    the number of workers. Chunk summaries are merged in chunk order as they
+    stream back from the pool.
+
+    Args:
+        params: Normalized float scenario inputs
+        num_years: Projection horizon in years
+        config: Simulation settings (see generate_rate_paths)
+        num_paths: Number of paths to simulate
+        seed: Seed for the random streams
+        metrics: Projection columns to summarize
+        percentiles: Percentiles (0-100) to report
+        workers: Worker processes (defaults to the CPU count; 1 runs inline)
+        capacity: Points kept per month in each quantile summary
+
+    Returns:
+        Dictionary mapping each metric to an array with shape
+        (len(percentiles), num_years * 12 + 1)
+    """
+    num_months = num_years * 12
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Chunking depends only on the horizon so the random streams do not depend on workers
+    chunk_paths = max(1, CHUNK_ELEMENTS // (num_months + 1))
+    chunk_sizes = [min(chunk_paths, num_paths - start) for start in range(0, num_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [
+        (params, num_years, config, size, chunk_seed, tuple(metrics), capacity)
+        for size, chunk_seed in zip(chunk_sizes, seeds)
+    ]
+
+    if workers == 1 or len(tasks) == 1:
+        chunk_results = map(_simulate_chunk, tasks)
+    else:
+        chunk_results = _get_executor(workers).map(_simulate_chunk, tasks)
+
+    totals = {metric: QuantileSketch(capacity) for metric in metrics}
+    for sketches in chunk_results:
+        for metric, sketch in sketches.items():
+            totals[metric].merge(sketch)
+
+    probabilities = np.asarray(percentiles, dtype=np.float64) / 100
+    return {metric: sketch.quantiles(probabilities) for metric, sketch in totals.items()}
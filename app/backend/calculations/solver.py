@@ -0,0 +1,178 @@
+"""
+Goal-seek solver.
+Finds the value of one scenario input that makes a projection metric reach a
+target value at a given month (e.g. the monthly rent giving a
+return_comparison of 1 at year 10), with Brent's bracketed root finder.
+
+Every evaluation projects only up to the target month and only the columns
+the metric depends on (see projection.calculate_partial_projection). The
+search never leaves the range the field accepts (parameters.FIELD_BOUNDS).
+"""
+
+import math
+
+from app.backend.calculations.parameters import FIELD_BOUNDS, INTEGER_FIELDS, NUMERIC_FIELDS, PERCENT_FIELDS
+from app.backend.calculations.projection import COLUMNS, calculate_partial_projection
+
+# Inputs that can be solved for (continuous numeric inputs) and metrics that can be targeted
+SOLVABLE_FIELDS = tuple(name for name in NUMERIC_FIELDS if name not in INTEGER_FIELDS)
+SOLVABLE_METRICS = tuple(name for name in COLUMNS if name not in ('month', 'year'))
+
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_MAX_ITERATIONS = 100
+# Times the upper bound may double while looking for a bracket when none is given
+MAX_BRACKET_EXPANSIONS = 60
+
+
+class UndefinedMetricError(ValueError):
+    """Raised when the metric is not a finite number for some input in the search range."""
+
+
+def _request_scale(field: str) -> int:
+    """Return the factor from a normalized input to its request units (100 for percentages)."""
+    return 100 if field in PERCENT_FIELDS else 1
+
+
+def field_bounds(field: str) -> tuple:
+    """Return the (low, high) values a field accepts, normalized like the projection inputs."""
+    low, high = FIELD_BOUNDS[field]
+    return low / _request_scale(field), high / _request_scale(field)
+
+
+def calculate_metric_at(params: dict, metric: str, month: int) -> float:
+    """Project one metric up to a month and return its value at that month."""
+    return float(calculate_partial_projection(params, month, (metric,))[metric][month])
+
+
+def _expand_bracket(objective, lower: float, f_lower: float, upper: float, limit: float):
+    """
+    Double the upper bound, up to limit, until the objective changes sign.
+
+    Returns:
+        Tuple of (upper, objective at upper, evaluations)
+    """
+    evaluations = 0
+    for _ in range(MAX_BRACKET_EXPANSIONS):
+        f_upper = objective(upper)
+        evaluations += 1
+        if f_upper == 0 or (f_upper > 0) != (f_lower > 0) or upper >= limit:
+            return upper, f_upper, evaluations
+        upper = min(lower + (upper - lower) * 2, limit)
+    return upper, f_upper, evaluations
+
+
+def _brent(objective, a: float, b: float, fa: float, fb: float, tolerance: float, max_iterations: int):
+    """
+    Brent's method on a bracket [a, b] with objective values of opposite signs.
+
+    Returns:
+        Tuple of (root, objective at root, iterations, converged)
+    """
+    if fa == 0:
+        return a, fa, 0, True
+    c, fc = b, fb
+    d = e = b - a
+    for iteration in range(1, max_iterations + 1):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * 2.2e-16 * abs(b) + 0.5 * tolerance
+        midpoint = 0.5 * (c - b)
+        if abs(midpoint) <= tol or fb == 0:
+            return b, fb, iteration - 1, True
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation, or the secant step with only two points
+            s = fb / fa
+            if a == c:
+                p = 2 * midpoint * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * midpoint * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * midpoint * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = midpoint
+        else:
+            d = e = midpoint
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, midpoint)
+        fb = objective(b)
+    return b, fb, max_iterations, False
+
+
+def solve_input(params: dict, field: str, metric: str, month: int, target: float,
+                lower: float = None, upper: float = None, tolerance: float = DEFAULT_TOLERANCE,
+                max_iterations: int = DEFAULT_MAX_ITERATIONS) -> dict:
+    """
+    Solve for the input value at which a metric reaches a target.
+
+    Args:
+        params: Normalized float scenario inputs (see calculate_projection)
+        field: Input to solve for, from SOLVABLE_FIELDS (normalized units,
+            e.g. rates as decimals)
+        metric: Column from SOLVABLE_METRICS
+        month: Month at which the metric is read (1 or more)
+        target: Value the metric should reach
+        lower: Lower end of the search bracket, or None for 0 (or the lowest
+            value the field accepts, if higher or if upper is not positive)
+        upper: Upper end of the search bracket, or None to double an initial
+            guess (twice the current value, at least lower + 1) until the
+            target is bracketed, up to the highest value the field accepts
+        tolerance: Absolute tolerance on the solved input
+        max_iterations: Largest number of root finder iterations
+
+    Returns:
+        Dictionary with value (the solved input), metric_value (the metric
+        at that value), iterations, evaluations (projections run, including
+        bracketing) and converged
+
+    Raises:
+        ValueError: If the bracket is outside the range the field accepts, or
+            the target is not reached anywhere in the bracket
+        UndefinedMetricError: If the metric is not finite at a value tried
+    """
+    low, high = field_bounds(field)
+
+    def objective(value):
+        residual = calculate_metric_at(dict(params, **{field: value}), metric, month) - target
+        if not math.isfinite(residual):
+            raise UndefinedMetricError(f'{metric} is not a finite number at month {month} '
+                                       f'for {field} = {value * _request_scale(field):g}')
+        return residual
+
+    if lower is None:
+        lower = max(low, 0.0) if upper is None or upper > 0 else low
+    if not low <= lower <= high or (upper is not None and not lower < upper <= high):
+        raise ValueError(f'the search range for {field} must lie between {FIELD_BOUNDS[field][0]:,} '
+                         f'and {FIELD_BOUNDS[field][1]:,}')
+    f_lower = objective(lower)
+    evaluations = 1
+    if upper is None:
+        upper = min(max(2 * abs(float(params[field])), lower + 1), high)
+        upper, f_upper, expansions = _expand_bracket(objective, lower, f_lower, upper, high)
+        evaluations += expansions
+    else:
+        f_upper = objective(upper)
+        evaluations += 1
+    if f_lower != 0 and f_upper != 0 and (f_lower > 0) == (f_upper > 0):
+        raise ValueError(f'{metric} does not reach {target:g} at month {month} for any {field} '
+                         f'in the search range')
+
+    value, residual, iterations, converged = _brent(objective, lower, upper, f_lower, f_upper,
+                                                    tolerance, max_iterations)
+    return {
+        'value': value,
+        'metric_value': residual + target,
+        'iterations': iterations,
+        'evaluations': evaluations + iterations,
+        'converged': converged,
+    }
@@ -0,0 +1,82 @@
+"""
+Parameter sweep utilities.
+Evaluates summary metrics over a Cartesian grid of scenario inputs with the
+vectorized projection engine, one chunk of grid cells at a time.
+"""
+
+import numpy as np
+
+from app.backend.calculations.projection import COLUMNS, calculate_projection
+
+# Metrics computed from the whole horizon rather than read at one month
+BREAK_EVEN_MONTH = 'break_even_month'
+SUMMARY_METRICS = tuple(name for name in COLUMNS if name not in ('month', 'year')) + (BREAK_EVEN_MONTH,)
+
+# Upper bound on grid cells * months held in memory per projection chunk
+CHUNK_ELEMENTS = 1 << 17
+
+
+def summarize_projection(columns: dict, metrics, month: int) -> dict:
+    """
+    Reduce projection columns to summary metrics.
+
+    Args:
+        columns: Projection columns with the month axis last
+        metrics: Names from SUMMARY_METRICS
+        month: Month at which column metrics are read
+
+    Returns:
+        Dictionary mapping each metric to an array over the leading axes.
+        'break_even_month' is the first month with a non-negative net_return
+        up to the given month, or -1 if it is never reached.
+    """
+    summary = {}
+    for metric in metrics:
+        if metric == BREAK_EVEN_MONTH:
+            reached = columns['net_return'][..., :month + 1] >= 0
+            summary[metric] = np.where(reached.any(axis=-1), reached.argmax(axis=-1), -1)
+        else:
+            summary[metric] = columns[metric][..., month]
+    return summary
+
+
+def calculate_grid_metrics(params: dict, axes: dict, num_years: int, metrics) -> dict:
+    """
+    Evaluate summary metrics for every cell of a Cartesian input grid.
+
+    Args:
+        params: Normalized float scenario inputs shared by every cell
+        axes: Ordered mapping of input name to a 1-D array of normalized values
+        num_years: Year at which metrics are read (also the projection horizon)
+        metrics: Names from SUMMARY_METRICS
+
+    Returns:
+        Dictionary mapping each metric to an array shaped like the grid
+        (one dimension per axis, in axes order)
+    """
+    names = list(axes)
+    values = [np.asarray(axes[name]) for name in names]
+    shape = tuple(len(axis) for axis in values)
+    num_cells = int(np.prod(shape))
+    num_months = int(num_years) * 12
+    chunk_size = max(1, CHUNK_ELEMENTS // (num_months + 1))
+
+    # Grid position of every cell along each axis, in row-major order
+    positions = np.indices(shape).reshape(len(shape), num_cells)
+    results = {metric: None for metric in metrics}
+    # Only the columns the metrics are read from
+    column_names = {'net_return' if metric == BREAK_EVEN_MONTH else metric for metric in metrics}
+
+    for start in range(0, num_cells, chunk_size):
+        stop = min(start + chunk_size, num_cells)
+        chunk_params = dict(params)
+        for axis, name in enumerate(names):
+            chunk_params[name] = values[axis][positions[axis, start:stop]]
+        columns = calculate_projection(chunk_params, num_years, names=column_names)
+        summary = summarize_projection(columns, metrics, num_months)
+        for metric, chunk in summary.items():
+            if results[metric] is None:
+                results[metric] = np.empty(num_cells, dtype=chunk.dtype)
+            results[metric][start:stop] = chunk
+
+    return {metric: values.reshape(shape) for metric, values in results.items()}
@@ -0,0 +1,71 @@
+"""
+Stage timing hooks.
+Splits the time spent handling a request into consecutive named stages
+(parsing, amortization, cash flows, sale metrics, serialization, ...).
+
+Code marks the end of each stage with mark(name): the time since the
+previous mark (or since recording started) is added to that stage, so the
+stages of a request add up to its total time. Marks only count while a
+recorder is active in the current context (see start_recording); otherwise
+mark() is a single context variable lookup, so calculation code can call it
+unconditionally.
+"""
+
+import time
+from contextvars import ContextVar
+
+_recorder = ContextVar('stage_recorder', default=None)
+
+
+class StageRecorder:
+    """Accumulated seconds per stage, in the order stages were first marked."""
+
+    __slots__ = ('started', 'last', 'stages')
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.stages = {}
+
+    def mark(self, name: str):
+        """End the current stage under the given name."""
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self.last)
+        self.last = now
+
+    def elapsed(self) -> float:
+        """Seconds since recording started."""
+        return time.perf_counter() - self.started
+
+
+def start_recording() -> tuple:
+    """
+    Start recording stages in the current context.
+
+    Returns:
+        Tuple of (recorder, token); pass the token to stop_recording
+    """
+    recorder = StageRecorder()
+    return recorder, _recorder.set(recorder)
+
+
+def resume_recording(recorder: StageRecorder):
+    """
+    Make an existing recorder active in the current context again, e.g. while
+    a streamed response body is generated after its request has finished.
+
+    Returns:
+        Token to pass to stop_recording
+    """
+    return _recorder.set(recorder)
+
+
+def stop_recording(token):
+    """Stop the recording started with the given token."""
+    _recorder.reset(token)
+
+
+def mark(name: str):
+    """End the current stage under the given name (no-op when not recording)."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.mark(name)
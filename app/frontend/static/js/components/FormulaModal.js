@@ -845,7 +845,9 @@ export class FormulaModal {
             'sale_net': 'Sale Net',
             'net_return': 'Net Return',
             'return_percent': 'Return %',
-            'return_comparison': 'Return Comparison'
+            'return_comparison': 'Return Comparison',
+            'irr': 'IRR %',
+            'npv': 'NPV'
         };
         
         const columnDisplayName = keyToNameMap[columnKey] || label;
@@ -1238,7 +1240,10 @@ export class FormulaModal {
             'net_return': 'net_return',
             'return_percent': 'return_percent',
             'return_%': 'return_percent',
-            'return_comparison': 'return_comparison'
+            'return_comparison': 'return_comparison',
+            'irr_%': 'irr',
+            'irr': 'irr',
+            'npv': 'npv'
         };
         columnKey = nameToKeyMap[columnKey] || columnKey;
 
@@ -2444,12 +2449,14 @@ export class FormulaModal {
             }
 
             case 'capital_gains_tax': {
-                // Capital Gains Tax = (Sale Price - Purchase Price - Selling Costs) × 0.5 × Marginal Tax Rate
+                // Capital Gains Tax = Taxable Capital Gain × Marginal Tax Rate, where
+                // 50% of the gain up to $250k and 66.67% of the gain above it is taxable
                 const salePrice = data.home_value || 0;
                 const purchasePrice = inputValues.get('purchase_price') || 0;
                 const sellingCosts = data.sales_fees || 0;
                 const capitalGain = salePrice - purchasePrice - sellingCosts;
-                const taxableGain = capitalGain * 0.5;
+                const taxableGain = Math.max(Math.min(capitalGain, 250000), 0) * 0.5
+                    + Math.max(capitalGain - 250000, 0) * 2 / 3;
                 const marginalRate = (inputValues.get('marginal_tax_rate') || 0) / 100;
                 const capitalGainsTax = taxableGain * marginalRate;
                 
@@ -2460,7 +2467,9 @@ export class FormulaModal {
                     { type: 'value', value: formatCurrency(purchasePrice), label: 'Purchase Price', source: 'Input' },
                     { type: 'operator', value: '−' },
                     { type: 'value', value: formatCurrency(sellingCosts), label: 'Selling Costs', source: 'Sales Fees column' },
-                    { type: 'text', value: ') × 0.5 × ' },
+                    { type: 'text', value: ') → taxable ' },
+                    { type: 'value', value: formatCurrency(taxableGain), label: 'Taxable Capital Gain', source: '50% up to $250k, 66.67% above' },
+                    { type: 'operator', value: '×' },
                     { type: 'value', value: formatPercent(marginalRate), label: 'Marginal Tax Rate', source: 'Input' },
                     { type: 'equals', value: '=' },
                     { type: 'text', value: formatCurrency(capitalGainsTax) }
@@ -2507,6 +2516,17 @@ export class FormulaModal {
                 break;
             }
 
+            case 'irr': {
+                // IRR is solved numerically by the backend; show the solved rate
+                // (null when no rate solves the month's cash flows)
+                const irr = data.irr === null || data.irr === undefined ? 'N/A' : `${data.irr.toFixed(2)}%`;
+                breakdown.expression = [
+                    { type: 'text', value: irr }
+                ];
+                breakdown.result = irr;
+                break;
+            }
+
             default:
                 breakdown.expression = [
                     { type: 'text', value: formatCurrency(data[columnKey] || 0) }
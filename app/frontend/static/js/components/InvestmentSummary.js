@@ -3,6 +3,7 @@
  */
 import { FormulaModal } from './FormulaModal.js';
 import { COLUMN_DEFINITIONS } from './sidebar/ColumnInfo.js';
+import { toRows } from '../utils/results.js';
 
 export class InvestmentSummary {
     constructor(container, performanceContainer) {
@@ -65,6 +66,7 @@ export class InvestmentSummary {
     }
 
     updateSummary(results, inputValues, scenarioNumber = null) {
+        results = toRows(results);
         if (!results || results.length === 0) {
             this.showPlaceholder();
             return;
@@ -320,6 +322,9 @@ export class InvestmentSummary {
             return;
         }
 
+        // Summary metrics read individual months, so work on row views of the results
+        scenariosData = scenariosData.map(scenario => ({ ...scenario, results: toRows(scenario.results) }));
+
         // Build performance rows for each scenario
         const rowsHTML = scenariosData.map((scenario, index) => {
             const { results, inputValues } = scenario;
@@ -41,7 +41,7 @@ export class CrossScenarioChart {
         this.selectedLeftColumns = new Set();
         this.selectedRightColumns = new Set();
         this.selectedScenarios = new Set();
-        this.scenarioData = new Map(); // Map of scenario index to { results, inputValues }
+        this.scenarioData = new Map(); // Map of scenario index to { results, yearly, inputValues }
         this.scenarioNames = new Map(); // Map of scenario index to name
         
         // Load saved selections from localStorage
@@ -713,13 +713,9 @@ export class CrossScenarioChart {
         // Collect all unique years from all selected scenarios
         this.selectedScenarios.forEach(scenarioIndex => {
             const data = this.scenarioData.get(scenarioIndex);
-            if (data && data.results) {
-                data.results.forEach(result => {
-                    // Skip month 0
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    allYears.add(year);
-                });
+            if (data && data.yearly) {
+                // Yearly rollups start with month 0, then one entry per year
+                data.yearly.year.slice(1).forEach(year => allYears.add(year));
             }
         });
         
@@ -731,7 +727,7 @@ export class CrossScenarioChart {
         this.selectedLeftColumns.forEach((column) => {
             this.selectedScenarios.forEach((scenarioIndex) => {
                 const data = this.scenarioData.get(scenarioIndex);
-                if (!data || !data.results) return;
+                if (!data || !data.yearly) return;
                 
                 const scenarioName = this.scenarioNames.get(scenarioIndex) || `Scenario ${scenarioIndex + 1}`;
                 // Use a combination of scenario and column to ensure unique colors
@@ -739,21 +735,14 @@ export class CrossScenarioChart {
                 const baseColor = leftAxisColors[colorIndex];
                 leftDatasetIndex++;
                 
-                // Group results by year and use the last month of each year
-                const yearData = new Map();
-                data.results.forEach(result => {
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    // Keep the last month's data for each year
-                    if (!yearData.has(year) || result.month > yearData.get(year).month) {
-                        yearData.set(year, result);
-                    }
-                });
+                // Server-side yearly rollups: flows summed over each year, balances at year end
+                const values = data.yearly[column];
+                const yearIndex = new Map(data.yearly.year.map((year, index) => [year, index]));
                 
                 // Create data points for this column and scenario
                 const dataPoints = sortedYears.map(year => {
-                    const result = yearData.get(year);
-                    return result ? (result[column] !== undefined ? result[column] : null) : null;
+                    const index = yearIndex.get(year);
+                    return values && index !== undefined ? values[index] : null;
                 });
                 
                 datasets.push({
@@ -776,7 +765,7 @@ export class CrossScenarioChart {
         this.selectedRightColumns.forEach((column) => {
             this.selectedScenarios.forEach((scenarioIndex) => {
                 const data = this.scenarioData.get(scenarioIndex);
-                if (!data || !data.results) return;
+                if (!data || !data.yearly) return;
                 
                 const scenarioName = this.scenarioNames.get(scenarioIndex) || `Scenario ${scenarioIndex + 1}`;
                 // Use a combination of scenario and column to ensure unique colors
@@ -784,21 +773,14 @@ export class CrossScenarioChart {
                 const baseColor = rightAxisColors[colorIndex];
                 rightDatasetIndex++;
                 
-                // Group results by year and use the last month of each year
-                const yearData = new Map();
-                data.results.forEach(result => {
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    // Keep the last month's data for each year
-                    if (!yearData.has(year) || result.month > yearData.get(year).month) {
-                        yearData.set(year, result);
-                    }
-                });
+                // Server-side yearly rollups: flows summed over each year, balances at year end
+                const values = data.yearly[column];
+                const yearIndex = new Map(data.yearly.year.map((year, index) => [year, index]));
                 
                 // Create data points for this column and scenario
                 const dataPoints = sortedYears.map(year => {
-                    const result = yearData.get(year);
-                    return result ? (result[column] !== undefined ? result[column] : null) : null;
+                    const index = yearIndex.get(year);
+                    return values && index !== undefined ? values[index] : null;
                 });
                 
                 datasets.push({
@@ -972,13 +954,9 @@ export class CrossScenarioChart {
         // Collect all unique years from all selected scenarios
         this.selectedScenarios.forEach(scenarioIndex => {
             const data = this.scenarioData.get(scenarioIndex);
-            if (data && data.results) {
-                data.results.forEach(result => {
-                    // Skip month 0
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    allYears.add(year);
-                });
+            if (data && data.yearly) {
+                // Yearly rollups start with month 0, then one entry per year
+                data.yearly.year.slice(1).forEach(year => allYears.add(year));
             }
         });
         
@@ -990,7 +968,7 @@ export class CrossScenarioChart {
         this.selectedLeftColumns.forEach((column) => {
             this.selectedScenarios.forEach((scenarioIndex) => {
                 const data = this.scenarioData.get(scenarioIndex);
-                if (!data || !data.results) return;
+                if (!data || !data.yearly) return;
                 
                 const scenarioName = this.scenarioNames.get(scenarioIndex) || `Scenario ${scenarioIndex + 1}`;
                 // Use a combination of scenario and column to ensure unique colors
@@ -998,21 +976,14 @@ export class CrossScenarioChart {
                 const baseColor = leftAxisColors[colorIndex];
                 leftDatasetIndex++;
                 
-                // Group results by year and use the last month of each year
-                const yearData = new Map();
-                data.results.forEach(result => {
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    // Keep the last month's data for each year
-                    if (!yearData.has(year) || result.month > yearData.get(year).month) {
-                        yearData.set(year, result);
-                    }
-                });
+                // Server-side yearly rollups: flows summed over each year, balances at year end
+                const values = data.yearly[column];
+                const yearIndex = new Map(data.yearly.year.map((year, index) => [year, index]));
                 
                 // Create data points for this column and scenario
                 const dataPoints = sortedYears.map(year => {
-                    const result = yearData.get(year);
-                    return result ? (result[column] !== undefined ? result[column] : null) : null;
+                    const index = yearIndex.get(year);
+                    return values && index !== undefined ? values[index] : null;
                 });
                 
                 datasets.push({
@@ -1035,7 +1006,7 @@ export class CrossScenarioChart {
         this.selectedRightColumns.forEach((column) => {
             this.selectedScenarios.forEach((scenarioIndex) => {
                 const data = this.scenarioData.get(scenarioIndex);
-                if (!data || !data.results) return;
+                if (!data || !data.yearly) return;
                 
                 const scenarioName = this.scenarioNames.get(scenarioIndex) || `Scenario ${scenarioIndex + 1}`;
                 // Use a combination of scenario and column to ensure unique colors
@@ -1043,21 +1014,14 @@ export class CrossScenarioChart {
                 const baseColor = rightAxisColors[colorIndex];
                 rightDatasetIndex++;
                 
-                // Group results by year and use the last month of each year
-                const yearData = new Map();
-                data.results.forEach(result => {
-                    if (result.month === 0) return;
-                    const year = result.year || Math.floor(result.month / 12) + 1;
-                    // Keep the last month's data for each year
-                    if (!yearData.has(year) || result.month > yearData.get(year).month) {
-                        yearData.set(year, result);
-                    }
-                });
+                // Server-side yearly rollups: flows summed over each year, balances at year end
+                const values = data.yearly[column];
+                const yearIndex = new Map(data.yearly.year.map((year, index) => [year, index]));
                 
                 // Create data points for this column and scenario
                 const dataPoints = sortedYears.map(year => {
-                    const result = yearData.get(year);
-                    return result ? (result[column] !== undefined ? result[column] : null) : null;
+                    const index = yearIndex.get(year);
+                    return values && index !== undefined ? values[index] : null;
                 });
                 
                 datasets.push({
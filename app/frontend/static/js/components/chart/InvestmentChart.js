@@ -1,6 +1,8 @@
 /**
  * Chart component for displaying investment metrics over time.
  */
+import { getColumn } from '../../utils/results.js';
+
 export class InvestmentChart {
     constructor(parent) {
         this.chartData = {
@@ -182,21 +184,28 @@ export class InvestmentChart {
         // Calculate cumulative amounts
         let cumulativePrincipalPaid = 0;
         let cumulativeInterestPaid = 0;
-        results.forEach((result, index) => {
+        // Read the needed columns directly (rows or columnar results)
+        const months = getColumn(results, 'month');
+        const years = getColumn(results, 'year');
+        const principalRemaining = getColumn(results, 'principal_remaining');
+        const principalPaid = getColumn(results, 'principal_paid');
+        const interestPaid = getColumn(results, 'interest_paid');
+        const homeValue = getColumn(results, 'home_value');
+        months.forEach((month, index) => {
             // Create label - use year number
-            const label = `Year ${result.year || Math.floor(result.month / 12) + 1}`;
+            const label = `Year ${years[index] || Math.floor(month / 12) + 1}`;
             this.chartData.labels.push(label);
             // Amount owing = principal remaining
-            this.chartData.owing.push(result.principal_remaining);
+            this.chartData.owing.push(principalRemaining[index]);
             // Amount paid = cumulative total paid (principal + interest)
-            cumulativePrincipalPaid += result.principal_paid;
-            cumulativeInterestPaid += result.interest_paid;
+            cumulativePrincipalPaid += principalPaid[index];
+            cumulativeInterestPaid += interestPaid[index];
             const totalPaid = cumulativePrincipalPaid + cumulativeInterestPaid;
             this.chartData.paid.push(totalPaid);
             // Interest paid = cumulative interest paid
             this.chartData.interestPaid.push(cumulativeInterestPaid);
             // Home value = current market value
-            this.chartData.homeValue.push(result.home_value);
+            this.chartData.homeValue.push(homeValue[index]);
         });
         // Update chart if it exists
         if (this.chart) {
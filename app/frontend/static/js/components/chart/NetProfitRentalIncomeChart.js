@@ -1,6 +1,8 @@
 /**
  * Chart component for displaying rental gains and rental income comparison over time.
  */
+import { getColumn } from '../../utils/results.js';
+
 export class NetProfitRentalIncomeChart {
     constructor(parent) {
         this.chartData = {
@@ -184,22 +186,29 @@ export class NetProfitRentalIncomeChart {
         this.chartData.totalExpenses = [];
         this.chartData.taxesDue = [];
 
-        results.forEach((result, index) => {
+        // Read the needed columns directly (rows or columnar results)
+        const months = getColumn(results, 'month');
+        const years = getColumn(results, 'year');
+        const rentalGains = getColumn(results, 'rental_gains');
+        const rentalIncome = getColumn(results, 'rental_income');
+        const totalExpenses = getColumn(results, 'total_expenses');
+        const taxesDue = getColumn(results, 'taxes_due');
+        months.forEach((month, index) => {
             // Skip month 0
-            if (result.month === 0) {
+            if (month === 0) {
                 return;
             }
             // Create label - use year number
-            const label = `Year ${result.year || Math.floor(result.month / 12) + 1}`;
+            const label = `Year ${years[index] || Math.floor(month / 12) + 1}`;
             this.chartData.labels.push(label);
             // Rental Gains
-            this.chartData.netProfit.push(result.rental_gains);
+            this.chartData.netProfit.push(rentalGains[index]);
             // Rental Income
-            this.chartData.rentalIncome.push(result.rental_income);
+            this.chartData.rentalIncome.push(rentalIncome[index]);
             // Total Expenses
-            this.chartData.totalExpenses.push(result.total_expenses);
+            this.chartData.totalExpenses.push(totalExpenses[index]);
             // Taxes Due
-            this.chartData.taxesDue.push(result.taxes_due);
+            this.chartData.taxesDue.push(taxesDue[index]);
         });
 
         // Update chart if it exists
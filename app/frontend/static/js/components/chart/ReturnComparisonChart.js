@@ -1,6 +1,8 @@
 /**
  * Chart component for displaying return comparison metrics.
  */
+import { getColumn } from '../../utils/results.js';
+
 export class ReturnComparisonChart {
     constructor(parent) {
         this.chartData = {
@@ -237,19 +239,27 @@ export class ReturnComparisonChart {
         this.chartData.returnOnPurchase = [];
         this.chartData.returnComparison = [];
         
-        // Filter out month 0 for all data
-        const filteredResults = results.filter(result => result.month !== 0);
+        // Read the needed columns directly (rows or columnar results)
+        const months = getColumn(results, 'month');
+        const years = getColumn(results, 'year');
+        const cumulativeExpectedReturn = getColumn(results, 'cumulative_expected_return');
+        const netReturn = getColumn(results, 'net_return');
+        const returnComparisons = getColumn(results, 'return_comparison');
         
-        filteredResults.forEach((result) => {
+        months.forEach((month, index) => {
+            // Filter out month 0 for all data
+            if (month === 0) {
+                return;
+            }
             // Create label - use year number
-            const label = `Year ${result.year || Math.floor(result.month / 12) + 1}`;
+            const label = `Year ${years[index] || Math.floor(month / 12) + 1}`;
             this.chartData.labels.push(label);
             // Return if Invested = cumulative_expected_return (not the difference)
-            this.chartData.returnIfInvested.push(result.cumulative_expected_return);
+            this.chartData.returnIfInvested.push(cumulativeExpectedReturn[index]);
             // Return on Purchase = net_return
-            this.chartData.returnOnPurchase.push(result.net_return);
+            this.chartData.returnOnPurchase.push(netReturn[index]);
             // Return Comparison Ratio
-            const returnComparison = result.return_comparison || 0;
+            const returnComparison = returnComparisons[index] || 0;
             this.chartData.returnComparison.push(returnComparison);
         });
         
@@ -312,7 +312,7 @@ export class DisplayTabs {
         const tab = this.tabs[index];
         if (!tab || !tab.contentComponents) return;
         
-        // Store data
+        // Store data (row or columnar results; the components read either form)
         tab.contentComponents.data = data;
         
         // Temporarily show the tab content if it's hidden to allow Chart.js to render properly
@@ -124,8 +124,8 @@ export const COLUMN_DEFINITIONS = [
     },
     {
         name: 'Capital Gains Tax',
-        description: 'Tax on capital gains from property sale in Ontario, Canada. Capital gain = Sale Price - Purchase Price - Selling Costs. For individuals, 50% of capital gains are taxable (first $250k) and taxed at marginal tax rate. This calculator uses 50% inclusion rate for all gains.',
-        formula: '(Sale Price - Purchase Price - Selling Costs) × 0.5 × Marginal Tax Rate',
+        description: 'Tax on capital gains from property sale in Ontario, Canada. Capital gain = Sale Price - Purchase Price - Selling Costs. For individuals, 50% of the first $250k of capital gains and 66.67% of gains above $250k are taxable, taxed at marginal tax rate.',
+        formula: '(50% × Capital Gain up to $250k + 66.67% × Capital Gain above $250k) × Marginal Tax Rate',
         aggregationNote: 'Summary shows the final month value of the year.'
     },
     {
@@ -163,5 +163,17 @@ export const COLUMN_DEFINITIONS = [
         description: 'Ratio comparing net return to cumulative expected return.',
         formula: 'Net Return / Cumulative Expected Return',
         aggregationNote: 'Summary shows the final month value of the year.'
+    },
+    {
+        name: 'IRR %',
+        description: 'Annual internal rate of return if the property is sold at the end of the month: the rate at which the downpayment and costs paid up front, the monthly rental gains and the sale net discount to zero. Shows 0 when no rate does (e.g. the sale does not bring money back).',
+        formula: '-Initial Investment + Σ Rental Gains[t] / (1 + r)^t + Sale Net / (1 + r)^month = 0, annualized as ((1 + r)^12 - 1) × 100',
+        aggregationNote: 'Summary shows the final month value of the year.'
+    },
+    {
+        name: 'NPV',
+        description: 'Net present value of selling at the end of the month, discounting the monthly rental gains and the sale net at the expected return rate compounded monthly.',
+        formula: '-Initial Investment + Σ Rental Gains[t] / (1 + Expected Return Rate / 12)^t + Sale Net / (1 + Expected Return Rate / 12)^month',
+        aggregationNote: 'Summary shows the final month value of the year.'
     }
 ];
@@ -67,7 +67,9 @@ export class ColumnVisibility {
             'sale_net': 'Sale Net',
             'net_return': 'Net Return',
             'return_percent': 'Return %',
-            'return_comparison': 'Return Comparison'
+            'return_comparison': 'Return Comparison',
+            'irr': 'IRR %',
+            'npv': 'NPV'
         };
         
         // Return mapped name if available, otherwise auto-format
@@ -6,6 +6,42 @@ import { YearGroupRow } from './YearGroupRow.js';
 import { FormulaModal } from '../FormulaModal.js';
 import { COLUMN_DEFINITIONS } from '../sidebar/ColumnInfo.js';
 import { storage } from '../../utils/storage.js';
+import { toRows } from '../../utils/results.js';
+
+// Result columns shown in the table, in display order
+export const TABLE_COLUMNS = [
+    'month',
+    'principal_remaining',
+    'mortgage_payments',
+    'principal_paid',
+    'interest_paid',
+    'maintenance_fees',
+    'property_tax',
+    'insurance_paid',
+    'utilities',
+    'repairs',
+    'total_expenses',
+    'deductible_expenses',
+    'rental_income',
+    'taxable_income',
+    'taxes_due',
+    'rental_gains',
+    'cumulative_rental_gains',
+    'cumulative_investment',
+    'expected_return',
+    'cumulative_expected_return',
+    'home_value',
+    'sales_fees',
+    'capital_gains_tax',
+    'sale_income',
+    'sale_net',
+    'net_return',
+    'return_percent',
+    'return_comparison',
+    'irr',
+    'npv'
+];
+
 export class Table {
     constructor(parent, inputGroups, tabIndex = 0) {
         this.rows = [];
@@ -16,36 +52,7 @@ export class Table {
         this.formulaModal = new FormulaModal();
         this.columnDefinitions = COLUMN_DEFINITIONS;
         this.tabIndex = tabIndex;
-        this.columns = [
-            'month',
-            'principal_remaining',
-            'mortgage_payments',
-            'principal_paid',
-            'interest_paid',
-            'maintenance_fees',
-            'property_tax',
-            'insurance_paid',
-            'utilities',
-            'repairs',
-            'total_expenses',
-            'deductible_expenses',
-            'rental_income',
-            'taxable_income',
-            'taxes_due',
-            'rental_gains',
-            'cumulative_rental_gains',
-            'cumulative_investment',
-            'expected_return',
-            'cumulative_expected_return',
-            'home_value',
-            'sales_fees',
-            'capital_gains_tax',
-            'sale_income',
-            'sale_net',
-            'net_return',
-            'return_percent',
-            'return_comparison'
-        ];
+        this.columns = [...TABLE_COLUMNS];
         if (inputGroups) {
             this.inputGroups = inputGroups;
         }
@@ -430,7 +437,9 @@ export class Table {
             'sale_net': 'Sale Net',
             'net_return': 'Net Return',
             'return_percent': 'Return %',
-            'return_comparison': 'Return Comparison'
+            'return_comparison': 'Return Comparison',
+            'irr': 'IRR %',
+            'npv': 'NPV'
         };
         
         // Return mapped name if available, otherwise auto-format
@@ -450,7 +459,7 @@ export class Table {
         // Group results by year
         const yearGroups = new Map();
         let month0Result = null;
-        results.forEach(result => {
+        toRows(results).forEach(result => {
             if (result.month === 0) {
                 month0Result = result;
             }
@@ -61,7 +61,9 @@ export class TableRow {
             'sale_net': 'Sale Net',
             'net_return': 'Net Return',
             'return_percent': 'Return %',
-            'return_comparison': 'Return Comparison'
+            'return_comparison': 'Return Comparison',
+            'irr': 'IRR %',
+            'npv': 'NPV'
         };
         
         // Find column definition
@@ -133,6 +135,8 @@ export class TableRow {
         this.cells.get('net_return').textContent = this.formatCurrency(data.net_return);
         this.cells.get('return_percent').textContent = this.formatPercent(data.return_percent);
         this.cells.get('return_comparison').textContent = this.formatRatio(data.return_comparison);
+        this.cells.get('irr').textContent = this.formatPercent(data.irr);
+        this.cells.get('npv').textContent = this.formatCurrency(data.npv);
     }
     formatCurrency(value) {
         return new Intl.NumberFormat('en-US', {
@@ -143,6 +147,10 @@ export class TableRow {
         }).format(value);
     }
     formatPercent(value) {
+        // The IRR is null for months no rate solves
+        if (value === null || value === undefined) {
+            return 'N/A';
+        }
         return `${value.toFixed(2)}%`;
     }
     formatRatio(value) {
@@ -105,12 +105,14 @@ export class YearGroupRow {
         summary['net_return'] = lastMonth.net_return;
         summary['return_percent'] = lastMonth.return_percent;
         summary['return_comparison'] = lastMonth.return_comparison;
+        summary['irr'] = lastMonth.irr;
+        summary['npv'] = lastMonth.npv;
         // Display summaries
         this.columns.forEach(column => {
             if (column !== 'month' && summary[column] !== undefined) {
                 const cell = this.cells.get(column);
                 if (cell) {
-                    if (column === 'return_percent') {
+                    if (column === 'return_percent' || column === 'irr') {
                         cell.textContent = this.formatPercent(summary[column]);
                     }
                     else if (column === 'return_comparison') {
@@ -132,6 +134,10 @@ export class YearGroupRow {
         }).format(value);
     }
     formatPercent(value) {
+        // The IRR is null for months no rate solves
+        if (value === null || value === undefined) {
+            return 'N/A';
+        }
         return `${value.toFixed(2)}%`;
     }
     formatRatio(value) {
@@ -168,7 +174,9 @@ export class YearGroupRow {
             'sale_net': 'Sale Net',
             'net_return': 'Net Return',
             'return_percent': 'Return %',
-            'return_comparison': 'Return Comparison'
+            'return_comparison': 'Return Comparison',
+            'irr': 'IRR %',
+            'npv': 'NPV'
         };
         
         // Find column definition
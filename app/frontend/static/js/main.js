@@ -1,7 +1,7 @@
 /**
  * Main application entry point.
  */
-import { Table } from './components/table/Table.js';
+import { Table, TABLE_COLUMNS } from './components/table/Table.js';
 import { Sidebar } from './components/sidebar/Sidebar.js';
 import { ColumnVisibility } from './components/table/ColumnVisibility.js';
 import { InvestmentChart } from './components/chart/InvestmentChart.js';
@@ -14,12 +14,16 @@ import { ScenarioTabs } from './components/scenario/ScenarioTabs.js';
 import { DisplayTabs } from './components/scenario/DisplayTabs.js';
 import { LoadingOverlay } from './components/LoadingOverlay.js';
 import { ScenarioDifferences } from './components/ScenarioDifferences.js';
-import { calculateInvestment } from './utils/api.js';
+import { calculateInvestment, calculateInvestmentBatch, calculateInvestmentDelta } from './utils/api.js';
+
+// Columns requested for each scenario: the table's columns plus the year the formula breakdowns read
+const RESULT_FIELDS = ['year', ...TABLE_COLUMNS];
 
 class InvestmentCalculator {
     constructor() {
         this.numYears = 30;
-        this.scenarioData = new Map(); // Map of scenario index to { results, inputValues }
+        this.scenarioData = new Map(); // Map of scenario index to { results, yearly (columnar), inputValues }
+        this.calculatedParams = new Map(); // Map of scenario index to the params of its last calculation
         this.calculationInProgress = false;
         this.pendingCalculations = 0;
         
@@ -468,22 +472,12 @@ class InvestmentCalculator {
         return errors;
     }
 
-    async performCalculationForScenario(scenarioIndex) {
+    /**
+     * Validate a scenario and build its API parameters.
+     * Returns { values, params }, or null if the scenario cannot be calculated.
+     */
+    prepareScenarioCalculation(scenarioIndex) {
         const tab = this.scenarioTabs.getTab(scenarioIndex);
-        if (!tab) {
-            // Tab not found, don't show loading overlay
-            return;
-        }
-        
-        // Show loading overlay if not already showing
-        if (!this.loadingOverlay.isShowing()) {
-            this.loadingOverlay.show('Calculating...', 'Processing your investment scenario');
-        } else {
-            this.loadingOverlay.updateMessage('Calculating...', `Processing scenario ${scenarioIndex + 1}`);
-        }
-        this.calculationInProgress = true;
-        this.pendingCalculations++;
-        
         const inputSidebar = tab.inputSidebar;
         const values = inputSidebar.getInputValues();
         const validationErrors = this.validateInputs(values, inputSidebar);
@@ -491,33 +485,13 @@ class InvestmentCalculator {
         const displayTab = this.displayTabs.getTab(scenarioIndex);
         if (!displayTab) {
             console.warn(`Display tab ${scenarioIndex} not found, skipping calculation`);
-            // Decrement pending calculations and hide overlay if needed
-            this.pendingCalculations = Math.max(0, this.pendingCalculations - 1);
-            if (this.pendingCalculations === 0) {
-                this.calculationInProgress = false;
-                setTimeout(() => {
-                    if (this.pendingCalculations === 0 && !this.calculationInProgress) {
-                        this.loadingOverlay.hide();
-                    }
-                }, 300);
-            }
-            return;
+            return null;
         }
         
         // Ensure display tab content components are initialized
         if (!displayTab.contentComponents) {
             console.warn(`Display tab ${scenarioIndex} content components not initialized, skipping calculation`);
-            // Decrement pending calculations and hide overlay if needed
-            this.pendingCalculations = Math.max(0, this.pendingCalculations - 1);
-            if (this.pendingCalculations === 0) {
-                this.calculationInProgress = false;
-                setTimeout(() => {
-                    if (this.pendingCalculations === 0 && !this.calculationInProgress) {
-                        this.loadingOverlay.hide();
-                    }
-                }, 300);
-            }
-            return;
+            return null;
         }
 
         if (validationErrors.length > 0) {
@@ -530,18 +504,7 @@ class InvestmentCalculator {
             // Only remove from scenarioData so it doesn't appear in performance section
             this.scenarioData.delete(scenarioIndex);
             this.updatePerformanceSection();
-            
-            // Decrement pending calculations and hide overlay if needed
-            this.pendingCalculations = Math.max(0, this.pendingCalculations - 1);
-            if (this.pendingCalculations === 0) {
-                this.calculationInProgress = false;
-                setTimeout(() => {
-                    if (this.pendingCalculations === 0 && !this.calculationInProgress) {
-                        this.loadingOverlay.hide();
-                    }
-                }, 300);
-            }
-            return;
+            return null;
         }
 
         // Hide banner if validation passes (only if this is the active scenario)
@@ -549,118 +512,170 @@ class InvestmentCalculator {
             this.validationBanner.hide();
         }
 
-        try {
-            const params = {
-                purchase_price: values.get('purchase_price'),
-                downpayment_percentage: values.get('downpayment_percentage'),
-                closing_costs: values.get('closing_costs') ?? 0,
-                land_transfer_tax: values.get('land_transfer_tax') ?? 0,
-                interest_rate: values.get('interest_rate'),
-                loan_years: values.get('loan_years'),
-                payment_type: values.get('payment_type') || 'Principal and Interest',
-                maintenance_base: values.get('maintenance_base'),
-                maintenance_increase: values.get('maintenance_increase'),
-                property_tax_base: values.get('property_tax_base'),
-                property_tax_increase: values.get('property_tax_increase'),
-                insurance: values.get('insurance'),
-                utilities: values.get('utilities'),
-                repairs: values.get('repairs'),
-                rental_income_base: values.get('rental_income_base'),
-                rental_increase: values.get('rental_increase'),
-                marginal_tax_rate: values.get('marginal_tax_rate'),
-                expected_return_rate: values.get('expected_return_rate'),
-                real_estate_market_increase: values.get('real_estate_market_increase'),
-                commission_percentage: values.get('commission_percentage'),
-                num_years: this.numYears
-            };
-            
-            const response = await calculateInvestment(params);
-            
-            // Store scenario data
-            this.scenarioData.set(scenarioIndex, {
-                results: response.results,
-                inputValues: values
+        const params = {
+            purchase_price: values.get('purchase_price'),
+            downpayment_percentage: values.get('downpayment_percentage'),
+            closing_costs: values.get('closing_costs') ?? 0,
+            land_transfer_tax: values.get('land_transfer_tax') ?? 0,
+            interest_rate: values.get('interest_rate'),
+            loan_years: values.get('loan_years'),
+            payment_type: values.get('payment_type') || 'Principal and Interest',
+            maintenance_base: values.get('maintenance_base'),
+            maintenance_increase: values.get('maintenance_increase'),
+            property_tax_base: values.get('property_tax_base'),
+            property_tax_increase: values.get('property_tax_increase'),
+            insurance: values.get('insurance'),
+            utilities: values.get('utilities'),
+            repairs: values.get('repairs'),
+            rental_income_base: values.get('rental_income_base'),
+            rental_increase: values.get('rental_increase'),
+            marginal_tax_rate: values.get('marginal_tax_rate'),
+            expected_return_rate: values.get('expected_return_rate'),
+            real_estate_market_increase: values.get('real_estate_market_increase'),
+            commission_percentage: values.get('commission_percentage'),
+            num_years: this.numYears
+        };
+        return { values, params };
+    }
+
+    /**
+     * Store a scenario's monthly results and yearly rollups and render its display tab.
+     */
+    applyScenarioResults(scenarioIndex, values, results, yearly) {
+        // Store scenario data
+        this.scenarioData.set(scenarioIndex, {
+            results: results,
+            yearly: yearly,
+            inputValues: values
+        });
+        
+        // Update display tab
+        this.displayTabs.updateTabData(scenarioIndex, results);
+        this.displayTabs.setInputValuesForTab(scenarioIndex, values);
+        
+        // Always ensure the active display tab renders, even if it's not this scenario
+        // This ensures content is visible when data arrives
+        const activeTabIndex = this.displayTabs.activeTabIndex;
+        if (scenarioIndex === activeTabIndex) {
+            requestAnimationFrame(() => {
+                setTimeout(() => {
+                    this.displayTabs.renderTabContent(scenarioIndex);
+                }, 150);
             });
-            
-            // Update display tab
-            this.displayTabs.updateTabData(scenarioIndex, response.results);
-            this.displayTabs.setInputValuesForTab(scenarioIndex, values);
-            
-            // Always ensure the active display tab renders, even if it's not this scenario
-            // This ensures content is visible when data arrives
-            const activeTabIndex = this.displayTabs.activeTabIndex;
-            if (scenarioIndex === activeTabIndex) {
-                requestAnimationFrame(() => {
-                    setTimeout(() => {
-                        this.displayTabs.renderTabContent(scenarioIndex);
-                    }, 150);
-                });
-            }
-            
-            // Also ensure the tab content is visible if it's the active tab
-            const displayTab = this.displayTabs.getTab(activeTabIndex);
-            if (displayTab && displayTab.content) {
-                if (displayTab.content.style.display === 'none') {
-                    displayTab.content.style.display = 'flex';
-                }
-            }
-            
-            // Update performance section (shows all scenarios)
-            this.updatePerformanceSection();
-            
-            // Update cross-scenario chart
-            this.updateCrossScenarioChart();
-            
-            // Update scenario differences
-            if (this.scenarioDifferences) {
-                this.scenarioDifferences.refresh();
+        }
+        
+        // Also ensure the tab content is visible if it's the active tab
+        const displayTab = this.displayTabs.getTab(activeTabIndex);
+        if (displayTab && displayTab.content) {
+            if (displayTab.content.style.display === 'none') {
+                displayTab.content.style.display = 'flex';
             }
         }
-        catch (error) {
-            console.error('Calculation error:', error);
-            const errorMessages = [];
-            
-            if (error.errors && Array.isArray(error.errors)) {
-                errorMessages.push(...error.errors);
+    }
+
+    /**
+     * Refresh the views that combine all scenarios.
+     */
+    refreshScenarioViews() {
+        // Update performance section (shows all scenarios)
+        this.updatePerformanceSection();
+        
+        // Update cross-scenario chart
+        this.updateCrossScenarioChart();
+        
+        // Update scenario differences
+        if (this.scenarioDifferences) {
+            this.scenarioDifferences.refresh();
+        }
+    }
+
+    showScenarioCalculationError(scenarioIndex, error) {
+        console.error('Calculation error:', error);
+        const errorMessages = [];
+        
+        if (error.errors && Array.isArray(error.errors)) {
+            errorMessages.push(...error.errors);
+        }
+        else if (error.message) {
+            if (error.message.includes(',')) {
+                errorMessages.push(...error.message.split(',').map(msg => msg.trim()).filter(msg => msg));
+            } else {
+                errorMessages.push(error.message);
             }
-            else if (error.message) {
-                if (error.message.includes(',')) {
-                    errorMessages.push(...error.message.split(',').map(msg => msg.trim()).filter(msg => msg));
-                } else {
-                    errorMessages.push(error.message);
-                }
+        }
+        
+        if (errorMessages.length === 0) {
+            if (error.status === 400) {
+                errorMessages.push('Invalid input values. Please check that all fields contain valid numbers.');
+            } else if (error.status === 500) {
+                errorMessages.push('Server error occurred. Please verify all input values are valid numbers and try again.');
+            } else {
+                errorMessages.push('Error performing calculation. Please check your inputs and ensure all fields contain valid numbers.');
             }
-            
-            if (errorMessages.length === 0) {
-                if (error.status === 400) {
-                    errorMessages.push('Invalid input values. Please check that all fields contain valid numbers.');
-                } else if (error.status === 500) {
-                    errorMessages.push('Server error occurred. Please verify all input values are valid numbers and try again.');
-                } else {
-                    errorMessages.push('Error performing calculation. Please check your inputs and ensure all fields contain valid numbers.');
+        }
+        
+        const uniqueErrors = [...new Set(errorMessages.filter(msg => msg && msg.trim()))];
+        
+        if (scenarioIndex === this.scenarioTabs.activeTabIndex) {
+            this.validationBanner.show(uniqueErrors.length > 0 ? uniqueErrors : ['An unknown error occurred. Please check your inputs.']);
+        }
+    }
+
+    finishCalculation() {
+        // Decrement pending calculations counter
+        this.pendingCalculations = Math.max(0, this.pendingCalculations - 1);
+        
+        // Hide loading overlay if all calculations are complete
+        if (this.pendingCalculations === 0) {
+            this.calculationInProgress = false;
+            // Small delay to ensure UI updates are complete
+            setTimeout(() => {
+                if (this.pendingCalculations === 0 && !this.calculationInProgress) {
+                    this.loadingOverlay.hide();
                 }
+            }, 300);
+        }
+    }
+
+    async performCalculationForScenario(scenarioIndex) {
+        const tab = this.scenarioTabs.getTab(scenarioIndex);
+        if (!tab) {
+            // Tab not found, don't show loading overlay
+            return;
+        }
+        
+        // Show loading overlay if not already showing
+        if (!this.loadingOverlay.isShowing()) {
+            this.loadingOverlay.show('Calculating...', 'Processing your investment scenario');
+        } else {
+            this.loadingOverlay.updateMessage('Calculating...', `Processing scenario ${scenarioIndex + 1}`);
+        }
+        this.calculationInProgress = true;
+        this.pendingCalculations++;
+        
+        try {
+            const prepared = this.prepareScenarioCalculation(scenarioIndex);
+            if (!prepared) {
+                return;
             }
-            
-            const uniqueErrors = [...new Set(errorMessages.filter(msg => msg && msg.trim()))];
-            
-            if (scenarioIndex === this.scenarioTabs.activeTabIndex) {
-                this.validationBanner.show(uniqueErrors.length > 0 ? uniqueErrors : ['An unknown error occurred. Please check your inputs.']);
-            }
+            // Edits recalculate from the scenario's previous params, so only affected columns are recomputed
+            const base = this.calculatedParams.get(scenarioIndex);
+            const calculate = (options) => base
+                ? calculateInvestmentDelta(base, prepared.params, options)
+                : calculateInvestment(prepared.params, options);
+            // Monthly results feed the table; the cross-scenario chart reads the server's yearly rollup,
+            // requested second so it reuses the projection the server cached for the monthly results
+            const response = await calculate({ fields: RESULT_FIELDS });
+            const yearly = await calculate({ fields: RESULT_FIELDS, resolution: 'year' });
+            this.applyScenarioResults(scenarioIndex, prepared.values, response.columns, yearly.columns);
+            this.calculatedParams.set(scenarioIndex, prepared.params);
+            this.refreshScenarioViews();
+        }
+        catch (error) {
+            this.showScenarioCalculationError(scenarioIndex, error);
         }
         finally {
-            // Decrement pending calculations counter
-            this.pendingCalculations = Math.max(0, this.pendingCalculations - 1);
-            
-            // Hide loading overlay if all calculations are complete
-            if (this.pendingCalculations === 0) {
-                this.calculationInProgress = false;
-                // Small delay to ensure UI updates are complete
-                setTimeout(() => {
-                    if (this.pendingCalculations === 0 && !this.calculationInProgress) {
-                        this.loadingOverlay.hide();
-                    }
-                }, 300);
-            }
+            this.finishCalculation();
         }
     }
 
@@ -675,14 +690,53 @@ class InvestmentCalculator {
         
         // Show loading overlay
         this.loadingOverlay.updateMessage('Calculating scenarios...', `Processing ${scenarioCount} scenario${scenarioCount > 1 ? 's' : ''}`);
+        this.calculationInProgress = true;
+        this.pendingCalculations++;
         
         // Ensure display tabs match scenario tabs
         this.displayTabs.updateTabCount(scenarioCount);
         
-        // Perform calculation for each scenario
+        // Validate every scenario, then calculate all valid ones in a single batch request
+        const prepared = new Map();
         for (let i = 0; i < scenarioCount; i++) {
-            this.loadingOverlay.updateMessage('Calculating scenarios...', `Processing scenario ${i + 1} of ${scenarioCount}`);
-            await this.performCalculationForScenario(i);
+            const scenario = this.prepareScenarioCalculation(i);
+            if (scenario) {
+                prepared.set(i, scenario);
+            }
+        }
+        
+        try {
+            if (prepared.size > 0) {
+                const scenarios = {};
+                prepared.forEach((scenario, index) => {
+                    scenarios[index] = scenario.params;
+                });
+                // Monthly results feed the table; the cross-scenario chart reads the server's yearly rollup
+                const response = await calculateInvestmentBatch(scenarios, { fields: RESULT_FIELDS });
+                const yearly = await calculateInvestmentBatch(scenarios, { fields: RESULT_FIELDS, resolution: 'year' });
+                prepared.forEach((scenario, index) => {
+                    const result = response.results[index];
+                    const yearlyResult = yearly.results[index];
+                    if (result && result.columns && yearlyResult && yearlyResult.columns) {
+                        this.applyScenarioResults(index, scenario.values, result.columns, yearlyResult.columns);
+                        this.calculatedParams.set(index, scenario.params);
+                    } else {
+                        const error = new Error((result && result.error) || 'Error performing calculation.');
+                        error.status = 400;
+                        if (result && Array.isArray(result.errors)) {
+                            error.errors = result.errors;
+                        }
+                        this.showScenarioCalculationError(index, error);
+                    }
+                });
+                this.refreshScenarioViews();
+            }
+        }
+        catch (error) {
+            prepared.forEach((scenario, index) => this.showScenarioCalculationError(index, error));
+        }
+        finally {
+            this.finishCalculation();
         }
         
         // Ensure validation banner is shown/hidden correctly for active scenario
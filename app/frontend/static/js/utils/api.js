@@ -13,50 +13,137 @@ function getApiBaseUrl() {
     return './api';
 }
 
+/**
+ * Build an Error from a failed API response, keeping any validation error list.
+ */
+async function buildApiError(response) {
+    let errorMessage = `API request failed: ${response.statusText}`;
+    let errorErrors = null;
+    try {
+        const errorData = await response.json();
+        if (Array.isArray(errorData.errors)) {
+            // Backend returned an array of specific errors
+            errorErrors = errorData.errors;
+            errorMessage = errorData.error || 'Validation errors occurred';
+        } else if (errorData.error) {
+            errorMessage = errorData.error;
+        } else if (errorData.message) {
+            errorMessage = errorData.message;
+        }
+    } catch (e) {
+        // If response is not JSON, try to get text
+        try {
+            const text = await response.text();
+            if (text) {
+                errorMessage = text;
+            }
+        } catch (e2) {
+            // Use default error message
+        }
+    }
+    const error = new Error(errorMessage);
+    error.status = response.status;
+    error.response = response;
+    if (errorErrors) {
+        error.errors = errorErrors;
+    }
+    return error;
+}
+
+// Recent calculation results keyed by scenario and options, with the ETag they were sent with
+const MAX_CACHED_RESULTS = 16;
+const cachedResults = new Map();
+
+/**
+ * POST a single-scenario calculation. `cacheKey` identifies the calculated scenario:
+ * when it was fetched before, its ETag is sent in If-None-Match and on 304 Not
+ * Modified the cached result is reused without downloading it again.
+ */
+async function postCalculation(path, payload, cacheKey) {
+    const apiBaseUrl = getApiBaseUrl();
+    const cached = cachedResults.get(cacheKey);
+    const headers = {
+        'Content-Type': 'application/json',
+    };
+    if (cached) {
+        headers['If-None-Match'] = cached.etag;
+    }
+    const response = await fetch(`${apiBaseUrl}/${path}`, {
+        method: 'POST',
+        headers,
+        body: JSON.stringify(payload),
+    });
+    if (response.status === 304 && cached) {
+        return cached.data;
+    }
+    if (!response.ok) {
+        throw await buildApiError(response);
+    }
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        cachedResults.delete(cacheKey);
+        cachedResults.set(cacheKey, { etag, data });
+        if (cachedResults.size > MAX_CACHED_RESULTS) {
+            cachedResults.delete(cachedResults.keys().next().value);
+        }
+    }
+    return data;
+}
+
 /**
  * Send calculation request to the backend API.
+ * Results come back in the columnar format (`{ columns: { <column>: [...] } }`),
+ * which is several times smaller than one object per month.
+ * `options.resolution` ('month', 'quarter' or 'year') asks the server for rollups, and
+ * `options.fields` (column names) limits the columns computed and returned; without
+ * it every column is returned.
+ * Repeated requests are revalidated with their ETag (see postCalculation).
+ */
+export async function calculateInvestment(params, options = {}) {
+    const payload = { ...params, ...options, format: 'columns' };
+    return postCalculation('calculate', payload, JSON.stringify(payload));
+}
+
+/**
+ * Recalculate a scenario after an edit. `base` holds the parameters of the previous
+ * calculation of the same scenario; only the fields that differ from it are sent,
+ * and the server recomputes only the columns those fields affect.
+ * Takes the same options and returns the same result as calculateInvestment.
+ */
+export async function calculateInvestmentDelta(base, params, options = {}) {
+    // A field dropped since the base can't be expressed as a change
+    if (Object.keys(base).some(name => !(name in params))) {
+        return calculateInvestment(params, options);
+    }
+    const changes = {};
+    Object.keys(params).forEach(name => {
+        if (JSON.stringify(params[name]) !== JSON.stringify(base[name])) {
+            changes[name] = params[name];
+        }
+    });
+    const cacheKey = JSON.stringify({ ...params, ...options, format: 'columns' });
+    return postCalculation('calculate/delta', { base, changes, ...options, format: 'columns' }, cacheKey);
+}
+
+/**
+ * Send several scenarios to the backend in a single batch calculation request.
+ * `scenarios` maps a scenario key to its parameters; the response maps each key
+ * to either `{ columns }` or `{ error, errors }`.
+ * `options.resolution` ('month', 'quarter' or 'year') asks the server for rollups, and
+ * `options.fields` (column names) limits the columns computed and returned.
  */
-export async function calculateInvestment(params) {
+export async function calculateInvestmentBatch(scenarios, options = {}) {
     const apiBaseUrl = getApiBaseUrl();
-    const response = await fetch(`${apiBaseUrl}/calculate`, {
+    const response = await fetch(`${apiBaseUrl}/calculate/batch`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
-        body: JSON.stringify(params),
+        body: JSON.stringify({ scenarios, ...options, format: 'columns' }),
     });
-        if (!response.ok) {
-            let errorMessage = `API request failed: ${response.statusText}`;
-            let errorErrors = null;
-            try {
-                const errorData = await response.json();
-                if (Array.isArray(errorData.errors)) {
-                    // Backend returned an array of specific errors
-                    errorErrors = errorData.errors;
-                    errorMessage = errorData.error || 'Validation errors occurred';
-                } else if (errorData.error) {
-                    errorMessage = errorData.error;
-                } else if (errorData.message) {
-                    errorMessage = errorData.message;
-                }
-            } catch (e) {
-                // If response is not JSON, try to get text
-                try {
-                    const text = await response.text();
-                    if (text) {
-                        errorMessage = text;
-                    }
-                } catch (e2) {
-                    // Use default error message
-                }
-            }
-            const error = new Error(errorMessage);
-            error.status = response.status;
-            error.response = response;
-            if (errorErrors) {
-                error.errors = errorErrors;
-            }
-            throw error;
-        }
+    if (!response.ok) {
+        throw await buildApiError(response);
+    }
     return response.json();
 }
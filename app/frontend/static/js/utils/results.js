@@ -0,0 +1,63 @@
+/**
+ * Helpers for reading calculation results in either response format:
+ * - rows: an array with one object per month (`[{ month, year, ... }, ...]`)
+ * - columns: an object with one array per column (`{ month: [...], year: [...], ... }`)
+ */
+
+// Row views built from columnar results, cached so repeated reads are free
+const rowCache = new WeakMap();
+
+/**
+ * Check whether results are in the columnar format.
+ */
+export function isColumnar(results) {
+    return !!results && !Array.isArray(results) && Array.isArray(results.month);
+}
+
+/**
+ * Number of months (rows) in the results, including month 0.
+ */
+export function getRowCount(results) {
+    if (!results) {
+        return 0;
+    }
+    return isColumnar(results) ? results.month.length : results.length;
+}
+
+/**
+ * Get a single column as an array, reading columnar results directly.
+ */
+export function getColumn(results, name) {
+    if (!results) {
+        return [];
+    }
+    if (isColumnar(results)) {
+        return results[name] || [];
+    }
+    return results.map(result => result[name]);
+}
+
+/**
+ * Get results as an array of row objects, converting columnar results once.
+ */
+export function toRows(results) {
+    if (!results) {
+        return [];
+    }
+    if (!isColumnar(results)) {
+        return results;
+    }
+    let rows = rowCache.get(results);
+    if (!rows) {
+        const names = Object.keys(results);
+        rows = results.month.map((_, index) => {
+            const row = {};
+            names.forEach(name => {
+                row[name] = results[name][index];
+            });
+            return row;
+        });
+        rowCache.set(results, rows);
+    }
+    return rows;
+}
@@ -0,0 +1,354 @@
+"""
+Offline benchmark suite for the calculation engine and API.
+
+Times the calculation helpers, the projection engine, the full
+/api/calculate request through Flask's test client at several horizons,
+batch requests of several sizes, and response serialization on its own.
+Results are written as JSON so runs can be compared; with a baseline, the
+run fails when a benchmark's p50 time or peak memory got worse than the
+baseline by more than a threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # run, save results.json
+    python benchmarks/run_benchmarks.py --save-baseline       # run, store as the baseline
+    python benchmarks/run_benchmarks.py --compare             # run, check against the baseline
+    python benchmarks/run_benchmarks.py --filter api --repeat 50
+
+Timings are machine-specific: store the baseline on the machine the
+regression check runs on.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Add the repository root and the tests (for their shared scenario) to Python path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+import numpy as np
+
+from app.backend.api.formats import (
+    columns_to_arrow,
+    ndjson_rows,
+    pack_columns,
+    pyarrow
+)
+from app.backend.app import create_app
+from app.backend.calculations import expenses, investment, mortgage, sale
+from app.backend.calculations.cache import ProjectionCache
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.precision import PRECISION_EXACT, PRECISION_FAST
+from app.backend.calculations.projection import (
+    COLUMNS,
+    calculate_batch_projection,
+    calculate_delta_projection,
+    calculate_projection,
+    projection_to_columns,
+    projection_to_rows
+)
+
+# The typical scenario the tests use, as the frontend sends it
+from conftest import SCENARIO
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+HORIZONS = (1, 10, 30, 50, 100)
+BATCH_SIZES = (1, 10, 100)
+DEFAULT_REPEAT = 20
+# Allowed relative increase over the baseline before a benchmark counts as a regression
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.25
+
+
+def _helper_cases(principal, rate, payment, growth, base) -> dict:
+    """Calls of each scalar calculation helper with arguments of one numeric type."""
+    return {
+        'mortgage.calculate_monthly_payment': lambda: mortgage.calculate_monthly_payment(principal, rate, 25),
+        'mortgage.calculate_month_breakdown': lambda: mortgage.calculate_month_breakdown(principal, rate, payment),
+        'expenses.calculate_maintenance_monthly': lambda: expenses.calculate_maintenance_monthly(137, base, growth),
+        'expenses.calculate_rental_income_monthly': lambda: expenses.calculate_rental_income_monthly(137, base, growth),
+        'investment.calculate_taxes_due': lambda: investment.calculate_taxes_due(base, rate),
+        'investment.calculate_expected_return': lambda: investment.calculate_expected_return(principal, base, rate),
+        'sale.calculate_home_value': lambda: sale.calculate_home_value(principal, growth, 137),
+        'sale.calculate_capital_gains_tax_ontario': lambda: sale.calculate_capital_gains_tax_ontario(
+            principal * 2, principal, base, rate),
+        'sale.calculate_sale_metrics': lambda: sale.calculate_sale_metrics(
+            principal * 2, principal, rate, rate, principal / 2),
+    }
+
+
+def _helper_benchmarks():
+    """Calculation helpers, called with float and with Decimal arguments."""
+    benchmarks = []
+    for label, number in (('float', float), ('decimal', lambda value: Decimal(str(value)))):
+        cases = _helper_cases(number(400000), number(0.055), number(2456.35), number(0.03), number(300))
+        benchmarks.extend((f'helpers/{name}[{label}]', function) for name, function in cases.items())
+
+    # Whole-horizon kernels of the fast engine (30 years)
+    num_months = 360
+    home_value = sale.calculate_home_value_curve(500000.0, 0.04, num_months)
+    benchmarks.extend([
+        ('helpers/mortgage.calculate_amortization_schedule[30y]',
+         lambda: mortgage.calculate_amortization_schedule(400000.0, 0.055, 25, num_months)),
+        ('helpers/sale.calculate_home_value_curve[30y]',
+         lambda: sale.calculate_home_value_curve(500000.0, 0.04, num_months)),
+        ('helpers/sale.calculate_sale_metrics[30y]',
+         lambda: sale.calculate_sale_metrics(home_value, 500000.0, 0.05, 0.43, 200000.0)),
+    ])
+    return benchmarks
+
+
+def _engine_benchmarks():
+    """The projection engine on its own, without request parsing or serialization."""
+    benchmarks = [('engine/parse_scenario', lambda: ScenarioParams.parse(SCENARIO))]
+    for precision in (PRECISION_FAST, PRECISION_EXACT):
+        params = ScenarioParams.parse(dict(SCENARIO, precision=precision))[0].to_dict()
+        for num_years in HORIZONS:
+            benchmarks.append((f'engine/calculate_projection[{precision},{num_years}y]',
+                               lambda params=params, num_years=num_years, precision=precision:
+                               calculate_projection(params, num_years, precision)))
+    params = ScenarioParams.parse(SCENARIO)[0].to_dict()
+    for size in BATCH_SIZES:
+        benchmarks.append((f'engine/calculate_batch_projection[{size}x30y]',
+                           lambda size=size: calculate_batch_projection([params] * size, [30] * size)))
+    # Recalculation after a one-field edit, reusing the unaffected columns
+    previous = calculate_projection(params, 30)
+    for field in ('commission_percentage', 'expected_return_rate'):
+        edited = dict(params, **{field: params[field] * 1.1})
+        benchmarks.append((f'engine/calculate_delta_projection[{field},30y]',
+                           lambda edited=edited, field=field:
+                           calculate_delta_projection(edited, 30, previous, [field])))
+    return benchmarks
+
+
+def _api_benchmarks(client):
+    """Full requests through the Flask test client (result cache disabled)."""
+    benchmarks = []
+    for num_years in HORIZONS:
+        body = dict(SCENARIO, num_years=num_years)
+        benchmarks.append((f'api/calculate[{num_years}y]',
+                           lambda body=body: _post(client, '/api/calculate', body)))
+    for response_format in ('columns', 'binary'):
+        body = dict(SCENARIO, num_years=30, format=response_format)
+        benchmarks.append((f'api/calculate[30y,{response_format}]',
+                           lambda body=body: _post(client, '/api/calculate', body)))
+    body = dict(SCENARIO, num_years=30, precision=PRECISION_EXACT)
+    benchmarks.append(('api/calculate[30y,exact]', lambda body=body: _post(client, '/api/calculate', body)))
+    # Every column, including the IRR that is left out by default
+    body = dict(SCENARIO, num_years=30, fields=list(COLUMNS))
+    benchmarks.append(('api/calculate[30y,irr]', lambda body=body: _post(client, '/api/calculate', body)))
+    for size in BATCH_SIZES:
+        scenarios = [dict(SCENARIO, num_years=30, purchase_price=400000 + index) for index in range(size)]
+        # The columns default against the one-dictionary-per-month rows format
+        for response_format in ('columns', 'rows'):
+            body = {'scenarios': scenarios, 'format': response_format}
+            benchmarks.append((f'api/calculate_batch[{size}x30y,{response_format}]',
+                               lambda body=body: _post(client, '/api/calculate/batch', body)))
+    return benchmarks
+
+
+def _serialization_benchmarks():
+    """Response serialization of already computed projections."""
+    benchmarks = []
+    params = ScenarioParams.parse(SCENARIO)[0].to_dict()
+    for num_years in (30, 100):
+        columns = calculate_projection(params, num_years)
+        benchmarks.extend([
+            (f'serialization/rows_json[{num_years}y]',
+             lambda columns=columns: json.dumps(projection_to_rows(columns))),
+            (f'serialization/columns_json[{num_years}y]',
+             lambda columns=columns: json.dumps(projection_to_columns(columns))),
+            (f'serialization/ndjson_rows[{num_years}y]',
+             lambda columns=columns: ''.join(ndjson_rows(projection_to_rows(columns)))),
+            (f'serialization/binary[{num_years}y]',
+             lambda columns=columns: pack_columns(columns, COLUMNS)),
+        ])
+        if pyarrow is not None:
+            benchmarks.append((f'serialization/arrow[{num_years}y]',
+                               lambda columns=columns: columns_to_arrow(columns, COLUMNS)))
+    return benchmarks
+
+
+def _post(client, path: str, body: dict):
+    response = client.post(path, json=body)
+    if response.status_code != 200:
+        raise RuntimeError(f'{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response.get_data()
+
+
+def collect_benchmarks(client) -> list:
+    """Return (name, function) pairs for every benchmark, grouped by area."""
+    return (_helper_benchmarks() + _engine_benchmarks() + _api_benchmarks(client)
+            + _serialization_benchmarks())
+
+
+def run_benchmark(function, repeat: int, min_time: float = 0.2) -> dict:
+    """
+    Time one benchmark and measure its peak memory.
+
+    Each sample runs the function enough times to take a measurable time
+    (calibrated once), and reports the time per call.
+
+    Args:
+        function: Callable taking no arguments
+        repeat: Number of timed samples
+        min_time: Approximate total seconds spent on the timed samples
+
+    Returns:
+        Dictionary with p50_ms, p95_ms, min_ms, mean_ms, samples, loops and
+        peak_memory_kb (peak traced allocation during one call)
+    """
+    function()  # Warm up caches and lazy imports
+    start = time.perf_counter()
+    function()
+    single = max(time.perf_counter() - start, 1e-7)
+    loops = max(1, int(min_time / repeat / single))
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                function()
+            samples.append((time.perf_counter() - start) / loops * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples = np.asarray(samples)
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'min_ms': float(samples.min()),
+        'mean_ms': float(samples.mean()),
+        'samples': repeat,
+        'loops': loops,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def compare_results(results: dict, baseline: dict, time_threshold: float, memory_threshold: float) -> list:
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results: Output of run_suite
+        baseline: Output of an earlier run_suite
+        time_threshold: Allowed relative p50 increase (0.25 = 25% slower)
+        memory_threshold: Allowed relative peak memory increase
+
+    Returns:
+        List of regression messages (empty if nothing regressed). Benchmarks
+        missing from either run are ignored.
+    """
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None:
+            continue
+        for metric, threshold, unit in (('p50_ms', time_threshold, 'ms'),
+                                        ('peak_memory_kb', memory_threshold, 'KiB')):
+            before, after = previous[metric], current[metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(f'{name}: {metric} {before:.3f} -> {after:.3f} {unit} '
+                                   f'(+{(after / before - 1) * 100:.0f}%, limit +{threshold * 100:.0f}%)')
+    return regressions
+
+
+def run_suite(repeat: int = DEFAULT_REPEAT, name_filter: str = None, min_time: float = 0.2) -> dict:
+    """
+    Run every benchmark (or those whose name contains name_filter).
+
+    Returns:
+        Dictionary with run metadata and benchmarks: {<name>: run_benchmark output}
+    """
+    app = create_app()
+    # Every request must compute its projection rather than hit the result cache
+    app.extensions['projection_cache'] = ProjectionCache(max_entries=0)
+    client = app.test_client()
+
+    results = {}
+    for name, function in collect_benchmarks(client):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = run_benchmark(function, repeat, min_time)
+        print(f"{name:<60} p50 {results[name]['p50_ms']:>10.4f} ms   "
+              f"peak {results[name]['peak_memory_kb']:>10.1f} KiB", flush=True)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+        },
+        'benchmarks': results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the calculation and API benchmark suite.')
+    parser.add_argument('--output', default=DEFAULT_RESULTS, help='Where to write the results JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results JSON')
+    parser.add_argument('--save-baseline', action='store_true', help='Also store the results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='Fail if results regressed against the baseline')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed samples per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Approximate seconds per benchmark')
+    parser.add_argument('--filter', dest='name_filter', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help='Allowed relative p50 increase (default 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='Allowed relative peak memory increase (default 0.25)')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.repeat, args.name_filter, args.min_time)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline written to {args.baseline}')
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f'No baseline at {args.baseline}; run with --save-baseline first')
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.time_threshold, args.memory_threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) against {args.baseline}:')
+            for message in regressions:
+                print(f'  {message}')
+            return 1
+        print(f'No regressions against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
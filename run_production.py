@@ -1,6 +1,23 @@
 """
 Production runner for Real Estate Investment Calculator.
 Configured to run on localhost:6006 for AppManager proxy compatibility.
+
+Two serving modes, selected with the SERVER environment variable:
+- workers (default when gunicorn is installed): a pre-fork gunicorn worker
+  pool. The app is created once in the master before forking, so workers
+  share its memory copy-on-write. Send SIGHUP to the master to restart the
+  workers gracefully; workers are also recycled after MAX_REQUESTS requests.
+- single: Flask's built-in server in one process (also used on platforms
+  without gunicorn, e.g. Windows).
+
+Worker pool settings (environment variables):
+- WEB_CONCURRENCY: worker processes (default: one per CPU)
+- WORKER_THREADS: threads per worker (default 2)
+- MAX_REQUESTS: requests served before a worker is recycled (default 1000, 0 = never)
+- MAX_REQUESTS_JITTER: random extra requests so workers don't recycle together (default 100)
+- WORKER_TIMEOUT: seconds a worker may stay silent before it is killed and replaced (default 120)
+- GRACEFUL_TIMEOUT: seconds workers get to finish in-flight requests on restart (default 30)
+- KEEPALIVE: seconds to keep idle connections open (default 5)
 """
 
 import os
@@ -13,18 +30,88 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 if 'app' in sys.modules and not hasattr(sys.modules['app'], '__path__'):
     del sys.modules['app']
 
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # Not available on Windows; the single-process server is used instead
+    BaseApplication = None
+
 from app.backend.app import create_app
 
+SERVER_WORKERS = 'workers'
+SERVER_SINGLE = 'single'
+
+
+if BaseApplication is not None:
+    class WorkerPoolServer(BaseApplication):
+        """Gunicorn pre-fork server for an app that was already created (preloaded)."""
+
+        def __init__(self, application, options: dict):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+
+def worker_pool_options(host: str, port: int) -> dict:
+    """
+    Build the gunicorn settings for the worker pool from environment variables.
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+
+    Returns:
+        Dictionary of gunicorn setting names to values
+    """
+    workers = int(os.environ.get('WEB_CONCURRENCY', 0)) or os.cpu_count() or 1
+    threads = int(os.environ.get('WORKER_THREADS', 2))
+    return {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        # Threaded workers keep the app responsive while one request is busy projecting
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'max_requests': int(os.environ.get('MAX_REQUESTS', 1000)),
+        'max_requests_jitter': int(os.environ.get('MAX_REQUESTS_JITTER', 100)),
+        'timeout': int(os.environ.get('WORKER_TIMEOUT', 120)),
+        'graceful_timeout': int(os.environ.get('GRACEFUL_TIMEOUT', 30)),
+        'keepalive': int(os.environ.get('KEEPALIVE', 5)),
+        'accesslog': os.environ.get('ACCESS_LOG') or None,
+    }
+
+
 if __name__ == '__main__':
-    app = create_app()
-    
     # Production settings - port from environment variable or default to 6006 (same as local)
     port = int(os.environ.get('PORT', 6006))
-    
+
     # Direct port access: bind publicly by default.
     # Override with HOST env var if you need localhost-only binding.
     host = os.environ.get('HOST', '0.0.0.0')
-    
-    print(f"Starting Real Estate Investment Calculator on {host}:{port}...")
-    app.run(host=host, port=port, debug=False)
 
+    server = os.environ.get('SERVER', SERVER_WORKERS if BaseApplication is not None else SERVER_SINGLE).lower()
+    if server == SERVER_WORKERS and BaseApplication is None:
+        print("gunicorn is not installed; falling back to the single-process server.")
+        server = SERVER_SINGLE
+
+    if server == SERVER_WORKERS:
+        options = worker_pool_options(host, port)
+        # Worker processes already use every core, so simulations and portfolios
+        # run inside them rather than starting a process pool per worker
+        if options['workers'] > 1:
+            os.environ.setdefault('SIMULATION_WORKERS', '1')
+            os.environ.setdefault('PORTFOLIO_WORKERS', '1')
+        app = create_app()
+        print(f"Starting Real Estate Investment Calculator on {host}:{port} "
+              f"({options['workers']} workers x {options['threads']} threads)...")
+        WorkerPoolServer(app, options).run()
+    else:
+        app = create_app()
+        print(f"Starting Real Estate Investment Calculator on {host}:{port}...")
+        app.run(host=host, port=port, debug=False)
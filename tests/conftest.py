@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the calculator tests.
+
+Run from the repository root with: python -m pytest
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the repository root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.backend.app import create_app
+
+# Typical scenario, as sent by the frontend
+SCENARIO = {
+    'purchase_price': 500000,
+    'downpayment_percentage': 20,
+    'closing_costs': 5000,
+    'land_transfer_tax': 6475,
+    'interest_rate': 5.5,
+    'loan_years': 25,
+    'payment_type': 'Principal and Interest',
+    'maintenance_base': 300,
+    'maintenance_increase': 3,
+    'property_tax_base': 4000,
+    'property_tax_increase': 2,
+    'insurance': 1200,
+    'utilities': 150,
+    'repairs': 1500,
+    'rental_income_base': 2800,
+    'rental_increase': 2.5,
+    'marginal_tax_rate': 43,
+    'expected_return_rate': 7,
+    'real_estate_market_increase': 4,
+    'commission_percentage': 5,
+    'num_years': 30,
+}
+
+
+@pytest.fixture
+def scenario():
+    """A fresh copy of the typical scenario's request parameters."""
+    return dict(SCENARIO)
+
+
+@pytest.fixture
+def client():
+    """Test client of an app with default settings."""
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
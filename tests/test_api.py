@@ -0,0 +1,133 @@
+"""Tests for the /api request handling: validation errors, delta requests, ETags and batch formats."""
+
+import json
+
+import pytest
+
+from app.backend.calculations.projection import COLUMNS
+
+PRECISIONS = ('fast', 'exact')
+
+
+def _post_raw(client, path: str, body: str):
+    """POST a JSON body as text, so it can hold the NaN and Infinity literals Python's json accepts."""
+    return client.post(path, data=body, content_type='application/json')
+
+
+@pytest.mark.parametrize('precision', PRECISIONS)
+@pytest.mark.parametrize('literal', ['NaN', 'Infinity', '-Infinity'])
+@pytest.mark.parametrize('field', ['purchase_price', 'interest_rate', 'rental_increase', 'loan_years', 'num_years'])
+def test_non_finite_values_are_rejected(client, scenario, precision, literal, field):
+    scenario['precision'] = precision
+    body = json.dumps(scenario).replace(f'"{field}": {json.dumps(scenario[field])}', f'"{field}": {literal}')
+    assert literal in body
+
+    response = _post_raw(client, '/api/calculate', body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Validation errors'
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('rental_income_base', 1e308, 'Monthly Rental must be between 0 and 1,000,000,000,000'),
+    ('interest_rate', 1e6, 'Interest Rate must be between 0 and 100'),
+    ('real_estate_market_increase', -150, 'Real Estate Market Increase must be between -100 and 100'),
+    ('loan_years', 1000, 'Loan Years must be between 1 and 100'),
+    ('purchase_price', 0, 'Purchase Price must be greater than 0 and at most 1,000,000,000,000'),
+    ('num_years', 200000, 'Number of Years must be between 0 and 100'),
+    ('num_years', -1, 'Number of Years must be between 0 and 100'),
+])
+def test_out_of_range_values_are_rejected_alike_in_both_precisions(client, scenario, field, value, message):
+    for precision in PRECISIONS:
+        response = client.post('/api/calculate', json=dict(scenario, precision=precision, **{field: value}))
+
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == [message]
+
+
+@pytest.mark.parametrize('payment_type', [[1], {'type': 'Interest Only'}, None, 'Balloon'])
+def test_invalid_payment_type_is_reported_with_other_errors(client, scenario, payment_type):
+    response = client.post('/api/calculate', json=dict(scenario, payment_type=payment_type, interest_rate=-1))
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [
+        'Interest Rate must be between 0 and 100',
+        'Payment Type must be one of: Principal and Interest, Interest Only',
+    ]
+
+
+@pytest.mark.parametrize('option', ['"volatility": {"interest_rate": Infinity}', '"percentiles": [NaN]',
+                                    '"num_paths": Infinity'])
+def test_non_finite_simulation_options_are_rejected(client, scenario, option):
+    body = f'{{"base": {json.dumps(scenario)}, "simulation": {{{option}}}}}'
+
+    response = _post_raw(client, '/api/simulate', body)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_overflowing_simulation_is_rejected(client, scenario):
+    settings = {'volatility': {'real_estate_market_increase': 100000}, 'num_paths': 20}
+
+    response = client.post('/api/simulate', json={'base': scenario, 'simulation': settings})
+
+    assert response.status_code == 400
+    assert 'overflows' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('changes', [
+    {'commission_percentage': 4},
+    {'interest_rate': 4.25, 'rental_income_base': 3100},
+    {'payment_type': 'Interest Only'},
+])
+def test_delta_request_matches_full_request(client, scenario, changes):
+    options = {'format': 'columns', 'fields': ['month', 'net_return', 'irr', 'npv', 'sale_net']}
+    # Calculate the base first so the delta request reuses its cached columns
+    client.post('/api/calculate', json=dict(scenario, **options))
+
+    delta = client.post('/api/calculate/delta', json=dict(options, base=scenario, changes=changes))
+    full = client.post('/api/calculate', json=dict(scenario, **changes, **options))
+
+    assert delta.status_code == full.status_code == 200
+    assert delta.get_json() == full.get_json()
+    assert delta.headers['ETag'] == full.headers['ETag']
+
+
+def test_delta_request_options_override_the_same_keys_in_changes(client, scenario):
+    changes = {'commission_percentage': 4, 'fields': ['month', 'sale_net'], 'format': 'rows'}
+
+    response = client.post('/api/calculate/delta', json={
+        'base': dict(scenario, fields=['month']), 'changes': changes, 'fields': ['month', 'net_return'],
+        'format': 'columns',
+    })
+
+    assert response.status_code == 200
+    assert set(response.get_json()['columns']) == {'month', 'net_return'}
+
+
+def test_matching_etag_gets_not_modified(client, scenario):
+    first = client.post('/api/calculate', json=scenario)
+
+    repeat = client.post('/api/calculate', json=scenario, headers={'If-None-Match': first.headers['ETag']})
+
+    assert repeat.status_code == 304
+    assert not repeat.get_data()
+
+
+def test_every_column_including_irr_is_returned_by_default(client, scenario):
+    default = client.post('/api/calculate', json=dict(scenario, format='columns')).get_json()['columns']
+
+    assert set(default) == set(COLUMNS)
+    # Month 0 has no cash flows to solve, later months do
+    assert default['irr'][0] is None
+    assert all(value is not None for value in default['irr'][1:])
+
+
+def test_batch_defaults_to_columns(client, scenario):
+    response = client.post('/api/calculate/batch', json={'scenarios': [scenario, dict(scenario, purchase_price=-1)]})
+
+    results = response.get_json()['results']
+    assert response.status_code == 200
+    assert set(results['0']) == {'columns'}
+    assert results['1']['error'] == 'Validation errors'
@@ -0,0 +1,30 @@
+"""Tests for indexation schedules (steps and overrides) in /api/calculate."""
+
+import numpy as np
+import pytest
+
+# Rent frozen in year 3 and capped at 2% from year 5; a one-off 10% property tax reassessment in year 4
+INDEXATION = {
+    'rental_income': {'steps': [{'year': 5, 'increase': 2}], 'overrides': [{'year': 3, 'increase': 0}]},
+    'property_tax': {'overrides': {'4': 10}},
+}
+
+
+def _yearly_factors(increases: list) -> np.ndarray:
+    """Growth factor of each year from the increases applied at the start of years 2, 3, ..."""
+    return np.cumprod([1.0] + [1 + increase / 100 for increase in increases])
+
+
+@pytest.mark.parametrize('precision', ['fast', 'exact'])
+def test_steps_and_overrides_change_the_yearly_increase(client, scenario, precision):
+    response = client.post('/api/calculate', json=dict(scenario, num_years=6, precision=precision,
+                                                       indexation=INDEXATION, format='columns'))
+
+    assert response.status_code == 200
+    columns = response.get_json()['columns']
+    year_of_month = [(month - 1) // 12 for month in range(1, 73)]
+    rent = 2800 * _yearly_factors([2.5, 0, 2.5, 2, 2])
+    property_tax = 4000 / 12 * _yearly_factors([2, 2, 10, 2, 2])
+    np.testing.assert_allclose(np.asarray(columns['rental_income'][1:], dtype=float), rent[year_of_month], rtol=1e-12)
+    np.testing.assert_allclose(np.asarray(columns['property_tax'][1:], dtype=float), property_tax[year_of_month],
+                               rtol=1e-12)
@@ -0,0 +1,36 @@
+"""Tests for request instrumentation: Server-Timing headers and the /metrics endpoint."""
+
+import pytest
+
+from app.backend.app import create_app
+
+
+@pytest.fixture
+def metrics_client(monkeypatch):
+    """Test client of an app serving /metrics behind a token."""
+    monkeypatch.setenv('METRICS_TOKEN', 'secret')
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def test_stage_timings_are_reported_by_default(client, scenario):
+    response = client.post('/api/calculate', json=scenario)
+
+    assert response.status_code == 200
+    stages = [entry.split(';')[0].strip() for entry in response.headers['Server-Timing'].split(',')]
+    assert {'parse', 'amortization', 'serialize', 'total'} <= set(stages)
+
+
+def test_metrics_are_not_served_without_a_token(client):
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_require_the_token(metrics_client, scenario):
+    metrics_client.post('/api/calculate', json=scenario)
+
+    assert metrics_client.get('/metrics').status_code == 401
+    assert metrics_client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = metrics_client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert 'endpoint="/api/calculate"' in response.get_data(as_text=True)
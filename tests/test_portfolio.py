@@ -0,0 +1,72 @@
+"""Tests for portfolio aggregation and the /api/portfolio endpoint."""
+
+import numpy as np
+
+from app.backend.calculations import portfolio
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.portfolio import calculate_portfolio
+from app.backend.calculations.projection import calculate_projection
+
+from conftest import SCENARIO
+
+
+def _params(**changes) -> dict:
+    scenario, errors = ScenarioParams.parse(dict(SCENARIO, **changes))
+    assert not errors
+    return scenario.to_dict()
+
+
+def test_properties_add_up_from_their_purchase_month():
+    first, second = _params(), _params(purchase_price=300000)
+    single = calculate_projection(second, 30)
+
+    columns = calculate_portfolio([first, second], [0, 12], 30, workers=1)
+
+    np.testing.assert_array_equal(columns['properties_held'][:13], [1] * 12 + [2])
+    np.testing.assert_allclose(columns['home_value'][12], calculate_projection(first, 30)['home_value'][12] + 300000)
+    # The second property's month 0 lines up with portfolio month 12
+    np.testing.assert_allclose(columns['principal_remaining'][12:],
+                               calculate_projection(first, 30)['principal_remaining'][12:]
+                               + single['principal_remaining'][:-12])
+    np.testing.assert_allclose(columns['equity'], columns['home_value'] - columns['principal_remaining'])
+    np.testing.assert_allclose(columns['cumulative_cash_flow'], np.cumsum(columns['cash_flow']))
+
+
+def test_chunked_portfolio_matches_a_single_chunk(monkeypatch):
+    params_list = [_params(purchase_price=200000 + 10000 * index) for index in range(10)]
+    offsets = list(range(0, 100, 10))
+    whole = calculate_portfolio(params_list, offsets, 20, workers=1)
+
+    # Chunks of two properties, still run inline
+    monkeypatch.setattr(portfolio, 'CHUNK_ELEMENTS', 2 * (20 * 12 + 1))
+    chunked = calculate_portfolio(params_list, offsets, 20, workers=1)
+
+    for name, values in whole.items():
+        np.testing.assert_allclose(chunked[name], values, rtol=1e-12, err_msg=name)
+
+
+def test_portfolio_horizon_is_bounded(client, scenario):
+    response = client.post('/api/portfolio', json={'properties': [scenario], 'num_years': 3000})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['Number of Years must be between 1 and 100']
+
+
+def test_portfolio_work_is_bounded_by_property_months(client, scenario):
+    properties = [dict(scenario, num_years=1)] * 4000
+
+    response = client.post('/api/portfolio', json={'properties': properties, 'num_years': 100})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [
+        'Portfolio projects 4000 properties over 1200 months; the maximum is 3610000 property-months'
+    ]
+
+
+def test_purchase_month_outside_the_horizon_is_rejected(client, scenario):
+    properties = [dict(scenario, purchase_month=0), dict(scenario, purchase_month=400)]
+
+    response = client.post('/api/portfolio', json={'properties': properties, 'num_years': 30})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['Every purchase month must be within the portfolio horizon']
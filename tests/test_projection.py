@@ -0,0 +1,138 @@
+"""Tests for the projection engine: delta recalculation and fast against exact precision."""
+
+import numpy as np
+import pytest
+
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.precision import PRECISION_EXACT, PRECISION_FAST
+from app.backend.calculations.projection import (
+    COLUMNS,
+    INPUT_DEPENDENCIES,
+    calculate_delta_projection,
+    calculate_projection
+)
+
+from conftest import SCENARIO
+
+# Largest difference between fast and exact values, relative to the exact value (or absolute below 1)
+EXACT_TOLERANCE = 1e-8
+
+# One edit per input of INPUT_DEPENDENCIES, as request parameters
+EDITS = {
+    'purchase_price': 550000,
+    'downpayment_percentage': 35,
+    'closing_costs': 8000,
+    'land_transfer_tax': 9000,
+    'interest_rate': 4.25,
+    'loan_years': 20,
+    'payment_type': 'Interest Only',
+    'maintenance_base': 350,
+    'maintenance_increase': 4,
+    'property_tax_base': 4500,
+    'property_tax_increase': 3,
+    'insurance': 1500,
+    'utilities': 200,
+    'repairs': 1000,
+    'rental_income_base': 3100,
+    'rental_increase': 1.5,
+    'indexation': {'rental_income': {'steps': [{'year': 6, 'increase': 4}]}},
+    'marginal_tax_rate': 30,
+    'expected_return_rate': 5,
+    'real_estate_market_increase': 2,
+    'commission_percentage': 4,
+}
+
+
+def _params(data: dict, precision: str = PRECISION_FAST) -> dict:
+    scenario, errors = ScenarioParams.parse(dict(data, precision=precision))
+    assert not errors
+    return scenario.to_dict()
+
+
+def test_every_input_has_an_edit():
+    assert set(EDITS) == set(INPUT_DEPENDENCIES)
+
+
+@pytest.mark.parametrize('field', sorted(EDITS))
+def test_delta_projection_matches_full_projection(field):
+    previous = calculate_projection(_params(SCENARIO), 30, names=COLUMNS)
+    edited = _params(dict(SCENARIO, **{field: EDITS[field]}))
+
+    delta = calculate_delta_projection(edited, 30, previous, [field], names=COLUMNS)
+    full = calculate_projection(edited, 30, names=COLUMNS)
+
+    for name in COLUMNS:
+        np.testing.assert_array_equal(delta[name], full[name], err_msg=name)
+
+
+@pytest.mark.parametrize('changes', [
+    {},
+    {'payment_type': 'Interest Only'},
+    {'interest_rate': 0},
+    {'downpayment_percentage': 100},
+    {'downpayment_percentage': 5, 'real_estate_market_increase': -5},
+    {'loan_years': 10, 'expected_return_rate': 0, 'num_years': 40},
+    {'num_years': 1},
+    EDITS,
+])
+def test_fast_precision_matches_exact_precision(changes):
+    data = dict(SCENARIO, **changes)
+    fast = calculate_projection(_params(data), data['num_years'], PRECISION_FAST, names=COLUMNS)
+    exact = calculate_projection(_params(data, PRECISION_EXACT), data['num_years'], PRECISION_EXACT, names=COLUMNS)
+
+    for name in COLUMNS:
+        expected = np.array([np.nan if value is None else float(value) for value in exact[name]])
+        actual = np.asarray(fast[name], dtype=float)
+        # Months without an IRR are NaN in fast precision and None in exact precision
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=name)
+        defined = ~np.isnan(expected)
+        error = np.abs(actual[defined] - expected[defined]) / np.maximum(1, np.abs(expected[defined]))
+        assert error.max(initial=0) <= EXACT_TOLERANCE, name
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_overflowing_projection_is_rejected():
+    params = dict(_params(SCENARIO), real_estate_market_increase=1000.0)
+
+    with pytest.raises(ValueError, match='home_value overflows'):
+        calculate_projection(params, 100)
+
+
+@pytest.mark.parametrize('precision', [PRECISION_FAST, PRECISION_EXACT])
+def test_capital_gains_inclusion_changes_at_the_first_tier(precision):
+    # The gain on a sale crosses $250,000 a little before year 12
+    columns = calculate_projection(_params(SCENARIO, precision), 15, precision, names=COLUMNS)
+
+    home_value = np.array([float(value) for value in columns['home_value']])
+    gain = home_value * 0.95 - 500000
+    below, above = (gain > 0) & (gain < 250000), gain > 250000
+    assert below.any() and above.any()
+    taxable = np.where(gain > 250000, 125000 + (gain - 250000) * 2 / 3, np.maximum(gain, 0) / 2)
+    expected_tax = taxable * 0.43
+    expected_net = home_value * 0.95 - expected_tax - np.array([float(value) for value in columns['principal_remaining']])
+    for name, expected in (('capital_gains_tax', expected_tax), ('sale_net', expected_net)):
+        actual = np.array([float(value) for value in columns[name]])
+        np.testing.assert_allclose(actual[below], expected[below], rtol=1e-9, err_msg=name)
+        np.testing.assert_allclose(actual[above], expected[above], rtol=1e-9, err_msg=name)
+
+
+@pytest.mark.parametrize('changes', [
+    {},
+    {'rental_income_base': 9000},
+    # Months whose Newton start is too far off are solved in a bracket
+    {'real_estate_market_increase': -20},
+    {'real_estate_market_increase': 30, 'num_years': 100},
+])
+def test_irr_discounts_each_month_cash_flows_to_zero(changes):
+    data = dict(SCENARIO, **changes)
+    columns = calculate_projection(_params(data), data['num_years'], names=COLUMNS)
+
+    flows = columns['rental_gains'].copy()
+    flows[0] = -columns['cumulative_investment'][0]
+    solved = np.flatnonzero(~np.isnan(columns['irr']))
+    assert len(solved)
+    for month in solved:
+        discount = (1 + columns['irr'][month] / 100) ** (-np.arange(month + 1) / 12)
+        npv = flows[:month + 1] @ discount + columns['sale_net'][month] * discount[-1]
+        scale = np.abs(flows[:month + 1]) @ discount + abs(columns['sale_net'][month]) * discount[-1]
+        assert abs(npv) <= 1e-9 * scale, month
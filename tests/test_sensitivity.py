@@ -0,0 +1,44 @@
+"""Tests for the /api/sensitivity endpoint."""
+
+import numpy as np
+
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.projection import calculate_projection
+
+
+METRIC = 'cumulative_rental_gains'
+
+
+def _metric(data: dict, year: int) -> float:
+    scenario, errors = ScenarioParams.parse(data)
+    assert not errors
+    return calculate_projection(scenario.to_dict(), year)[METRIC][year * 12]
+
+
+def test_low_and_high_match_bumped_projections(client, scenario):
+    response = client.post('/api/sensitivity', json={
+        'base': scenario, 'fields': ['interest_rate', 'rental_income_base'], 'bump': 10, 'year': 15,
+        'ranges': {'interest_rate': [4, 7]}, 'metrics': [METRIC],
+    })
+
+    assert response.status_code == 200
+    result = response.get_json()['metrics'][METRIC]
+    np.testing.assert_allclose(result['base'], _metric(scenario, 15), rtol=1e-12)
+    by_field = {entry['field']: entry for entry in result['sensitivities']}
+    rate, rent = by_field['interest_rate'], by_field['rental_income_base']
+    np.testing.assert_allclose([rate['low_input'], rate['high_input']], [4, 7])
+    np.testing.assert_allclose(rent['low_input'], 2520)
+    np.testing.assert_allclose(rate['high'], _metric(dict(scenario, interest_rate=7), 15), rtol=1e-12)
+    np.testing.assert_allclose(rent['low'], _metric(dict(scenario, rental_income_base=2520), 15), rtol=1e-12)
+    # A higher rate lowers the return and a higher rent raises it
+    assert rate['high'] < result['base'] < rate['low']
+    assert rent['low'] < result['base'] < rent['high']
+    swings = [entry['swing'] for entry in result['sensitivities']]
+    assert swings == sorted(swings, reverse=True)
+
+
+def test_year_beyond_the_scenario_horizon_is_rejected(client, scenario):
+    response = client.post('/api/sensitivity', json={'base': scenario, 'year': 31})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['Year must be between 1 and 30']
@@ -0,0 +1,38 @@
+"""Tests for Monte Carlo simulation and the /api/simulate endpoint."""
+
+import numpy as np
+
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.projection import calculate_projection
+
+
+def _simulate(client, scenario, **settings):
+    response = client.post('/api/simulate', json={'base': scenario, 'simulation': settings})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_without_volatility_every_band_is_the_base_projection(client, scenario):
+    params, errors = ScenarioParams.parse(scenario)
+    assert not errors
+    base = calculate_projection(params.to_dict(), 30)
+
+    result = _simulate(client, scenario, num_paths=50)
+
+    for metric, bands in result['bands'].items():
+        for values in bands.values():
+            np.testing.assert_allclose(values, base[metric], rtol=1e-9, err_msg=metric)
+
+
+def test_bands_are_ordered_and_reproducible(client, scenario):
+    settings = {'num_paths': 400, 'seed': 7, 'percentiles': [5, 50, 95],
+                'volatility': {'real_estate_market_increase': 8, 'rental_increase': 2, 'interest_rate': 1}}
+
+    result = _simulate(client, scenario, **settings)
+
+    assert result == _simulate(client, scenario, **settings)
+    for metric, bands in result['bands'].items():
+        low, median, high = (np.array(bands[name]) for name in ('p5', 'p50', 'p95'))
+        assert np.all(low <= median) and np.all(median <= high), metric
+        # Paths only diverge after month 0, and keep spreading out
+        assert low[0] == high[0] and high[-1] - low[-1] > high[12] - low[12], metric
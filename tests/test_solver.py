@@ -0,0 +1,65 @@
+"""Tests for the goal-seek solver and the /api/solve endpoint."""
+
+import numpy as np
+import pytest
+
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.projection import calculate_projection
+
+
+def _metric(data: dict, metric: str, month: int) -> float:
+    scenario, errors = ScenarioParams.parse(data)
+    assert not errors
+    return calculate_projection(scenario.to_dict(), month // 12 + 1)[metric][month]
+
+
+@pytest.mark.parametrize('field, metric, target, options', [
+    ('rental_income_base', 'return_comparison', 1, {}),
+    ('interest_rate', 'cumulative_rental_gains', -50000, {}),
+    ('real_estate_market_increase', 'net_return', 0, {'lower': -50}),
+])
+def test_solved_value_reaches_the_target(client, scenario, field, metric, target, options):
+    response = client.post('/api/solve', json=dict(options, base=scenario, field=field, metric=metric,
+                                                   target=target, year=10))
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['converged']
+    reached = _metric(dict(scenario, **{field: result['value']}), metric, 120)
+    np.testing.assert_allclose(reached, result['metric_value'], rtol=1e-9)
+    np.testing.assert_allclose(reached, target, rtol=1e-6, atol=0.1)
+    # The solved value is one /api/calculate accepts
+    assert client.post('/api/calculate', json=dict(scenario, **{field: result['value']})).status_code == 200
+
+
+def test_search_stops_at_the_highest_value_the_field_accepts(client, scenario):
+    # No interest rate up to 100% brings net return this low, so the bracket is never widened past it
+    response = client.post('/api/solve', json={'base': scenario, 'field': 'interest_rate', 'metric': 'net_return',
+                                               'target': -10 ** 12, 'year': 10})
+
+    assert response.status_code == 400
+    assert 'does not reach' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('changes, message', [
+    ({'year': 31}, 'Month must be between 1 and 360'),
+    ({'month': 0}, 'Month must be between 1 and 360'),
+    ({'upper': 500}, 'Upper must be between 0 and 100'),
+    ({'lower': -1}, 'Lower must be between 0 and 100'),
+])
+def test_month_and_search_range_are_validated(client, scenario, changes, message):
+    request = {'base': scenario, 'field': 'interest_rate', 'metric': 'net_return', 'target': 0, 'year': 10}
+
+    response = client.post('/api/solve', json=dict(request, **changes))
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [message]
+
+
+def test_metric_undefined_in_the_search_range_is_unprocessable(client, scenario):
+    # With the market at -100% the home is worth nothing and the IRR is undefined
+    response = client.post('/api/solve', json={'base': scenario, 'field': 'real_estate_market_increase',
+                                               'metric': 'irr', 'target': 0, 'year': 1, 'lower': -100, 'upper': 10})
+
+    assert response.status_code == 422
+    assert response.get_json()['error'] == 'irr is not a finite number at month 12 for real_estate_market_increase = -100'
@@ -0,0 +1,47 @@
+"""Tests for grid sweeps and the /api/sweep endpoint."""
+
+import numpy as np
+import pytest
+
+from app.backend.calculations.parameters import ScenarioParams
+from app.backend.calculations.projection import calculate_projection
+
+
+def _projection(data: dict) -> dict:
+    scenario, errors = ScenarioParams.parse(data)
+    assert not errors
+    return calculate_projection(scenario.to_dict(), data['num_years'])
+
+
+def test_every_cell_matches_its_own_projection(client, scenario):
+    sweep = {'interest_rate': [4, 6], 'rental_income_base': {'start': 2000, 'stop': 3000, 'num': 3}}
+
+    response = client.post('/api/sweep', json={'base': scenario, 'sweep': sweep, 'year': 10,
+                                               'metrics': ['net_return', 'break_even_month']})
+
+    assert response.status_code == 200
+    metrics = response.get_json()['metrics']
+    for i, rate in enumerate([4, 6]):
+        for j, rent in enumerate([2000, 2500, 3000]):
+            columns = _projection(dict(scenario, interest_rate=rate, rental_income_base=rent, num_years=10))
+            np.testing.assert_allclose(metrics['net_return'][i][j], columns['net_return'][120], rtol=1e-12)
+            reached = np.flatnonzero(columns['net_return'] >= 0)
+            assert metrics['break_even_month'][i][j] == (int(reached[0]) if reached.size else None)
+
+
+def test_year_beyond_the_scenario_horizon_is_rejected(client, scenario):
+    response = client.post('/api/sweep', json={'base': scenario, 'sweep': {'interest_rate': [4, 6]}, 'year': 31})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['Year must be between 1 and 30']
+
+
+@pytest.mark.parametrize('sweep', [
+    {'interest_rate': {'start': 0, 'stop': 10, 'num': 10 ** 9}},
+    {'interest_rate': {'start': 0, 'stop': 10, 'num': 1000}, 'rental_income_base': {'start': 0, 'stop': 5000, 'num': 1000}},
+])
+def test_grid_size_is_bounded_before_values_are_parsed(client, scenario, sweep):
+    response = client.post('/api/sweep', json={'base': dict(scenario, num_years=100), 'sweep': sweep})
+
+    assert response.status_code == 400
+    assert 'maximum' in response.get_json()['errors'][-1]